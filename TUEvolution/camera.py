@@ -0,0 +1,163 @@
+import numpy
+
+from TUEvolution.snapshot import Snapshot
+
+# Sense ranges on the screen are rounded to this number of steps per doubling, so zooming reuses the cached halos
+sense_steps = 8
+
+
+def quantize(values, steps=sense_steps):
+    """
+    Round sizes in pixels to whole pixels, and larger sizes to a fixed number of steps per doubling.
+
+    Parameters:
+    values (numpy.ndarray): The sizes in pixels.
+    steps (int, optional): The number of steps per doubling. Defaults to sense_steps.
+
+    Returns:
+    numpy.ndarray: The rounded sizes, as integers.
+    """
+    values = numpy.asarray(values, dtype=float)
+    step = numpy.maximum(2 ** numpy.floor(numpy.log2(numpy.maximum(values, 1) / steps)), 1)
+    return (numpy.round(values / step) * step).astype(int)
+
+
+class Camera:
+    """
+    A class to map world coordinates to an area of the screen, which can be panned and zoomed.
+
+    Attributes:
+    left (int): The left edge of the area on the screen.
+    top (int): The top edge of the area on the screen.
+    width (int): The width of the area on the screen.
+    height (int): The height of the area on the screen.
+    center (numpy.ndarray): The point of the world shown in the middle of the area.
+    scale (float): The number of pixels per unit of the world.
+    """
+
+    def __init__(self, left, top, width, height, center=(0, 0), scale=1.0, min_scale=1 / 256, max_scale=16):
+        """
+        Initialize a Camera object.
+
+        Parameters:
+        left (int): The left edge of the area on the screen.
+        top (int): The top edge of the area on the screen.
+        width (int): The width of the area on the screen.
+        height (int): The height of the area on the screen.
+        center (tuple, optional): The point of the world shown in the middle of the area. Defaults to (0, 0).
+        scale (float, optional): The number of pixels per unit of the world. Defaults to 1.
+        min_scale (float, optional): The smallest scale when zooming out. Defaults to 1/256.
+        max_scale (float, optional): The largest scale when zooming in. Defaults to 16.
+        """
+        self.left = left
+        self.top = top
+        self.width = width
+        self.height = height
+        self.center = numpy.array(center, dtype=float)
+        self.scale = scale
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+
+    def fit(self, center, radius):
+        """
+        Show a circle of the world, as large as fits in the area.
+
+        Parameters:
+        center (tuple): The center of the circle.
+        radius (float): The radius of the circle.
+        """
+        self.center = numpy.array(center, dtype=float)
+        self.scale = min(self.width, self.height) / (2 * radius)
+
+    def pan(self, dx, dy):
+        """
+        Move the view with the mouse, by a distance on the screen.
+
+        Parameters:
+        dx (float): The horizontal distance in pixels.
+        dy (float): The vertical distance in pixels.
+        """
+        self.center -= numpy.array([dx, dy]) / self.scale
+
+    def zoom(self, factor, anchor=None):
+        """
+        Zoom in or out, keeping the point of the world under an anchor in place.
+
+        Parameters:
+        factor (float): The factor the scale is multiplied with, larger than 1 to zoom in.
+        anchor (tuple, optional): The point on the screen that stays in place. Defaults to None, which is the middle of the area.
+        """
+        scale = min(max(self.scale * factor, self.min_scale), self.max_scale)
+        if anchor is not None:
+            point = self.to_world(numpy.array(anchor, dtype=float))
+            self.center = point + (self.center - point) * self.scale / scale
+        self.scale = scale
+
+    def to_screen(self, positions):
+        """
+        Convert world coordinates to screen coordinates.
+
+        Parameters:
+        positions (numpy.ndarray): The (..., 2) positions in the world.
+
+        Returns:
+        numpy.ndarray: The positions on the screen.
+        """
+        return (positions - self.center) * self.scale + (self.left + self.width / 2, self.top + self.height / 2)
+
+    def to_world(self, points):
+        """
+        Convert screen coordinates to world coordinates.
+
+        Parameters:
+        points (numpy.ndarray): The (..., 2) points on the screen.
+
+        Returns:
+        numpy.ndarray: The positions in the world.
+        """
+        return (points - (self.left + self.width / 2, self.top + self.height / 2)) / self.scale + self.center
+
+    def visible(self, points, margin=0):
+        """
+        Check which points on the screen are inside the area, or close enough for a circle around them to be.
+
+        Parameters:
+        points (numpy.ndarray): The (n, 2) points on the screen.
+        margin (float or numpy.ndarray, optional): The radius of the circles around the points in pixels. Defaults to 0.
+
+        Returns:
+        numpy.ndarray: Whether every point is visible.
+        """
+        horizontal = (points[:, 0] + margin >= self.left) & (points[:, 0] - margin < self.left + self.width)
+        vertical = (points[:, 1] + margin >= self.top) & (points[:, 1] - margin < self.top + self.height)
+        return horizontal & vertical
+
+    def view(self, snapshot, food_radius=0):
+        """
+        Get the part of a snapshot inside the area, in screen coordinates and with the radii and sense ranges in pixels.
+
+        The sense ranges are quantized, and limited to the distance to the farthest corner of the area,
+        beyond which a larger halo looks the same.
+
+        Parameters:
+        snapshot (Snapshot): The snapshot in world coordinates.
+        food_radius (float, optional): The radius of the food in the world. Defaults to 0.
+
+        Returns:
+        Snapshot: The visible creatures and food.
+        """
+        position = self.to_screen(snapshot.position)
+        radius = numpy.maximum(snapshot.radius * self.scale, 1)
+        sense = snapshot.sense * self.scale
+        shown = numpy.flatnonzero(self.visible(position, numpy.maximum(radius, sense)))
+
+        position = position[shown]
+        corners = numpy.array([[self.left, self.top], [self.left + self.width, self.top + self.height]])
+        farthest = numpy.hypot(*numpy.max(numpy.abs(position[:, numpy.newaxis] - corners), axis=1).T)
+        sense = numpy.minimum(quantize(sense[shown]), numpy.ceil(farthest)).astype(int)
+
+        food = self.to_screen(snapshot.food)
+        food = food[self.visible(food, food_radius * self.scale)]
+
+        return Snapshot(snapshot.generation, snapshot.time, position, radius[shown], snapshot.speed[shown], sense,
+                        snapshot.status[shown], snapshot.energy[shown], snapshot.full_energy, snapshot.color, food)
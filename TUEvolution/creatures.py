@@ -1,5 +1,5 @@
-import pygame
 import enum
+import functools
 import numpy
 import numpy.random
 import numpy.linalg
@@ -30,6 +30,89 @@ unit_speed = 1
 unit_time = walk_distance // unit_speed
 unit_energy = unit_time * power(radius=2, speed=1)
 
+# Number of shades between an empty (white) and a fully charged creature
+charge_levels = 64
+
+# Largest sense range in pixels drawn from a cached halo; larger halos are drawn on a shared overlay
+halo_limit = 128
+
+
+@functools.lru_cache(maxsize=128)
+def sense_halo(sense):
+    """
+    Get the translucent circle showing a sense range, drawn once per range.
+
+    Parameters:
+    sense (int): The sense range.
+
+    Returns:
+    pygame.Surface: The circle, on a half transparent square surface twice the sense range wide.
+    """
+    import pygame
+
+    # A color key and a surface alpha blend a lot faster than an alpha per pixel
+    surface = pygame.Surface((sense * 2, sense * 2))
+    surface.fill((255, 0, 255))
+    pygame.draw.circle(surface, (173, 216, 230), (sense, sense), sense)
+    surface.set_colorkey((255, 0, 255), pygame.RLEACCEL)
+    surface.set_alpha(128, pygame.RLEACCEL)
+    return surface
+
+
+@functools.lru_cache(maxsize=1)
+def halo_overlay(size):
+    """
+    Get the half transparent surface that large sense halos are drawn on, reused every frame.
+
+    Parameters:
+    size (tuple): The width and height of the overlay.
+
+    Returns:
+    pygame.Surface: The overlay, with an alpha per pixel, which blends a lot faster than a color key
+    that changes every frame.
+    """
+    import pygame
+
+    return pygame.Surface(size, pygame.SRCALPHA)
+
+
+def draw_large_halos(screen, positions, senses):
+    """
+    Draw sense halos larger than halo_limit on an overlay of the clipped area of the screen.
+
+    The circles are drawn clipped to the area, so their cost follows the visible part of them instead
+    of their size. Overlapping large halos blend once, as a single translucent shape.
+
+    Parameters:
+    screen (pygame.Surface): The screen to draw on.
+    positions (list): The [x, y] pixel positions of the creatures.
+    senses (list): The sense ranges in pixels.
+    """
+    import pygame
+
+    clip = screen.get_clip()
+    overlay = halo_overlay(clip.size)
+    overlay.fill((0, 0, 0, 0))
+    for (x, y), sense in zip(positions, senses):
+        pygame.draw.circle(overlay, (173, 216, 230, 128), (x - clip.left, y - clip.top), sense)
+    screen.blit(overlay, clip.topleft)
+
+
+@functools.lru_cache(maxsize=1024)
+def fill_color(color, level):
+    """
+    Get the fill color of a creature, blending its color with white by its charge.
+
+    Parameters:
+    color (tuple): The color of the creature.
+    level (int): The charge of the creature, from 0 (empty) to charge_levels (fully charged).
+
+    Returns:
+    tuple: The fill color.
+    """
+    charge = level / charge_levels
+    return tuple(int(charge * c + (1 - charge) * w) for c, w in zip(color, utils.color('white')))
+
 
 # Creature status enumeration
 class Status(enum.Enum):
@@ -40,9 +123,40 @@ class Status(enum.Enum):
     TARGETING = "targeting"
 
 
+def draw_creatures(screen, positions, radii, senses, charges, colors):
+    """
+    Draw creatures given as arrays on the screen, as Creature.draw draws a single creature.
+
+    The sense halos and the creatures are cached sprites, placed with two Surface.blits calls. Sense
+    halos larger than halo_limit pixels are not cached, but drawn on an overlay of the clipped screen.
+
+    Parameters:
+    screen (pygame.Surface): The screen to draw on.
+    positions (numpy.ndarray): The (n, 2) positions of the creatures.
+    radii (numpy.ndarray): The radii of the creatures.
+    senses (numpy.ndarray): The sense ranges of the creatures.
+    charges (numpy.ndarray): The remaining fraction of the energy of the creatures.
+    colors (list): The RGB colors of the creatures.
+    """
+    # Top left corners of the sprites, in whole pixels as pygame.draw.circle does
+    positions = positions.astype(int)
+    senses = numpy.asarray(senses, dtype=int)
+    radii = numpy.asarray(radii, dtype=int)
+    corners = (positions - radii[:, None]).tolist()
+    levels = numpy.round(numpy.clip(charges, 0, 1) * charge_levels).astype(int).tolist()
+
+    small = senses <= halo_limit
+    halos = (positions[small] - senses[small, None]).tolist()
+    screen.blits([(sense_halo(sense), halo) for sense, halo in zip(senses[small].tolist(), halos)], doreturn=False)
+    if not small.all():
+        draw_large_halos(screen, positions[~small].tolist(), senses[~small].tolist())
+    screen.blits([(utils.disc(radius, color, fill_color(color, level)), corner)
+                  for radius, color, level, corner in zip(radii.tolist(), colors, levels, corners)], doreturn=False)
+
+
 # Creature class
 class Creature:
-    def __init__(self, size_evo_data, speed_evo_data, sense_evo_data, stamina, color):
+    def __init__(self, size_evo_data, speed_evo_data, sense_evo_data, stamina, color, rng=numpy.random):
         """
         Initialize a Creature object.
 
@@ -52,6 +166,7 @@ class Creature:
         sense (int): The sense range of the creature.
         stamina (int): The stamina of the creature.
         color (tuple): The RGB color of the creature.
+        rng (numpy.random.Generator, optional): The random number generator, e.g. a RandomPool. Defaults to the global numpy.random state.
         """
 
         self.radius = max(size_evo_data["init"] // 2, 2)
@@ -64,6 +179,7 @@ class Creature:
         self.stamina = stamina
         self.energy = stamina * unit_energy
         self.color = color
+        self.rng = rng
         self.targeting = False
 
         # Initialization
@@ -126,9 +242,9 @@ class Creature:
         # Dont random walk if targeting
         if self.targeting is False:
             if reorient:
-                self.orientation += numpy.random.vonmises(0, walk_turn)
+                self.orientation += self.rng.vonmises(0, walk_turn)
 
-            distance = numpy.random.poisson(walk_distance)
+            distance = self.rng.poisson(walk_distance)
             self.destination = self.position + distance * utils.orientation_vector(self.orientation)
 
     def is_exploring(self):
@@ -189,7 +305,7 @@ class Creature:
         Returns:
         Creature: A new creature with the same attributes.
         """
-        return Creature(self.size_evo_data, self.speed_evo_data, self.sense_evo_data, self.stamina, self.color)
+        return Creature(self.size_evo_data, self.speed_evo_data, self.sense_evo_data, self.stamina, self.color, self.rng)
 
     def reproduce(self):
         """
@@ -203,11 +319,11 @@ class Creature:
         new_speed_evo_data = self.mutate(self.speed_evo_data)
         new_sense_evo_data = self.mutate(self.sense_evo_data)
 
-        return Creature(new_size_evo_data, new_speed_evo_data, new_sense_evo_data, self.stamina, self.color)
+        return Creature(new_size_evo_data, new_speed_evo_data, new_sense_evo_data, self.stamina, self.color, self.rng)
 
     def mutate(self, attribute_data):
         """Helper function to mutate a given attribute."""
-        mutation = numpy.random.choice(attribute_data["variations"], p=attribute_data["probabilities"])
+        mutation = self.rng.choice(attribute_data["variations"], p=attribute_data["probabilities"])
         return {
             "init": max(attribute_data["init"] + int(mutation), 0),
             "variations": attribute_data["variations"],
@@ -259,7 +375,8 @@ class Creature:
         """
         self.energy -= self.sense / 5
 
-        # Always run from predators regardless of food or status
+        # Always run from the nearest predator regardless of food or status
+        nearest_predator = None
         for p in predators:
             distance = numpy.linalg.norm(p.position - self.position)
 
@@ -267,18 +384,23 @@ class Creature:
             if distance == 0:
                 continue
 
-            if distance <= self.sense and self.radius < 1.2 * p.radius and (not p.is_home()):
-                # Run in opposite direction of predator
-                run_direction = (self.position - p.position) / distance
-                # Run distance is the remaining distance such that the predator is at the edge of the sense range
-                run_distance = self.sense - distance
+            # Only creatures that can eat this creature are predators
+            if distance <= self.sense and p.radius >= 1.2 * self.radius and not (p.is_home() or p.has_perished()):
+                if nearest_predator is None or distance < nearest_distance:
+                    nearest_predator, nearest_distance = p, distance
+
+        if nearest_predator is not None:
+            # Run in opposite direction of predator
+            run_direction = (self.position - nearest_predator.position) / nearest_distance
+            # Run distance is the remaining distance such that the predator is at the edge of the sense range
+            run_distance = self.sense - nearest_distance
 
-                self.destination = self.position + 1.2 * run_distance * run_direction
-                self.targeting = True
-                return True
+            self.destination = self.position + 1.2 * run_distance * run_direction
+            self.targeting = True
+            return True
 
         # If targeting food or predator, continue targeting
-        if self.targeting is True and self.status == Status.EXPLORING:
+        if self.targeting and self.status == Status.EXPLORING:
             distance_target = numpy.linalg.norm(self.destination - self.position)
 
             # If target is out of range, stop targeting
@@ -288,14 +410,22 @@ class Creature:
 
             return True
 
-        # Target food if hungry and in range
+        # Target the nearest food if hungry and in range
+        if not self.is_hungry():
+            return False
+
+        nearest_food = None
         for f in food:
             distance = numpy.linalg.norm(f.position - self.position)
 
-            if distance <= self.sense and self.is_hungry():
-                self.destination = f.position
-                self.targeting = True
-                return True
+            if distance <= self.sense and f.is_available():
+                if nearest_food is None or distance < nearest_distance:
+                    nearest_food, nearest_distance = f, distance
+
+        if nearest_food is not None:
+            self.destination = nearest_food.position.copy()
+            self.targeting = True
+            return True
 
         return False
 
@@ -306,11 +436,11 @@ class Creature:
         Parameters:
         screen (pygame.Surface): The screen to draw on.
         """
-        sense_surface = pygame.Surface((self.sense * 2, self.sense * 2), pygame.SRCALPHA)
-        pygame.draw.circle(sense_surface, (173, 216, 230, 128), (self.sense, self.sense), self.sense)
-        screen.blit(sense_surface, self.position - numpy.array([self.sense, self.sense]))
+        import pygame  # Imported on first draw, so the model runs without a display
+
+        screen.blit(sense_halo(int(self.sense)), self.position - self.sense)
 
-        pygame.draw.circle(screen, self.color, self.position, self.radius)
-        charge = max(self.energy / (self.stamina * unit_energy), 0)
-        fill_color = (charge * numpy.array(self.color) + (1 - charge) * numpy.array(utils.color('white'))).astype(int)
-        pygame.draw.circle(screen, fill_color, self.position, self.radius - 1)
+        color = self.color
+        pygame.draw.circle(screen, color, self.position, self.radius)
+        charge = min(max(self.energy / (self.stamina * unit_energy), 0), 1)
+        pygame.draw.circle(screen, fill_color(tuple(color), round(charge * charge_levels)), self.position, self.radius - 1)
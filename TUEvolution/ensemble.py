@@ -0,0 +1,152 @@
+import argparse
+import concurrent.futures
+import csv
+import numpy
+import numpy.random
+import sys
+import os
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from TUEvolution.simulation import Simulation, load_scenario, scenario_parameters
+
+# Per-generation series collected from every replicate
+series_names = ('population', 'food', 'mean_size', 'mean_speed', 'mean_sense')
+
+
+def run_replicate(scenario, seed):
+    """
+    Run one replicate of a scenario without a display.
+
+    Parameters:
+    scenario (dict): The scenario.
+    seed (numpy.random.SeedSequence): The seed of the random number stream of the replicate.
+
+    Returns:
+    dict: The per-generation series of the replicate, as numpy arrays.
+    """
+    history = Simulation(**scenario_parameters(scenario), rng=numpy.random.default_rng(seed)).run()
+
+    series = {'population': numpy.array(history['population'], dtype=float),
+              'food': numpy.array(history['food'], dtype=float)}
+    for trait in ('size', 'speed', 'sense'):
+        series[f'mean_{trait}'] = numpy.array([numpy.mean(values) if values else numpy.nan for values in history[trait]])
+    return series
+
+
+class Ensemble:
+    """
+    A class to run replicates of a scenario and aggregate their statistics.
+
+    Every replicate draws from its own random number stream, spawned from a root seed, so the
+    ensemble is reproducible regardless of the number of processes it runs on.
+    """
+
+    def __init__(self, scenario, replicates, seed=None):
+        """
+        Initialize an Ensemble object.
+
+        Parameters:
+        scenario (dict): The scenario.
+        replicates (int): The number of replicates.
+        seed (int, optional): The root seed of the replicates. Defaults to None.
+        """
+        self.scenario = scenario
+        self.replicates = replicates
+        self.seeds = numpy.random.SeedSequence(seed).spawn(replicates)
+        self.generation = numpy.arange(scenario['simulation']['generations'] + 1)
+        self.series = {}
+
+    def run(self, workers=None):
+        """
+        Run the replicates in parallel processes.
+
+        Parameters:
+        workers (int, optional): The number of processes. Defaults to the number of processors.
+
+        Returns:
+        Ensemble: The ensemble itself.
+        """
+        self.series = {name: numpy.full((self.replicates, len(self.generation)), numpy.nan) for name in series_names}
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(run_replicate, self.scenario, seed): replicate for replicate, seed in enumerate(self.seeds)}
+            for future in concurrent.futures.as_completed(futures):
+                for name, values in future.result().items():
+                    self.series[name][futures[future]] = values
+
+        return self
+
+    def mean(self, name):
+        """
+        Get the mean of a series over the replicates.
+
+        Parameters:
+        name (str): The name of the series.
+
+        Returns:
+        numpy.ndarray: The mean of every generation, ignoring extinct replicates for the traits.
+        """
+        values = self.series[name]
+        counted = numpy.sum(~numpy.isnan(values), axis=0)
+        return numpy.where(counted > 0, numpy.nansum(values, axis=0) / numpy.maximum(counted, 1), numpy.nan)
+
+    def quantiles(self, name, q):
+        """
+        Get quantiles of a series over the replicates.
+
+        Parameters:
+        name (str): The name of the series.
+        q (float or sequence): The quantiles, between 0 and 1.
+
+        Returns:
+        numpy.ndarray: The quantiles of every generation, with the quantiles along the first axis.
+        """
+        values = self.series[name]
+        result = numpy.full((numpy.size(q), len(self.generation)), numpy.nan)
+        counted = numpy.any(~numpy.isnan(values), axis=0)
+        result[:, counted] = numpy.nanquantile(values[:, counted], q, axis=0).reshape(numpy.size(q), -1)
+        return result if numpy.ndim(q) > 0 else result[0]
+
+    def summary(self, q=(0.05, 0.25, 0.5, 0.75, 0.95)):
+        """
+        Summarize the series as one row per generation.
+
+        Parameters:
+        q (sequence, optional): The quantiles to include. Defaults to (0.05, 0.25, 0.5, 0.75, 0.95).
+
+        Returns:
+        list: The rows, with the mean and quantiles of every series.
+        """
+        rows = [{'generation': int(generation)} for generation in self.generation]
+        for name in series_names:
+            mean = self.mean(name)
+            quantiles = self.quantiles(name, q)
+            for g, row in enumerate(rows):
+                row[f'{name}_mean'] = mean[g]
+                for quantile, values in zip(q, quantiles):
+                    row[f'{name}_q{round(100 * quantile):02d}'] = values[g]
+        return rows
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description='Run replicates of a scenario and print mean and quantile bands per generation.')
+    parser.add_argument('scenario', help='name of the scenario, or path to a TOML file')
+    parser.add_argument('--replicates', type=int, default=100, help='number of replicates (default: 100)')
+    parser.add_argument('--workers', type=int, help='number of processes (default: number of processors)')
+    parser.add_argument('--seed', type=int, help='root seed of the replicates')
+    parser.add_argument('--output', help='CSV file to write the table to (default: standard output)')
+    args = parser.parse_args()
+
+    ensemble = Ensemble(load_scenario(args.scenario), args.replicates, args.seed).run(args.workers)
+    rows = ensemble.summary()
+
+    output = open(args.output, 'w', newline='') if args.output else sys.stdout
+    writer = csv.DictWriter(output, fieldnames=list(rows[0]))
+    writer.writeheader()
+    writer.writerows(rows)
+
+    if output is not sys.stdout:
+        output.close()
@@ -3,9 +3,31 @@ import numpy
 import TUEvolution.utils as utils
 
 
+def tick_stride(number, max_ticks):
+    """
+    Get the stride to thin out evenly spaced ticks to at most a maximum number.
+
+    Parameters:
+    number (int): The number of ticks.
+    max_ticks (int): The maximum number of ticks.
+
+    Returns:
+    int: The smallest stride of 1, 2 or 5 times a power of ten that leaves at most max_ticks ticks.
+    """
+    if number <= max_ticks:
+        return 1
+
+    stride = number / max_ticks
+    magnitude = 10**int(numpy.floor(numpy.log10(stride)))
+    return next(magnitude * step for step in (1, 2, 5, 10) if magnitude * step >= stride)
+
+
 class Cycler:
     """
     A class to manage cycling through multiple graphs.
+
+    The cycler only needs to be redrawn when the data of the graphs, the active graph or the hovered
+    bullet changes, or every frame if the active graph is live.
     """
 
     def __init__(self, *, left, top, width, height, border, font_size, graphs=[]):
@@ -40,6 +62,8 @@ class Cycler:
 
         # Set the first graph as active
         self.active = -1 if len(graphs) == 0 else 0
+        self.needs_update = True
+        self.drawn = None
         self.bullet_radius = font_size // 3
         bullets_width = font_size * len(graphs)
         self.bullet_centers = [numpy.array([self.left + (self.width - bullets_width) // 2 + i * font_size + font_size // 2, self.top + self.height - self.border // 2 + 15]) for i in range(len(graphs))]
@@ -69,6 +93,15 @@ class Cycler:
                 return bullet_number
         return -1
 
+    def needs_redraw(self):
+        """
+        Check whether the cycler changed since it was last drawn.
+
+        Returns:
+        bool: True if the cycler needs to be redrawn, False otherwise.
+        """
+        return self.needs_update or self.drawn != (self.active, self.get_hovered()) or self.graphs[self.active].live
+
     def draw(self, screen):
         """
         Draw the cycler and the active graph on the screen.
@@ -78,6 +111,8 @@ class Cycler:
         """
         # background color for hovered bullet
         hovered = self.get_hovered()
+        self.drawn = (self.active, hovered)
+        self.needs_update = False
         if hovered != -1:
             pygame.draw.circle(screen, utils.color('darkgray'), self.bullet_centers[hovered], self.bullet_radius)
 
@@ -97,8 +132,17 @@ class Cycler:
 class Histogram:
     """
     A class to represent a histogram.
+
+    The histogram keeps the count of every integer value from the smallest to the largest value
+    added, and draws its grid and bars on a cached surface that is only redrawn when the counts change.
     """
 
+    # Room around the histogram for the axis labels on the cached surface
+    margin = 50
+
+    # Only redrawn when the data changes
+    live = False
+
     def __init__(self, *, left=None, top=None, width=None, height=None, border=None, xlabel, ylabel, barcolor, fontsize):
         """
         Initialize a Histogram object.
@@ -127,9 +171,14 @@ class Histogram:
         self.xmin = 0
         self.xmax = 1
 
-        self.data = []
+        # Counts of the values from offset on
+        self.counts = numpy.zeros(0, dtype=int)
+        self.offset = 0
         self.font = pygame.font.SysFont('Arial', fontsize)
 
+        self.needs_update = True
+        self.cached_surface = None
+
     def add(self, value):
         """
         Add a data value to the histogram.
@@ -138,44 +187,100 @@ class Histogram:
         value (int or float): The value to add to the histogram.
         """
 
-        if isinstance(value, int):
-            self.data.append(value)
+        if isinstance(value, (int, numpy.integer)):
+            self.add_many([value])
+
+    def add_many(self, values):
+        """
+        Add integer data values to the histogram.
+
+        Parameters:
+        values (numpy.ndarray or list): The values to add to the histogram.
+        """
+        values = numpy.asarray(values, dtype=int)
+        if len(values) == 0:
+            return
+
+        # Extend the counts to the range of the values
+        low = min(values.min(), self.offset) if len(self.counts) > 0 else values.min()
+        high = max(values.max() + 1, self.offset + len(self.counts))
+        if low != self.offset or high - low != len(self.counts):
+            counts = numpy.zeros(high - low, dtype=int)
+            counts[self.offset - low:self.offset - low + len(self.counts)] = self.counts
+            self.counts = counts
+            self.offset = low
+
+        self.counts += numpy.bincount(values - low, minlength=len(self.counts))
+        self.needs_update = True
+
+    def set_from_array(self, values):
+        """
+        Replace the data of the histogram, e.g. by a trait of a population.
+
+        Parameters:
+        values (numpy.ndarray or list): The integer values of the histogram.
+        """
+        self.clear()
+        self.add_many(values)
 
     def clear(self):
         """
         Clear the current data of the histogram
         """
 
-        self.data = []
+        self.counts = numpy.zeros(0, dtype=int)
+        self.offset = 0
+        self.needs_update = True
+
+    def get_bins(self):
+        """
+        Get the bins to draw, leaving out the empty bins if the values lie on a regular spacing.
 
-    def draw_grid(self, screen, bin_edges, spacing, max_y_value):
+        Returns:
+        tuple: The bin edges and the count of every bin.
+        """
+        nonzero = numpy.flatnonzero(self.counts)
+        bin_edges = numpy.arange(nonzero[0], nonzero[-1] + 1)
+        hist_values = self.counts[bin_edges]
+
+        # if the spacing between bins % min(spacing) is same for all bins, then we can use that as the spacing
+        spacing = numpy.diff(nonzero) if len(nonzero) > 1 else numpy.array([1])
+        min_spacing = spacing.min()
+        if min_spacing > 1 and numpy.all(spacing % min_spacing == 0):
+            bin_edges = nonzero
+            hist_values = self.counts[nonzero]
+
+        return bin_edges + self.offset, hist_values
+
+    def draw_grid(self, surface, left, top, bin_edges, max_y_value):
         """
         Draw the grid for the histogram and display axis values.
 
         Parameters:
-        screen (pygame.Surface): The screen to draw on.
+        surface (pygame.Surface): The surface to draw on.
+        left (int): The left position of the histogram on the surface.
+        top (int): The top position of the histogram on the surface.
         bin_edges (array) The edges of the bins.
-        spacing (int): The spacing between the bins.
         max_y_value (int): max y value of the histogram.
         """
-        pygame.draw.rect(screen, utils.color('black'), (self.left + self.border, self.top + self.border, self.width - 2 * self.border, self.height - 2 * self.border), 3)
+        pygame.draw.rect(surface, utils.color('black'), (left + self.border, top + self.border, self.width - 2 * self.border, self.height - 2 * self.border), 3)
 
         # x and y axis labels
         label = self.font.render(self.xlabel, True, utils.color('black'))
-        screen.blit(label, (self.left + (self.width - label.get_width()) // 2, self.top + self.height - self.border + 20))
+        surface.blit(label, (left + (self.width - label.get_width()) // 2, top + self.height - self.border + 20))
 
         label = self.font.render(self.ylabel, True, utils.color('black'))
         label = pygame.transform.rotate(label, 90)
-        screen.blit(label, (self.left + self.border - label.get_width() - 30, self.top + (self.height - label.get_height()) // 2))
+        surface.blit(label, (left + self.border - label.get_width() - 30, top + (self.height - label.get_height()) // 2))
 
         bins = len(bin_edges)
 
         # Draw x-axis values using the provided xmin and xmax
         for i, edge in enumerate(bin_edges):
             label = self.font.render(f'{int(edge)}', True, utils.color('black'))
-            x_pos = self.left + self.border + (i + 0.5) * (self.width - 2 * self.border) // bins - label.get_width() // 2
-            y_pos = self.top + self.height - self.border
-            screen.blit(label, (x_pos, y_pos))
+            x_pos = left + self.border + (i + 0.5) * (self.width - 2 * self.border) // bins - label.get_width() // 2
+            y_pos = top + self.height - self.border
+            surface.blit(label, (x_pos, y_pos))
 
         # Draw y-axis values
         num_y_labels = 6
@@ -183,63 +288,72 @@ class Histogram:
         for i in range(num_y_labels):  # Draw 5 evenly spaced y-axis labels
             y_val = int((float(i) / (num_y_labels - 1)) * max_y_value)
             label = self.font.render(f'{y_val}', True, utils.color('black'))
-            x_pos = self.left + self.border - label.get_width() - 5
-            y_pos = self.top + self.height - self.border - (i * (self.height - 2 * self.border) // (num_y_labels - 1)) - label.get_height() // 2
-            screen.blit(label, (x_pos, y_pos))
+            x_pos = left + self.border - label.get_width() - 5
+            y_pos = top + self.height - self.border - (i * (self.height - 2 * self.border) // (num_y_labels - 1)) - label.get_height() // 2
+            surface.blit(label, (x_pos, y_pos))
 
-    def draw(self, screen):
+    def draw_bars(self):
         """
-        Draw the histogram on the screen.
-
-        Parameters:
-        screen (pygame.Surface): The screen to draw on.
+        Draw the grid and bars of the histogram on the cached surface.
         """
-        if not self.data:
-            return
-
-        bin_edges = list(range(min(self.data), max(self.data) + 1))
-        hist_values = [self.data.count(x) if x in self.data else 0 for x in bin_edges]
+        self.cached_surface = pygame.Surface((self.width + 2 * self.margin, self.height + 2 * self.margin), pygame.SRCALPHA)
+        left = top = self.margin
 
-        non_zero_bin_edges = [edge for i, edge in enumerate(bin_edges) if hist_values[i] > 0]
-        non_zero_hist_values = [value for value in hist_values if value > 0]
+        bin_edges, hist_values = self.get_bins()
 
-        # get diffence between successive bin edges
-        spacing = numpy.diff(non_zero_bin_edges).tolist() if len(non_zero_bin_edges) > 1 else [1]
-        min_spacing = min(spacing)
+        # Get the maximum y value for the histogram, rounded up to the nearest multiple of 5
+        max_y_value = (hist_values.max() - 1) // 5 * 5 + 5
 
-        # if the spacing between bins % min(spacing) is same for all bins, then we can use that as the spacing
-        if len(set([x % min_spacing for x in spacing])) == 1 and min_spacing > 1:
-            spacing = min_spacing
-            bin_edges = non_zero_bin_edges
-            hist_values = non_zero_hist_values
-        else:
-            spacing = 1
-
-        # Get the maximum y value for the histogram
-        max_y_value = max(hist_values) if len(self.data) > 0 else 1
-        # Round up to the nearest multiple of 5
-        max_y_value = (max_y_value - 1) // 5 * 5 + 5
-
-        self.draw_grid(screen, bin_edges, spacing, max_y_value)
+        self.draw_grid(self.cached_surface, left, top, bin_edges, max_y_value)
 
         bin_width = (self.width - 2 * self.border) / len(bin_edges)
 
         for i, hist_value in enumerate(hist_values):
             bar_height = (hist_value / max_y_value) * (self.height - 2 * self.border)
             bar_rect = pygame.Rect(
-                self.left + self.border + i * bin_width,
-                self.top + self.height - self.border - bar_height,
+                left + self.border + i * bin_width,
+                top + self.height - self.border - bar_height,
                 bin_width - 2,
                 bar_height
             )
-            pygame.draw.rect(screen, self.barcolor, bar_rect)
+            pygame.draw.rect(self.cached_surface, self.barcolor, bar_rect)
+
+    def draw(self, screen):
+        """
+        Draw the histogram on the screen.
+
+        Parameters:
+        screen (pygame.Surface): The screen to draw on.
+        """
+        if not self.counts.any():
+            return
+
+        if self.cached_surface is None or self.needs_update:
+            self.draw_bars()
+            self.needs_update = False
+
+        screen.blit(self.cached_surface, (self.left - self.margin, self.top - self.margin))
 
 
 class XY:
     """
     A class to represent an XY graph.
+
+    The points are stored in a buffer that doubles its capacity when full, so adding a point takes
+    amortised constant time, and their screen coordinates are cached until the limits change. Only
+    the first, lowest, highest and last point in every pixel column is drawn, and the grid has at
+    most max_ticks lines per axis, so drawing costs the same for long series as for short ones.
     """
 
+    # Maximum number of grid lines per axis
+    max_ticks = 100
+
+    # Room around the graph for the axis labels on the cached grid
+    margin = 50
+
+    # Only redrawn when the data changes
+    live = False
+
     def __init__(self, *, left=None, top=None, width=None, height=None, border=None, xlabel, ylabel, xticks, yticks, linecolor, fontsize):
         """
         Initialize an XY graph object.
@@ -269,13 +383,37 @@ class XY:
         self.xticks = xticks
         self.yticks = yticks
 
+        # Limits and thinned ticks of the axes with given ticks
+        self.fixed_ticks = {axis: ([numpy.min(ticks), numpy.max(ticks)], numpy.asarray(ticks)[::tick_stride(len(ticks), self.max_ticks)])
+                            for axis, ticks in enumerate((xticks, yticks)) if not isinstance(ticks, int)}
+
         self.linecolor = linecolor
 
-        self.data = numpy.zeros(shape=(0, 2), dtype=int)
+        # Buffer of the points, of which the first count are used, and the maximum of every axis
+        self.buffer = numpy.zeros(shape=(16, 2))
+        self.count = 0
+        self.data_max = numpy.full(2, -numpy.inf)
         self.font = pygame.font.SysFont('Arial', fontsize)
 
         self.needs_update = True
         self.cached_grid = None
+        self.grid_lims = None
+
+        # Screen coordinates of the first converted points, for the limits they were converted with
+        self.screen_coords = numpy.zeros(shape=(16, 2))
+        self.converted = 0
+        self.converted_lims = None
+
+        # Points drawn of the completed pixel columns, and the first point of the last column
+        self.decimated = numpy.zeros(0, dtype=int)
+        self.decimated_upto = 0
+
+    @property
+    def data(self):
+        """
+        The data points of the graph, as a view of the buffer.
+        """
+        return self.buffer[:self.count]
 
     def add(self, point):
         """
@@ -284,9 +422,18 @@ class XY:
         Parameters:
         point (tuple): A tuple representing the data point (x, y).
         """
-        self.data = numpy.append(
-            self.data, numpy.array(point).reshape(1, 2), axis=0)
-        self.needs_update = True
+        if self.count == len(self.buffer):
+            self.buffer = numpy.concatenate((self.buffer, numpy.zeros_like(self.buffer)))
+            self.screen_coords = numpy.concatenate((self.screen_coords, numpy.zeros_like(self.screen_coords)))
+
+        self.buffer[self.count] = point
+        self.count += 1
+
+        # The limits, and so the grid, can only change with the maximum of the data
+        data_max = numpy.maximum(self.data_max, point)
+        if numpy.any(data_max != self.data_max):
+            self.data_max = data_max
+            self.needs_update = True
 
     def to_screen_coordinates(self, data):
         """
@@ -323,13 +470,14 @@ class XY:
 
         if isinstance(ticks, int):
             max = 0
-            if self.data.shape[0] > 0:
-                max = numpy.maximum(int(numpy.round(1.1 * numpy.max(self.data[:, axis]))), 0)
+            if self.count > 0:
+                max = numpy.maximum(int(numpy.round(1.1 * self.data_max[axis])), 0)
             max += (ticks - max % ticks)
             lim = [0, max]
-            ticks = numpy.arange(lim[0], lim[1] + 1, (lim[1] - lim[0]) // ticks)
+            step = (lim[1] - lim[0]) // ticks
+            ticks = numpy.arange(lim[0], lim[1] + 1, step * tick_stride((lim[1] - lim[0]) // step + 1, self.max_ticks))
         else:
-            lim = [numpy.min(ticks), numpy.max(ticks)]
+            lim, ticks = self.fixed_ticks[axis]
 
         return lim, ticks
 
@@ -340,38 +488,43 @@ class XY:
         Parameters:
         screen (pygame.Surface): The screen to draw on.
         """
+        if self.cached_grid is not None and self.needs_update and self.get_lims() == self.grid_lims:
+            self.needs_update = False
+
         if self.cached_grid is None or self.needs_update:
-            self.cached_grid = pygame.Surface((screen.get_width(), screen.get_height()), pygame.SRCALPHA)
-            pygame.draw.rect(self.cached_grid, utils.color('black'), (self.left + self.border, self.top + self.border, self.width - 2 * self.border, self.height - 2 * self.border), 3)
+            self.cached_grid = pygame.Surface((self.width + 2 * self.margin, self.height + 2 * self.margin), pygame.SRCALPHA)
+            left = top = self.margin
+            pygame.draw.rect(self.cached_grid, utils.color('black'), (left + self.border, top + self.border, self.width - 2 * self.border, self.height - 2 * self.border), 3)
 
             xlim, xticks = self.get_lim_and_ticks(0)
             ylim, yticks = self.get_lim_and_ticks(1)
+            self.grid_lims = self.get_lims()
 
             # Draw grid lines and tick markers
             for i, xtick in enumerate(xticks):
-                x = int(self.left + self.border + (xtick - xlim[0]) / (xlim[1] - xlim[0]) * (self.width - 2 * self.border))
-                pygame.draw.line(self.cached_grid, utils.color('gray'), (x, self.top + self.border), (x, self.top + self.height - self.border), 1)
+                x = int(left + self.border + (xtick - xlim[0]) / (xlim[1] - xlim[0]) * (self.width - 2 * self.border))
+                pygame.draw.line(self.cached_grid, utils.color('gray'), (x, top + self.border), (x, top + self.height - self.border), 1)
                 if i % 5 == 0:
                     label = self.font.render(f'{int(xtick)}', True, utils.color('black'))
-                    self.cached_grid.blit(label, (x - label.get_width() // 2, self.top + self.height - self.border))
+                    self.cached_grid.blit(label, (x - label.get_width() // 2, top + self.height - self.border))
 
             for i, ytick in enumerate(yticks):
-                y = int(self.top + self.height - self.border - (ytick - ylim[0]) / (ylim[1] - ylim[0]) * (self.height - 2 * self.border))
+                y = int(top + self.height - self.border - (ytick - ylim[0]) / (ylim[1] - ylim[0]) * (self.height - 2 * self.border))
 
-                pygame.draw.line(self.cached_grid, utils.color('gray'), (self.left + self.border, y), (self.left + self.width - self.border, y), 1)
+                pygame.draw.line(self.cached_grid, utils.color('gray'), (left + self.border, y), (left + self.width - self.border, y), 1)
                 if i % 5 == 0:
                     label = self.font.render(f'{int(ytick)}', True, utils.color('black'))
-                    self.cached_grid.blit(label, (self.left + self.border - label.get_width() - 5, y - label.get_height() // 2))
+                    self.cached_grid.blit(label, (left + self.border - label.get_width() - 5, y - label.get_height() // 2))
 
             # x and y axis labels
             label = self.font.render(self.xlabel, True, utils.color('black'))
-            self.cached_grid.blit(label, (self.left + (self.width - label.get_width()) // 2, self.top + self.height - self.border + 20))
+            self.cached_grid.blit(label, (left + (self.width - label.get_width()) // 2, top + self.height - self.border + 20))
 
             label = self.font.render(self.ylabel, True, utils.color('black'))
             label = pygame.transform.rotate(label, 90)
-            self.cached_grid.blit(label, (self.left + self.border - label.get_width() - 30, self.top + (self.height - label.get_height()) // 2))
+            self.cached_grid.blit(label, (left + self.border - label.get_width() - 30, top + (self.height - label.get_height()) // 2))
 
-        screen.blit(self.cached_grid, (0, 0))
+        screen.blit(self.cached_grid, (self.left - self.margin, self.top - self.margin))
 
     def draw(self, screen):
         """
@@ -382,8 +535,263 @@ class XY:
         """
         self.draw_grid(screen)
 
-        if self.data.shape[0] > 1:
-            screen_coords = self.to_screen_coordinates(self.data)
-            pygame.draw.aalines(screen, self.linecolor, False, screen_coords, 2)
+        if self.count > 1:
+            pygame.draw.aalines(screen, self.linecolor, False, self.get_decimated_coordinates(), 2)
 
         self.needs_update = False
+
+    def get_lims(self):
+        """
+        Get the limits of both axes and the position of the graph, which determine the screen coordinates.
+
+        Returns:
+        tuple: The limits and position.
+        """
+        return (self.get_lim_and_ticks(0)[0], self.get_lim_and_ticks(1)[0], self.left, self.top, self.width, self.height, self.border)
+
+    def get_screen_coordinates(self):
+        """
+        Get the screen coordinates of the data, only converting the points added since the limits last changed.
+
+        Returns:
+        numpy.ndarray: The screen coordinates of the data points.
+        """
+        lims = self.get_lims()
+        if lims != self.converted_lims:
+            self.converted_lims = lims
+            self.converted = 0
+            self.decimated = numpy.zeros(0, dtype=int)
+            self.decimated_upto = 0
+
+        self.screen_coords[self.converted:self.count] = self.to_screen_coordinates(self.buffer[self.converted:self.count])
+        self.converted = self.count
+        return self.screen_coords[:self.count]
+
+    def get_decimated_coordinates(self):
+        """
+        Get the screen coordinates of the points to draw: the first, lowest, highest and last point of
+        every run of points in the same pixel column, which draw the same line as all points.
+
+        Only the points added since the previous call are decimated, together with the last column,
+        to which points can still be added.
+
+        Returns:
+        numpy.ndarray: The screen coordinates of the points to draw.
+        """
+        coords = self.get_screen_coordinates()
+        start = self.decimated_upto
+
+        # Runs of new points in the same pixel column
+        columns = numpy.floor(coords[start:, 0]).astype(int)
+        run_starts = numpy.flatnonzero(numpy.concatenate(([True], columns[1:] != columns[:-1])))
+        run_ends = numpy.append(run_starts[1:], len(columns))
+
+        # Lowest and highest point of every run
+        runs = numpy.repeat(numpy.arange(len(run_starts)), run_ends - run_starts)
+        order = numpy.lexsort((coords[start:, 1], runs))
+        selected = start + numpy.unique(numpy.concatenate((run_starts, run_ends - 1, order[run_starts], order[run_ends - 1])))
+
+        # Keep the completed columns for the next call
+        completed = selected < start + run_starts[-1]
+        self.decimated = numpy.concatenate((self.decimated, selected[completed]))
+        self.decimated_upto = start + run_starts[-1]
+
+        return coords[numpy.concatenate((self.decimated, selected[~completed]))]
+
+
+class Performance:
+    """
+    A class to represent a graph of the frame time of the application.
+
+    The frame time is split into handling events, updating the simulation and rendering, and stacked
+    over the most recent frames. The achieved frame rate and the number of active creatures and food
+    are drawn over the same frames, each relative to its largest value, the frame rate at least the
+    target. The frames are kept in a ring buffer and the grid is only redrawn when the scale changes,
+    so the graph adds little to what it measures.
+    """
+
+    # Phases of a frame, and their colors
+    phases = ('check_events', 'update', 'render')
+    phase_colors = ('orange', 'royalblue', 'red')
+
+    # Colors of the frame rate, creatures and food
+    series_colors = ('dimgray', 'purple', 'forestgreen')
+
+    # Room around the graph for the axis labels on the cached grid
+    margin = 50
+
+    # Redrawn every frame
+    live = True
+
+    def __init__(self, *, left=None, top=None, width=None, height=None, border=None, fps, frames=300, fontsize):
+        """
+        Initialize a Performance graph object.
+
+        Parameters:
+        left (int, optional): The left position of the graph. Defaults to None.
+        top (int, optional): The top position of the graph. Defaults to None.
+        width (int, optional): The width of the graph. Defaults to None.
+        height (int, optional): The height of the graph. Defaults to None.
+        border (int, optional): The border size of the graph. Defaults to None.
+        fps (int): The target frame rate.
+        frames (int, optional): The number of most recent frames to show. Defaults to 300.
+        fontsize (int): The font size used in the graph.
+        """
+        self.left = left
+        self.top = top
+        self.width = width
+        self.height = height
+        self.border = border
+
+        self.fps = fps
+
+        # Ring buffer of the phase times in milliseconds, frame rate and counts of the frames
+        self.times = numpy.zeros((frames, len(self.phases)))
+        self.achieved_fps = numpy.zeros(frames)
+        self.creatures = numpy.zeros(frames, dtype=int)
+        self.food = numpy.zeros(frames, dtype=int)
+        self.index = 0
+        self.count = 0
+
+        self.font = pygame.font.SysFont('Arial', fontsize)
+
+        self.ymax = None
+        self.cached_grid = None
+
+    def add(self, times, fps, creatures, food):
+        """
+        Add a frame to the graph.
+
+        Parameters:
+        times (tuple): The time spent on every phase of the frame, in seconds.
+        fps (float): The achieved frame rate.
+        creatures (int): The number of active creatures.
+        food (int): The amount of available food.
+        """
+        self.times[self.index] = times
+        self.times[self.index] *= 1000
+        self.achieved_fps[self.index] = fps
+        self.creatures[self.index] = creatures
+        self.food[self.index] = food
+        self.index = (self.index + 1) % len(self.times)
+        self.count = min(self.count + 1, len(self.times))
+
+    def ordered(self, values):
+        """
+        Get the values of the frames in a ring buffer, from the oldest to the most recent.
+
+        Parameters:
+        values (numpy.ndarray): The ring buffer, one row per frame.
+
+        Returns:
+        numpy.ndarray: The values of the frames.
+        """
+        if self.count < len(values):
+            return values[:self.count]
+        return numpy.roll(values, -self.index, axis=0)
+
+    def get_frames(self):
+        """
+        Get the phase times of the frames in the ring buffer, from the oldest to the most recent.
+
+        Returns:
+        numpy.ndarray: The phase times in milliseconds, one row per frame.
+        """
+        return self.ordered(self.times)
+
+    def get_series(self):
+        """
+        Get the achieved frame rate and the counts of the frames, relative to their largest value.
+
+        The frame rate is relative to the largest of the achieved and the target frame rate, so the
+        target is at the top when it is reached.
+
+        Returns:
+        list: The relative frame rate, creatures and food, from the oldest to the most recent frame.
+        """
+        fps = self.ordered(self.achieved_fps)
+        series = [fps / max(numpy.max(fps, initial=0), self.fps)]
+        for counts in (self.ordered(self.creatures), self.ordered(self.food)):
+            series.append(counts / max(numpy.max(counts, initial=0), 1))
+        return series
+
+    def get_ymax(self, frame_times):
+        """
+        Get the upper limit of the frame time axis, at least the target frame time.
+
+        Parameters:
+        frame_times (numpy.ndarray): The total time of every frame in milliseconds.
+
+        Returns:
+        int: The upper limit, rounded up to a multiple of 5 ms.
+        """
+        ymax = max(numpy.max(frame_times, initial=0), 1000 / self.fps)
+        return int(numpy.ceil(ymax / 5) * 5)
+
+    def draw_grid(self):
+        """
+        Draw the grid, axis values and the target frame time on the cached grid surface.
+        """
+        self.cached_grid = pygame.Surface((self.width + 2 * self.margin, self.height + 2 * self.margin), pygame.SRCALPHA)
+        left = top = self.margin
+        pygame.draw.rect(self.cached_grid, utils.color('black'), (left + self.border, top + self.border, self.width - 2 * self.border, self.height - 2 * self.border), 3)
+
+        # Frame time values
+        num_y_labels = 6
+        for i in range(num_y_labels):
+            y_val = i * self.ymax / (num_y_labels - 1)
+            y = int(top + self.height - self.border - i * (self.height - 2 * self.border) / (num_y_labels - 1))
+            pygame.draw.line(self.cached_grid, utils.color('gray'), (left + self.border, y), (left + self.width - self.border, y), 1)
+            label = self.font.render(f'{y_val:g}', True, utils.color('black'))
+            self.cached_grid.blit(label, (left + self.border - label.get_width() - 5, y - label.get_height() // 2))
+
+        # Target frame time
+        y = int(top + self.height - self.border - 1000 / self.fps / self.ymax * (self.height - 2 * self.border))
+        pygame.draw.line(self.cached_grid, utils.color('black'), (left + self.border, y), (left + self.width - self.border, y), 1)
+
+        # x and y axis labels
+        label = self.font.render(f'Last {len(self.times)} frames', True, utils.color('black'))
+        self.cached_grid.blit(label, (left + (self.width - label.get_width()) // 2, top + self.height - self.border + 20))
+
+        label = self.font.render('Frame time (ms)', True, utils.color('black'))
+        label = pygame.transform.rotate(label, 90)
+        self.cached_grid.blit(label, (left + self.border - label.get_width() - 30, top + (self.height - label.get_height()) // 2))
+
+    def draw(self, screen):
+        """
+        Draw the graph on the screen.
+
+        Parameters:
+        screen (pygame.Surface): The screen to draw on.
+        """
+        frames = self.get_frames()
+        stacked = numpy.cumsum(frames, axis=1)
+
+        ymax = self.get_ymax(stacked[:, -1])
+        if self.cached_grid is None or ymax != self.ymax:
+            self.ymax = ymax
+            self.draw_grid()
+        screen.blit(self.cached_grid, (self.left - self.margin, self.top - self.margin))
+
+        # Stacked phase times, the most recent frame on the right
+        if len(frames) > 1:
+            x = self.left + self.border + (self.width - 2 * self.border) * (numpy.arange(len(frames)) + len(self.times) - len(frames)) / (len(self.times) - 1)
+            for phase, color in enumerate(self.phase_colors):
+                y = self.top + self.height - self.border - stacked[:, phase] / self.ymax * (self.height - 2 * self.border)
+                pygame.draw.lines(screen, utils.color(color), False, numpy.column_stack((x, y)), 1)
+
+            # Frame rate and counts, relative to their largest value over the full height
+            for values, color in zip(self.get_series(), self.series_colors):
+                y = self.top + self.height - self.border - values * (self.height - 2 * self.border)
+                pygame.draw.lines(screen, utils.color(color), False, numpy.column_stack((x, y)), 1)
+
+        # Most recent frame
+        if self.count > 0:
+            last = (self.index - 1) % len(self.times)
+            fps_color, creatures_color, food_color = self.series_colors
+            lines = [(f'{self.achieved_fps[last]:.0f} / {self.fps} fps', fps_color)]
+            lines += [(f'{phase} {self.times[last, i]:.1f} ms', color) for i, (phase, color) in enumerate(zip(self.phases, self.phase_colors))]
+            lines += [(f'{self.creatures[last]} creatures', creatures_color), (f'{self.food[last]} food', food_color)]
+            for i, (text, color) in enumerate(lines):
+                label = self.font.render(text, True, utils.color(color))
+                screen.blit(label, (self.left + self.border + 10, self.top + self.border + 10 + i * (label.get_height() + 2)))
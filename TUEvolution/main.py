@@ -1,7 +1,7 @@
+import argparse
 import pygame
 import numpy
-import toml
-import pathlib
+import time
 import sys
 import os
 
@@ -10,8 +10,12 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 import TUEvolution.utils as utils
 import TUEvolution.graphs as graphs
-from TUEvolution.map import World, Food
-from TUEvolution.creatures import Creature
+from TUEvolution.camera import Camera
+from TUEvolution.heatmap import Heatmap
+from TUEvolution.map import draw_food
+from TUEvolution.simulation import Simulation, load_scenario, scenario_parameters
+from TUEvolution.snapshot import Snapshot
+from TUEvolution.worker import SimulationWorker, latest_record
 
 
 class App:
@@ -19,7 +23,7 @@ class App:
     A class to represent the main application for the TU/evolution simulation.
     """
 
-    def __init__(self, *, population, generations, food_supply, world_day, creature_size, creature_speed, creature_stamina, creature_sense):
+    def __init__(self, *, population, generations, food_supply, world_day, creature_size, creature_speed, creature_stamina, creature_sense, world_radius=None, worker=False, lod_threshold=2000, fps=200, telemetry=None):
         """
         Initialize the App object.
 
@@ -32,6 +36,11 @@ class App:
         creature_speed (int): The speed of the creatures.
         creature_stamina (int): The stamina of the creatures.
         creature_sense (int): The sense range of creatures.
+        world_radius (int, optional): The radius of the world. Defaults to None, which fits the world in the window at one pixel per unit.
+        worker (bool, optional): Whether to run the simulation in a separate process. Defaults to False.
+        lod_threshold (int, optional): The number of living creatures above which their density is drawn instead of every creature. Defaults to 2000.
+        fps (int, optional): The number of frames rendered per second. Defaults to 200.
+        telemetry (str, optional): The CSV file to stream the outcome of every generation to. Defaults to None.
         """
         self.name = "TU/evolution"
 
@@ -49,48 +58,50 @@ class App:
         self.font_size = 16
         self.size = (self.sim_width + self.graph_width, self.sim_height)
 
-        # World
-        self.world_day = world_day
-        self.border = 20
-        self.food_radius = 4
-
-        # Creature
-        if isinstance(creature_size, int):
-            self.creature_size = {}
-            self.creature_size["init"] = creature_size
-            self.creature_size["variations"] = [0]
-            self.creature_size["probabilities"] = [1]
-
-        elif isinstance(creature_size, object):
-            self.creature_size = creature_size
+        # Regions of the screen that are redrawn separately
+        self.sim_rect = pygame.Rect(0, 0, self.sim_width, self.sim_height)
+        self.graph_rect = pygame.Rect(self.sim_width, 0, self.graph_width, self.sim_height)
 
-        if isinstance(creature_speed, int):
-            self.creature_speed = {}
-            self.creature_speed["init"] = creature_speed
-            self.creature_speed["variations"] = [0]
-            self.creature_speed["probabilities"] = [1]
-
-        elif isinstance(creature_speed, object):
-            self.creature_speed = creature_speed
-
-        if isinstance(creature_sense, int):
-            self.creature_sense = {}
-            self.creature_sense["init"] = creature_sense
-            self.creature_sense["variations"] = [0]
-            self.creature_sense["probabilities"] = [1]
+        # World, shown through a camera that fits it in the window at the start
+        self.border = 20
+        self.world_radius = self.sim_width // 2 - self.border if world_radius is None else world_radius
+        self.world_center = (self.world_radius + self.border,) * 2
+        self.camera = Camera(0, 0, self.sim_width, self.sim_height)
+        self.camera.fit(self.world_center, self.world_radius + self.border)
+        self.dragging = False
 
-        elif isinstance(creature_sense, object):
-            self.creature_sense = creature_sense
+        # Frame rate
+        self.fps = fps
 
-        self.creature_stamina = creature_stamina
+        # Simulation ticks per frame, changed with the up and down keys, and the ticks carried over
+        # to the next frame when it is a fraction. When adaptive, the simulation ticks for the given
+        # fraction of the frame time instead.
+        self.ticks_per_frame = 1
+        self.ticks_pending = 0
+        self.adaptive = False
+        self.tick_budget = 0.75
 
-        # Frame rate
-        self.fps = 200
+        # Level of detail: individual creatures, or their density in a large population
+        self.lod_threshold = lod_threshold
+        self.heatmap = Heatmap(0, 0, self.sim_width, self.sim_height)
 
         # Simulation
-        self.population = population
         self.generations = generations
-        self.food_supply = food_supply
+        parameters = dict(population=population,
+                          generations=generations,
+                          food_supply=food_supply,
+                          world_day=world_day,
+                          creature_size=creature_size,
+                          creature_speed=creature_speed,
+                          creature_stamina=creature_stamina,
+                          creature_sense=creature_sense,
+                          world_center=self.world_center,
+                          world_radius=self.world_radius,
+                          telemetry=telemetry)
+        self.simulation = Simulation(**parameters)
+
+        # Simulation in a separate process, of which the latest snapshot is drawn
+        self.worker = SimulationWorker(parameters) if worker else None
 
     def initialize(self):
         """
@@ -99,26 +110,6 @@ class App:
         # Pygame
         pygame.init()
         self.screen = pygame.display.set_mode(self.size)
-        pygame.display.set_caption(self.name)
-
-        # World
-        self.world = World(center=(self.sim_width // 2,) * 2,
-                           radius=self.sim_width // 2 - self.border,
-                           homes_width=4 * self.creature_size["init"],
-                           day=self.world_day)
-
-        # Population
-        self.generation = 0
-        self.creatures = [Creature(self.creature_size, self.creature_speed, self.creature_sense, self.creature_stamina, utils.color('red')) for _ in range(self.population)]
-        self.world.assign_homes(self.creatures)
-
-        # Food
-        self.food = []
-        for position in self.world.get_food_locations(self.food_supply):
-            self.food.append(Food(position, self.food_radius, utils.color('forestgreen')))
-
-        # Time
-        self.time = 0
 
         # Graphs
         self.population_graph = graphs.XY(xlabel='Generations',
@@ -127,7 +118,6 @@ class App:
                                           yticks=self.generations,
                                           linecolor=utils.color('red'),
                                           fontsize=self.font_size)
-        self.population_graph.add((self.generation, len(self.creatures)))
 
         self.food_graph = graphs.XY(xlabel='Generations',
                                     ylabel='Food',
@@ -135,37 +125,49 @@ class App:
                                     yticks=self.generations,
                                     linecolor=utils.color('forestgreen'),
                                     fontsize=self.font_size)
-        self.food_graph.add((self.generation, len(self.food)))
 
         self.size_hist = graphs.Histogram(xlabel='Size',
                                           ylabel='Number of creatures',
                                           barcolor=utils.color('royalblue'),
                                           fontsize=self.font_size)
-        for _ in range(self.population):
-            self.size_hist.add(self.creature_size['init'])
 
         self.speed_hist = graphs.Histogram(xlabel='Speed',
                                            ylabel='Number of creatures',
                                            barcolor=utils.color('royalblue'),
                                            fontsize=self.font_size)
-        for _ in range(self.population):
-            self.speed_hist.add(self.creature_speed['init'])
 
         self.sense_hist = graphs.Histogram(xlabel='Sense',
                                            ylabel='Number of creatures',
                                            barcolor=utils.color('royalblue'),
                                            fontsize=self.font_size)
-        for _ in range(self.population):
-            self.sense_hist.add(self.creature_sense['init'])
+
+        self.performance_graph = graphs.Performance(fps=self.fps,
+                                                    fontsize=self.font_size)
 
         self.graphs = graphs.Cycler(left=self.sim_width,
                                     top=0,
                                     width=self.graph_width,
                                     height=self.graph_height,
                                     border=self.border,
-                                    graphs=[self.population_graph, self.food_graph, self.size_hist, self.speed_hist, self.sense_hist],
+                                    graphs=[self.population_graph, self.food_graph, self.size_hist, self.speed_hist, self.sense_hist, self.performance_graph],
                                     font_size=self.font_size)
 
+        # Simulation, drawn with its own world and food store, or copies of them for a worker process
+        if self.worker is not None:
+            self.world = self.simulation.create_world()
+            self.food = self.simulation.create_food_store(self.world)
+            self.worker.start()
+        else:
+            self.simulation.initialize()
+            self.world = self.simulation.world
+            self.food = self.simulation.food
+            self.add_generation(latest_record(self.simulation.history))
+        self.set_speed()
+
+        # Counts of the last drawn snapshot
+        self.active = 0
+        self.food_count = 0
+
         self._running = True
 
     def execute(self):
@@ -176,11 +178,21 @@ class App:
 
         clock = pygame.time.Clock()
         while self._running:
+            start = time.perf_counter()
             self.check_events()
+            checked = time.perf_counter()
             self.update()
+            updated = time.perf_counter()
             self.render()
+            rendered = time.perf_counter()
             clock.tick(self.fps)
 
+            # Time of every phase of the frame, shown in the next frame
+            self.performance_graph.add((checked - start, updated - checked, rendered - updated),
+                                       clock.get_fps(),
+                                       self.active,
+                                       self.food_count)
+
         self.cleanup()
 
     def check_events(self):
@@ -196,157 +208,166 @@ class App:
                         self.graphs.previous()
                     else:
                         self.graphs.next()
+                elif event.key in (pygame.K_UP, pygame.K_EQUALS, pygame.K_PLUS):  # Speed up the simulation
+                    self.ticks_per_frame = min(2 * self.ticks_per_frame, 2**16)
+                    self.adaptive = False
+                    self.set_speed()
+                elif event.key in (pygame.K_DOWN, pygame.K_MINUS):  # Slow down the simulation
+                    self.ticks_per_frame = max(self.ticks_per_frame / 2, 1 / 64)
+                    self.adaptive = False
+                    self.set_speed()
+                elif event.key == pygame.K_a:  # Tick as fast as the frame rate allows
+                    self.adaptive = not self.adaptive
+                    self.set_speed()
+                elif event.key == pygame.K_h:  # Show the next trait in the density of a large population
+                    self.heatmap.next_trait()
+                elif event.key == pygame.K_f:  # Fit the whole world in the window
+                    self.camera.fit(self.world_center, self.world_radius + self.border)
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:
                     if self.graphs.get_hovered() != -1:  # Activate the graph corresponding to the clicked bullet
                         self.graphs.active = self.graphs.get_hovered()
-
-    def update(self):
+                    self.dragging = self.sim_rect.collidepoint(event.pos)  # Pan the world by dragging it
+            elif event.type == pygame.MOUSEBUTTONUP:
+                if event.button == 1:
+                    self.dragging = False
+            elif event.type == pygame.MOUSEMOTION:
+                if self.dragging:
+                    self.camera.pan(*event.rel)
+            elif event.type == pygame.MOUSEWHEEL:
+                if self.sim_rect.collidepoint(pygame.mouse.get_pos()):  # Zoom in and out around the mouse
+                    self.camera.zoom(2 ** (event.y / 2), pygame.mouse.get_pos())
+
+    def set_speed(self):
         """
-        Update the state of the simulation.
+        Show the speed of the simulation in the window caption, and pass it on to the worker process.
         """
-        # Move the creatures
-        self.world.increment_time()
-        for creature in self.creatures:
-            if creature.is_home() or creature.has_perished():
-                continue
-            creature.move()
-
-        # Actions
-        for creature in self.creatures:
-            if creature.is_home() or creature.has_perished():
-                continue
-
-            if creature.energy < 0:
-                creature.perish()
-                continue
-
-            if creature.is_exploring() and creature.sense > 0:
-                creature.sense_surroundings(self.creatures, self.food)
-
-            # Collect food until two food has been collected
-            for f in range(len(self.food) - 1, -1, -1):
-                food = self.food[f]
+        speed = 'adaptive' if self.adaptive else f'{self.ticks_per_frame:g} ticks/frame'
+        pygame.display.set_caption(f'{self.name} ({speed})')
 
-                if (creature.is_hungry() and sum((food.position - creature.position)**2) <= (creature.radius + food.radius)**2):
-                    creature.food += 1
-                    self.food.pop(f)
+        if self.worker is not None:
+            self.worker.set_speed(None if self.adaptive else self.ticks_per_frame * self.fps)
 
-            # Eat other creature
-            for prey in self.creatures:
-                if not creature.is_hungry():
-                    break
-
-                if creature.radius < 1.2 * prey.radius:
-                    continue
-
-                if (prey.is_alive() and sum(prey.position - creature.position)**2 <= (creature.radius + prey.radius)**2):
-                    creature.food += 1
-                    prey.perish()
-
-            # Check whether to go home
-            if creature.is_exploring():
-                if (creature.food == 2 or (creature.food == 1 and creature.home_out_of_reach(self.world))):
-                    creature.call_home(self.world)
-
-            # Move away from the edge of the world
-            if self.world.touches_edge(creature):
-                orientation = numpy.arctan2(*numpy.flip(numpy.array(self.world.center) - numpy.array(creature.position)))
-                creature.set_state(creature.position, orientation)
-                creature.update_destination(reorient=False)
-
-        # End of day/generation check
-        if (self.world.end_of_day() or all((creature.is_home() or creature.has_perished()) for creature in self.creatures)):
-            self.world.next_day()
-            self.creatures = [creature for creature in self.creatures if creature.is_home()]
-
-            # Next generation
-            if self.generation < self.generations:
-
-                self.generation += 1
-                next_generation = []
-
-                for creature in self.creatures:
-                    next_generation.append(creature.reincarnate())
-
-                    if creature.food == 2:
-                        next_generation.append(creature.reproduce())
-
-                self.creatures = next_generation
-
-                self.size_hist.clear()
-                self.speed_hist.clear()
-                self.sense_hist.clear()
+    def update(self):
+        """
+        Advance the simulation by the ticks of one frame, or collect the generations of the worker process.
+        """
+        if self.worker is not None:
+            for record in self.worker.poll():
+                self.add_generation(record)
+            return
+
+        if self.simulation.finished:
+            return
+
+        if self.adaptive:
+            deadline = time.perf_counter() + self.tick_budget / self.fps
+            while not self.simulation.finished and time.perf_counter() < deadline:
+                self.tick()
+            return
+
+        self.ticks_pending += self.ticks_per_frame
+        while not self.simulation.finished and self.ticks_pending >= 1:
+            self.tick()
+            self.ticks_pending -= 1
+
+    def tick(self):
+        """
+        Advance the simulation by one tick, and update the graphs when a new generation starts.
+        """
+        if self.simulation.finished:
+            return
 
-                for creature in self.creatures:
-                    self.size_hist.add(creature.size_evo_data['init'])
-                    self.speed_hist.add(creature.speed_evo_data['init'])
-                    self.sense_hist.add(creature.sense_evo_data['init'])
+        if self.simulation.update():
+            self.add_generation(latest_record(self.simulation.history))
 
-                self.population = len(self.creatures)
-                self.world.assign_homes(self.creatures)
+    def add_generation(self, record):
+        """
+        Add a generation to the graphs.
 
-                # Add food
-                for position in self.world.get_food_locations(self.food_supply):
-                    self.food.append(Food(position, self.food_radius, utils.color('forestgreen')))
+        Parameters:
+        record (dict): The generation number, population, food and the size, speed and sense values of the generation.
+        """
+        self.size_hist.set_from_array(record['size'])
+        self.speed_hist.set_from_array(record['speed'])
+        self.sense_hist.set_from_array(record['sense'])
 
-                # Update graphs
-                self.population_graph.add((self.generation, len(self.creatures)))
-                self.food_graph.add((self.generation, len(self.food)))
+        # Update graphs
+        self.population_graph.add((record['generation'], record['population']))
+        self.food_graph.add((record['generation'], record['food']))
+        self.graphs.needs_update = True
 
     def render(self):
         """
-        Render the simulation on the screen.
+        Render the simulation on the screen, only redrawing the graphs when they changed.
         """
-        # Background
+        # Simulation, which changes every frame
+        self.screen.set_clip(self.sim_rect)
         self.screen.fill(utils.color('white'))
 
-        # World
-        self.world.draw(self.screen)
+        snapshot = Snapshot.from_simulation(self.simulation) if self.worker is None else self.worker.read()
+        if snapshot is not None:
+            # World
+            self.world.time = snapshot.time
+            self.world.draw(self.screen, self.camera)
+
+            # Creatures and food in view, in screen coordinates
+            view = self.camera.view(snapshot, self.food.radius)
+            if view.alive() > self.lod_threshold:
+                # Density of the creatures and food
+                self.heatmap.draw(self.screen, view)
+            else:
+                # Food
+                draw_food(self.screen, view.food, max(round(self.food.radius * self.camera.scale), 1), self.food.color)
 
-        # Food
-        for food in self.food:
-            food.draw(self.screen)
+                # Creatures
+                view.draw_creatures(self.screen)
 
-        # Creatures
-        for creature in self.creatures:
-            if creature.is_alive():
-                creature.draw(self.screen)
+            self.active = snapshot.active()
+            self.food_count = len(snapshot.food)
+            if self.worker is not None:
+                self.worker.release()
+
+        dirty = [self.sim_rect]
 
         # Graphs
-        self.graphs.draw(self.screen)
+        self.screen.set_clip(self.graph_rect)
+        if self.graphs.needs_redraw():
+            self.screen.fill(utils.color('white'))
+            self.graphs.draw(self.screen)
+            dirty.append(self.graph_rect)
+        self.screen.set_clip(None)
 
-        # Update the Pygame display
-        pygame.display.update()
+        # Update the changed regions of the Pygame display
+        pygame.display.update(dirty)
 
     def cleanup(self):
         """
         Clean up resources and quit Pygame.
         """
+        if self.worker is not None:
+            self.worker.stop()
+        else:
+            self.simulation.close()
         pygame.quit()
 
 
 if __name__ == "__main__":
 
-    # Specify the scenario
-    scenario = 'question3'
+    parser = argparse.ArgumentParser(description='Run a scenario with a display.')
+    parser.add_argument('scenario', nargs='?', default='question3', help='name of the scenario, or path to a TOML file (default: question3)')
+    parser.add_argument('--world-radius', type=int, help='radius of the world (default: fit in the window)')
+    parser.add_argument('--worker', action='store_true', help='run the simulation in a separate process')
+    parser.add_argument('--telemetry', help='CSV file to stream the outcome of every generation to')
+    parser.add_argument('--lod-threshold', type=int, default=2000, help='number of creatures above which their density is drawn (default: 2000)')
+    parser.add_argument('--fps', type=int, default=200, help='number of frames rendered per second (default: 200)')
+    args = parser.parse_args()
 
     # Load the scenario
-    scenario_file = pathlib.Path(__file__).resolve().parent.parent / 'scenarios' / f'{scenario}.toml'
-    scenario = toml.load(scenario_file)
-
-    if 'sense' not in scenario['creature']:
-        scenario['creature']['sense'] = 0
+    scenario = load_scenario(args.scenario)
 
     # Create simulation instance
-    app = App(population=scenario['world']['init']['population'],
-              generations=scenario['simulation']['generations'],
-              food_supply=scenario['world']['init']['food'],
-              world_day=scenario['world']['day'],
-              creature_size=scenario['creature']['size'],
-              creature_speed=scenario['creature']['speed'],
-              creature_stamina=scenario['creature']['stamina'],
-              creature_sense=scenario['creature']['sense'])
+    app = App(**scenario_parameters(scenario), world_radius=args.world_radius, worker=args.worker, lod_threshold=args.lod_threshold, fps=args.fps, telemetry=args.telemetry)
 
     # Run the simulation
     app.execute()
@@ -1,7 +1,21 @@
-import pygame
 import numpy
 import numpy.random
 import TUEvolution.utils as utils
+from TUEvolution.spatial import Grid
+
+
+def draw_food(screen, positions, radius, color):
+    """
+    Draw food given as an array of positions on the screen, placing a cached sprite with a single Surface.blits call.
+
+    Parameters:
+    screen (pygame.Surface): The screen to draw on.
+    positions (numpy.ndarray): The (n, 2) positions of the food.
+    radius (int): The radius of the food.
+    color (tuple): The RGB color of the food.
+    """
+    sprite = utils.disc(radius, tuple(color))
+    screen.blits([(sprite, corner) for corner in (positions.astype(int) - radius).tolist()], doreturn=False)
 
 
 class World:
@@ -9,7 +23,7 @@ class World:
     A class to represent the world in which creatures live.
     """
 
-    def __init__(self, center, radius, homes_width, day):
+    def __init__(self, center, radius, homes_width, day, rng=numpy.random):
         """
         Initialize a World object.
 
@@ -18,12 +32,21 @@ class World:
         radius (int): The radius of the world.
         homes_width (int): The width of the homes area.
         day (int): The duration of a day in the world.
+        rng (numpy.random.Generator, optional): The random number generator. Defaults to the global numpy.random state.
         """
         self.radius = radius
         self.center = numpy.array(center)
         self.homes_width = homes_width
         self.day = day
         self.time = 0
+        self.rng = rng
+
+        # Drawing of the static parts of the world, and of the day dial on top of it
+        self.background = None
+        self.background_key = None
+        self.dial = None
+        self.dial_ticks = 0
+        self.dial_fractions = numpy.arange(60) / 60
 
     def end_of_day(self):
         """
@@ -53,11 +76,24 @@ class World:
         Parameters:
         creatures (list): A list of Creature objects.
         """
-        for c in range(len(creatures)):
-            θ = 2 * numpy.pi * c / len(creatures)
-            r = self.radius - self.homes_width // 2
-            position = numpy.round(self.center + r * numpy.array([numpy.cos(θ), numpy.sin(θ)])).astype(int)
-            creatures[c].set_state(position, θ + numpy.pi)
+        positions, orientations = self.get_home_locations(len(creatures))
+        for creature, position, orientation in zip(creatures, positions, orientations):
+            creature.set_state(position, orientation)
+
+    def get_home_locations(self, n_homes):
+        """
+        Generate evenly spaced home locations on the edge of the world.
+
+        Parameters:
+        n_homes (int): The number of homes to generate.
+
+        Returns:
+        tuple: The home locations as an (n_homes, 2) numpy array, and the orientations facing the center.
+        """
+        θs = 2 * numpy.pi * numpy.arange(n_homes) / max(n_homes, 1)
+        r = self.radius - self.homes_width // 2
+        positions = numpy.round(self.center + r * numpy.column_stack((numpy.cos(θs), numpy.sin(θs)))).astype(int)
+        return positions, θs + numpy.pi
 
     def get_food_locations(self, n_food):
         """
@@ -67,11 +103,11 @@ class World:
         n_food (int): The number of food locations to generate.
 
         Returns:
-        list: A list of food locations as numpy arrays.
+        numpy.ndarray: The (n_food, 2) food locations.
         """
-        θs = 2 * numpy.pi * numpy.random.rand(n_food)
-        rs = (self.radius - self.homes_width) * numpy.sqrt(numpy.random.rand(n_food))
-        return [numpy.round(self.center + r * numpy.array([numpy.cos(θ), numpy.sin(θ)])).astype(int) for θ, r in zip(θs, rs)]
+        θs = 2 * numpy.pi * self.rng.random(n_food)
+        rs = (self.radius - self.homes_width) * numpy.sqrt(self.rng.random(n_food))
+        return numpy.round(self.center + rs[:, numpy.newaxis] * numpy.column_stack((numpy.cos(θs), numpy.sin(θs)))).astype(int)
 
     def touches_edge(self, creature):
         """
@@ -85,23 +121,101 @@ class World:
         """
         return sum((creature.position - self.center)**2) > (self.radius - creature.radius)**2
 
-    def draw(self, screen):
+    def draw(self, screen, camera=None):
         """
         Draw the world on the screen.
 
         Parameters:
         screen (pygame.Surface): The screen to draw on.
+        camera (Camera, optional): The camera mapping the world to the screen. Defaults to None, which draws at the world coordinates.
+        """
+        import pygame  # Only needed for drawing, the World itself runs headless
+
+        scale = 1 if camera is None else camera.scale
+        center = self.center if camera is None else camera.to_screen(self.center)
+
+        # A world much larger than the screen is drawn directly, rather than on a surface that is mostly off screen
+        if 2 * self.radius * scale > 2 * max(screen.get_size()):
+            self.draw_clipped(screen, center, scale)
+            return
+
+        key = (tuple(self.center.tolist()), self.radius, self.homes_width, scale)
+        if self.background is None or key != self.background_key:
+            self.draw_background(scale)
+            self.background_key = key
+
+        # Ticks of the dial passed so far today, only drawing the new ones
+        ticks = self.get_dial_ticks()
+        if self.dial is None or ticks < self.dial_ticks:
+            self.dial = self.background.copy()
+            self.dial_ticks = 0
+        for start, end in self.dial_lines[self.dial_ticks:ticks]:
+            pygame.draw.line(self.dial, utils.color('lightgray'), start, end, 2)
+        self.dial_ticks = ticks
+
+        screen.blit(self.dial, numpy.round(center).astype(int) - self.background.get_width() // 2)
+
+    def draw_background(self, scale=1):
         """
-        pygame.draw.circle(screen, utils.color('dimgray'), self.center, self.radius)
+        Draw the static parts of the world on a cached surface, and compute the lines of the day dial.
 
-        r_inner = self.radius - self.homes_width // 3
-        r_outer = self.radius - 2 * (self.homes_width // 3)
-        for fraction in numpy.arange(60) / 60:
-            if fraction > self.time / self.day:
-                continue
-            dial = utils.orientation_vector((-0.5 + 2 * fraction) * numpy.pi)
-            pygame.draw.line(screen, utils.color('lightgray'), self.center + r_inner * dial, self.center + r_outer * dial, 2)
-        pygame.draw.circle(screen, utils.color('lightgray'), self.center, self.radius - self.homes_width)
+        Parameters:
+        scale (float, optional): The number of pixels per unit of the world. Defaults to 1.
+        """
+        import pygame
+
+        # Square surface around the world, with the corners transparent
+        radius = round(self.radius * scale)
+        self.background = pygame.Surface((2 * radius + 1, 2 * radius + 1))
+        self.background.fill((255, 0, 255))
+        self.background.set_colorkey((255, 0, 255), pygame.RLEACCEL)
+
+        center = numpy.array([radius, radius])
+        pygame.draw.circle(self.background, utils.color('dimgray'), center, radius)
+        pygame.draw.circle(self.background, utils.color('lightgray'), center, round((self.radius - self.homes_width) * scale))
+
+        self.dial_lines = self.get_dial_lines(center, scale)
+        self.dial = None
+
+    def draw_clipped(self, screen, center, scale):
+        """
+        Draw the world directly on the screen, leaving out what is off screen.
+
+        Parameters:
+        screen (pygame.Surface): The screen to draw on.
+        center (numpy.ndarray): The center of the world on the screen.
+        scale (float): The number of pixels per unit of the world.
+        """
+        import pygame
+
+        pygame.draw.circle(screen, utils.color('dimgray'), center, round(self.radius * scale))
+        pygame.draw.circle(screen, utils.color('lightgray'), center, round((self.radius - self.homes_width) * scale))
+        for start, end in self.get_dial_lines(center, scale)[:self.get_dial_ticks()]:
+            pygame.draw.line(screen, utils.color('lightgray'), start, end, 2)
+
+    def get_dial_ticks(self):
+        """
+        Get the number of ticks of the day dial passed so far today.
+
+        Returns:
+        int: The number of ticks.
+        """
+        return int(numpy.searchsorted(self.dial_fractions, self.time / self.day, side='right'))
+
+    def get_dial_lines(self, center, scale):
+        """
+        Get the lines of the day dial on the screen, one for every sixtieth of the day.
+
+        Parameters:
+        center (numpy.ndarray): The center of the world on the screen.
+        scale (float): The number of pixels per unit of the world.
+
+        Returns:
+        list: The start and end point of every line.
+        """
+        r_inner = (self.radius - self.homes_width // 3) * scale
+        r_outer = (self.radius - 2 * (self.homes_width // 3)) * scale
+        return [(center + r_inner * dial, center + r_outer * dial) for dial in (utils.orientation_vector((-0.5 + 2 * fraction) * numpy.pi) for fraction in self.dial_fractions)]
 
 
 class Food:
@@ -138,6 +252,12 @@ class Food:
         """
         return self.available
 
+    def consume(self):
+        """
+        Mark the food as eaten.
+        """
+        self.available = False
+
     def draw(self, screen):
         """
         Draw the food on the screen.
@@ -145,4 +265,98 @@ class Food:
         Parameters:
         screen (pygame.Surface): The screen to draw on.
         """
+        import pygame
+
         pygame.draw.circle(screen, self.color, self.position, self.radius)
+
+
+class FoodStore:
+    """
+    A class to represent all food in the world as arrays.
+
+    Eaten food stays in the arrays as unavailable until the store is compacted, so the indices
+    of the food (and the ids in its grid) only change on compaction.
+
+    Attributes:
+    positions (numpy.ndarray): The (n, 2) positions of the food.
+    available (numpy.ndarray): Whether the food is available.
+    spawned (numpy.ndarray): The generation in which the food was added.
+    radius (int): The radius of the food.
+    color (tuple): The RGB color of the food.
+    grid (Grid): The grid of the available food.
+    """
+
+    def __init__(self, world, radius, color):
+        """
+        Initialize an empty FoodStore object.
+
+        Parameters:
+        world (World): The world the food lies in.
+        radius (int): The radius of the food.
+        color (tuple): The RGB color of the food.
+        """
+        self.world = world
+        self.radius = max(radius, 2)
+        self.color = color
+
+        self.positions = numpy.zeros((0, 2), dtype=int)
+        self.available = numpy.zeros(0, dtype=bool)
+        self.spawned = numpy.zeros(0, dtype=int)
+        self.index(cell_size=2 * self.radius)
+
+    def __len__(self):
+        return int(numpy.count_nonzero(self.available))
+
+    def spawn(self, positions, generation):
+        """
+        Add food to the store.
+
+        Parameters:
+        positions (numpy.ndarray): The (n, 2) positions of the new food.
+        generation (int): The current generation.
+        """
+        positions = numpy.asarray(positions, dtype=int).reshape(-1, 2)
+        self.positions = numpy.concatenate((self.positions, positions))
+        self.available = numpy.concatenate((self.available, numpy.ones(len(positions), dtype=bool)))
+        self.spawned = numpy.concatenate((self.spawned, numpy.full(len(positions), generation)))
+
+    def consume(self, indices):
+        """
+        Mark food as eaten.
+
+        Parameters:
+        indices (int or numpy.ndarray): The indices of the food.
+        """
+        self.available[indices] = False
+        self.grid.remove(indices)
+
+    def compact(self):
+        """
+        Remove the eaten food from the arrays.
+        """
+        self.positions = self.positions[self.available]
+        self.spawned = self.spawned[self.available]
+        self.available = self.available[self.available]
+
+    def index(self, cell_size):
+        """
+        Rebuild the grid of the available food, compacting the store first if more than half of it was eaten.
+
+        Parameters:
+        cell_size (float): The width of the grid cells.
+        """
+        if 2 * len(self) < len(self.available):
+            self.compact()
+
+        self.grid = Grid(self.world.center, self.world.radius, cell_size)
+        self.grid.insert(self.positions)
+        self.grid.remove(~self.available)
+
+    def draw(self, screen):
+        """
+        Draw the available food on the screen.
+
+        Parameters:
+        screen (pygame.Surface): The screen to draw on.
+        """
+        draw_food(screen, self.positions[self.available], self.radius, self.color)
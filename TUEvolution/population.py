@@ -0,0 +1,488 @@
+import numpy
+import numpy.random
+import TUEvolution.utils as utils
+from TUEvolution.creatures import Creature, Status, power, unit_energy, walk_distance, walk_turn
+from TUEvolution.spatial import Grid, nearest
+
+# Status codes stored in the status column
+statuses = list(Status)
+status_codes = {status: code for code, status in enumerate(statuses)}
+
+EXPLORING = status_codes[Status.EXPLORING]
+RETURNING = status_codes[Status.RETURNING]
+HOME = status_codes[Status.HOME]
+PERISHED = status_codes[Status.PERISHED]
+
+# Below this number of predators, sensing compares all pairs instead of building a grid
+dense_predators = 256
+
+
+class Population:
+    """
+    A class to represent a population of creatures as contiguous columns.
+
+    Every creature is a row in the columns below. The columns follow the attributes of Creature, and
+    the methods of this class reproduce the Creature methods for all creatures at once.
+
+    Attributes:
+    position (numpy.ndarray): The (n, 2) positions of the creatures.
+    destination (numpy.ndarray): The (n, 2) destinations of the creatures.
+    orientation (numpy.ndarray): The orientations of the creatures.
+    energy (numpy.ndarray): The remaining energy of the creatures.
+    power (numpy.ndarray): The power consumption of the creatures.
+    speed (numpy.ndarray): The speed of the creatures.
+    radius (numpy.ndarray): The radius of the creatures.
+    sense (numpy.ndarray): The sense range of the creatures.
+    food (numpy.ndarray): The amount of food collected by the creatures.
+    status (numpy.ndarray): The status codes of the creatures, indices in the Status enumeration.
+    targeting (numpy.ndarray): Whether the creatures target food or run from a predator.
+    size_init, speed_init, sense_init (numpy.ndarray): The inherited size, speed and sense values.
+    """
+
+    columns = ('position', 'destination', 'orientation', 'energy', 'power', 'speed', 'radius', 'sense',
+               'food', 'status', 'targeting', 'size_init', 'speed_init', 'sense_init')
+
+    def __init__(self, size_evo_data, speed_evo_data, sense_evo_data, stamina, number, color=None, rng=numpy.random):
+        """
+        Initialize a Population object of identical primal creatures.
+
+        Parameters:
+        size_evo_data (dict): The evolution data of the size.
+        speed_evo_data (dict): The evolution data of the speed.
+        sense_evo_data (dict): The evolution data of the sense range.
+        stamina (int): The stamina of the creatures.
+        number (int): The number of creatures.
+        color (tuple, optional): The RGB color of the creatures. Defaults to red.
+        rng (numpy.random.Generator, optional): The random number generator. Defaults to the global numpy.random state.
+        """
+        self.size_evo_data = size_evo_data
+        self.speed_evo_data = speed_evo_data
+        self.sense_evo_data = sense_evo_data
+        self.stamina = stamina
+        self.color = utils.color('red') if color is None else color
+        self.rng = rng
+
+        self.set_traits(numpy.full(number, size_evo_data["init"]),
+                        numpy.full(number, speed_evo_data["init"]),
+                        numpy.full(number, sense_evo_data["init"]))
+
+    def set_traits(self, size_init, speed_init, sense_init):
+        """
+        Replace the creatures by new creatures with the given inherited values.
+
+        Parameters:
+        size_init (numpy.ndarray): The inherited size values.
+        speed_init (numpy.ndarray): The inherited speed values.
+        sense_init (numpy.ndarray): The inherited sense values.
+        """
+        number = len(size_init)
+
+        self.size_init = numpy.asarray(size_init, dtype=int)
+        self.speed_init = numpy.asarray(speed_init, dtype=int)
+        self.sense_init = numpy.asarray(sense_init, dtype=int)
+
+        self.radius = numpy.maximum(self.size_init // 2, 2)
+        self.speed = numpy.maximum(self.speed_init, 1)
+        self.sense = numpy.maximum(self.sense_init // 2, 2)
+        self.power = power(self.radius, self.speed).astype(float)
+        self.energy = numpy.full(number, self.stamina * unit_energy, dtype=float)
+
+        self.position = numpy.zeros((number, 2))
+        self.destination = numpy.zeros((number, 2))
+        self.orientation = numpy.zeros(number)
+        self.food = numpy.zeros(number, dtype=int)
+        self.status = numpy.full(number, EXPLORING, dtype=numpy.int8)
+        self.targeting = numpy.zeros(number, dtype=bool)
+
+    def __len__(self):
+        return len(self.status)
+
+    def __getitem__(self, index):
+        return CreatureView(self, index)
+
+    def __iter__(self):
+        return (CreatureView(self, index) for index in range(len(self)))
+
+    def keep(self, mask):
+        """
+        Remove all creatures that are not selected.
+
+        Parameters:
+        mask (numpy.ndarray): Boolean mask of the creatures to keep.
+        """
+        for name in self.columns:
+            setattr(self, name, getattr(self, name)[mask])
+
+    def set_state(self, positions, orientations):
+        """
+        Set the state of the creatures and initialize their destinations.
+
+        Parameters:
+        positions (numpy.ndarray): The (n, 2) positions of the creatures.
+        orientations (numpy.ndarray): The orientations of the creatures.
+        """
+        self.position[:] = positions
+        self.orientation[:] = orientations
+        self.update_destination(numpy.arange(len(self)), reorient=False)
+
+    def is_active(self):
+        """
+        Check which creatures are neither home nor perished.
+
+        Returns:
+        numpy.ndarray: Boolean mask of the active creatures.
+        """
+        return (self.status != HOME) & (self.status != PERISHED)
+
+    def is_hungry(self):
+        """
+        Check which creatures are hungry.
+
+        Returns:
+        numpy.ndarray: Boolean mask of the hungry creatures.
+        """
+        return self.food < 2
+
+    def perish(self, indices):
+        """
+        Set the status of the given creatures to perished.
+
+        Parameters:
+        indices (numpy.ndarray): The indices (or boolean mask) of the creatures.
+        """
+        self.status[indices] = PERISHED
+
+    def update_destination(self, indices, reorient=True):
+        """
+        Update the destinations of the given creatures that are not targeting.
+
+        Parameters:
+        indices (numpy.ndarray): The indices of the creatures.
+        reorient (bool): Whether to reorient the creatures.
+        """
+        indices = indices[~self.targeting[indices]]
+        if len(indices) == 0:
+            return
+
+        if reorient:
+            self.orientation[indices] += self.rng.vonmises(0, walk_turn, size=len(indices))
+
+        distance = self.rng.poisson(walk_distance, size=len(indices))
+        orientation = self.orientation[indices]
+        self.destination[indices] = self.position[indices] + distance[:, numpy.newaxis] * numpy.column_stack((numpy.cos(orientation), numpy.sin(orientation)))
+
+    def move(self):
+        """
+        Move all active creatures one step toward their destinations.
+
+        A creature that reaches its destination while exploring picks a new destination and walks
+        the remainder of its step toward it, like Creature.move.
+        """
+        indices = numpy.flatnonzero(self.is_active())
+        step = self.speed[indices].astype(float)
+
+        while len(indices) > 0:
+            direction = self.destination[indices] - self.position[indices]
+            distance = numpy.hypot(direction[:, 0], direction[:, 1])
+            reached = distance <= step
+
+            # Not reached destination
+            walking = indices[~reached]
+            self.energy[walking] -= self.power[walking] * (step[~reached] / self.speed[walking])
+            self.position[walking] += numpy.round(step[~reached, numpy.newaxis] * direction[~reached] / distance[~reached, numpy.newaxis])
+
+            # Reached destination
+            arrived = indices[reached]
+            self.energy[arrived] -= self.power[arrived] * (distance[reached] / self.speed[arrived])
+            self.position[arrived] = self.destination[arrived]
+            self.targeting[arrived] = False
+
+            self.status[arrived[self.status[arrived] == RETURNING]] = HOME
+
+            exploring = self.status[arrived] == EXPLORING
+            self.update_destination(arrived[exploring])
+
+            # Remainder of step
+            remainder = exploring & (distance[reached] < step[reached])
+            indices = arrived[remainder]
+            step = step[reached][remainder] - distance[reached][remainder]
+
+    def home_out_of_reach(self, world):
+        """
+        Check for which creatures their home is out of reach.
+
+        Parameters:
+        world (World): The world object.
+
+        Returns:
+        numpy.ndarray: Boolean mask of the creatures whose home is out of reach.
+        """
+        range = self.speed * self.energy / self.power
+        max_distance = world.radius + world.homes_width // 2
+        distance = numpy.linalg.norm(self.position - world.center, axis=1)
+        return (range <= max_distance) & (max_distance - distance > range)
+
+    def call_home(self, world, indices):
+        """
+        Set the destination of the given creatures to their home.
+
+        Parameters:
+        world (World): The world object.
+        indices (numpy.ndarray): The indices of the creatures.
+        """
+        r = world.radius - world.homes_width // 2
+        p = self.position[indices] - world.center
+        self.destination[indices] = world.center + r / numpy.linalg.norm(p, axis=1)[:, numpy.newaxis] * p
+        direction = self.destination[indices] - self.position[indices]
+        self.orientation[indices] = numpy.arctan2(direction[:, 1], direction[:, 0])
+        self.status[indices] = RETURNING
+
+    def touches_edge(self, world):
+        """
+        Check which creatures touch the edge of the world.
+
+        Parameters:
+        world (World): The world object.
+
+        Returns:
+        numpy.ndarray: Boolean mask of the creatures touching the edge.
+        """
+        return numpy.sum((self.position - world.center)**2, axis=1) > (world.radius - self.radius)**2
+
+    def turn_to_center(self, world, indices):
+        """
+        Orient the given creatures toward the center of the world and update their destinations.
+
+        Parameters:
+        world (World): The world object.
+        indices (numpy.ndarray): The indices of the creatures.
+        """
+        direction = world.center - self.position[indices]
+        self.orientation[indices] = numpy.arctan2(direction[:, 1], direction[:, 0])
+        self.update_destination(indices, reorient=False)
+
+    def sense_surroundings(self, indices, world, food):
+        """
+        Sense the surroundings of the given creatures for predators and food.
+
+        A creature runs from the nearest predator within its sense range, that is the nearest creature
+        that is large enough to eat it. Otherwise, it keeps its target while that is in range, or
+        targets the nearest food if it is hungry. Small populations compare every creature with every
+        predator, larger ones find the predators in a grid.
+
+        Parameters:
+        indices (numpy.ndarray): The indices of the sensing creatures.
+        world (World): The world object.
+        food (FoodStore): The food in the world.
+        """
+        self.energy[indices] -= self.sense[indices] / 5
+        if len(indices) == 0:
+            return
+
+        position = self.position[indices]
+        sense = self.sense[indices]
+
+        # Always run from predators regardless of food or status
+        predators = numpy.flatnonzero(self.is_active())
+        if len(predators) < dense_predators:
+            within = numpy.sum((position[:, numpy.newaxis] - self.position[predators])**2, axis=2) <= sense[:, numpy.newaxis]**2
+            queries, ids = numpy.nonzero(within)
+        else:
+            # Cells of the sense range, but not (much) more cells than creatures
+            predator_grid = Grid(world.center, world.radius, max(numpy.max(sense), 2 * world.radius / numpy.sqrt(len(predators))))
+            predator_grid.insert(self.position[predators])
+            queries, ids = predator_grid.query(position, sense)
+        ids = predators[ids]
+        offset = position[queries] - self.position[ids]
+        distance = numpy.hypot(offset[:, 0], offset[:, 1])
+        threat = (distance > 0) & (self.radius[ids] >= 1.2 * self.radius[indices[queries]])
+
+        queries, offset, distance = queries[threat], offset[threat], distance[threat]
+        closest = nearest(queries, distance)
+        running = queries[closest]
+
+        run_distance = sense[running] - distance[closest]
+        self.destination[indices[running]] = position[running] + (1.2 * run_distance / distance[closest])[:, numpy.newaxis] * offset[closest]
+        self.targeting[indices[running]] = True
+
+        calm = numpy.ones(len(indices), dtype=bool)
+        calm[running] = False
+
+        # If targeting food or predator, continue targeting until the target is out of range
+        targeting = calm & self.targeting[indices]
+        out_of_range = numpy.sum((self.destination[indices] - position)**2, axis=1) > sense**2
+        self.targeting[indices[targeting & out_of_range]] = False
+
+        # Target the nearest food if hungry and in range
+        searching = numpy.flatnonzero(calm & ~targeting & self.is_hungry()[indices])
+        queries, ids = food.grid.query(position[searching], sense[searching])
+        distance = numpy.sum((food.positions[ids] - position[searching[queries]])**2, axis=1)
+        closest = nearest(queries, distance)
+
+        found = indices[searching[queries[closest]]]
+        self.destination[found] = food.positions[ids[closest]]
+        self.targeting[found] = True
+
+    def eat_prey(self, world):
+        """
+        Let the active, hungry creatures eat the creatures they touch and are at least 1.2 times larger than.
+
+        Only creatures small enough to be eaten by the largest predator are indexed in a grid, so
+        populations of similar sizes skip this altogether. Predators eat in order of their index, each
+        starting from the prey with the lowest index, until they have collected two food.
+
+        Parameters:
+        world (World): The world object.
+
+        Returns:
+        int: The number of creatures eaten.
+        """
+        predators = numpy.flatnonzero(self.is_active() & self.is_hungry())
+        if len(predators) == 0:
+            return 0
+
+        prey = numpy.flatnonzero((self.status != PERISHED) & (1.2 * self.radius <= numpy.max(self.radius[predators])))
+        if len(prey) == 0:
+            return 0
+
+        predators = predators[self.radius[predators] >= 1.2 * numpy.min(self.radius[prey])]
+        if len(predators) == 0:
+            return 0
+
+        max_prey_radius = numpy.max(self.radius[prey])
+        prey_grid = Grid(world.center, world.radius, numpy.max(self.radius[predators]) + max_prey_radius)
+        prey_grid.insert(self.position[prey])
+
+        queries, ids = prey_grid.query(self.position[predators], self.radius[predators] + max_prey_radius)
+        hunter = predators[queries]
+        target = prey[ids]
+        catch = (self.radius[hunter] >= 1.2 * self.radius[target]) & (numpy.sum((self.position[target] - self.position[hunter])**2, axis=1) <= (self.radius[hunter] + self.radius[target])**2)
+
+        eaten = 0
+        for hunter, target in zip(hunter[catch], target[catch]):
+            if self.food[hunter] < 2 and self.status[hunter] != PERISHED and self.status[target] != PERISHED:
+                self.food[hunter] += 1
+                self.status[target] = PERISHED
+                eaten += 1
+        return eaten
+
+    def next_generation(self):
+        """
+        Create the next generation from the creatures that made it home.
+
+        Every creature is reincarnated, and creatures with two food also reproduce with mutations. The
+        offspring directly follows its parent, like in the list built from Creature.reincarnate and
+        Creature.reproduce.
+
+        Returns:
+        Population: The next generation.
+        """
+        parents = numpy.flatnonzero(self.status == HOME)
+        reproduces = self.food[parents] == 2
+
+        rows = numpy.repeat(parents, 1 + reproduces)
+        offspring = numpy.zeros(len(rows), dtype=bool)
+        offspring[numpy.cumsum(1 + reproduces)[reproduces] - 1] = True
+
+        traits = []
+        for init, evo_data in ((self.size_init, self.size_evo_data), (self.speed_init, self.speed_evo_data), (self.sense_init, self.sense_evo_data)):
+            values = init[rows]
+            values[offspring] = numpy.maximum(values[offspring] + self.mutate(evo_data, offspring.sum()), 0)
+            traits.append(values)
+
+        population = Population(self.size_evo_data, self.speed_evo_data, self.sense_evo_data, self.stamina, 0, self.color, self.rng)
+        population.set_traits(*traits)
+        return population
+
+    def mutate(self, evo_data, number):
+        """
+        Draw mutations of an attribute.
+
+        Parameters:
+        evo_data (dict): The evolution data of the attribute.
+        number (int): The number of mutations to draw.
+
+        Returns:
+        numpy.ndarray: The mutations.
+        """
+        return self.rng.choice(evo_data["variations"], size=number, p=evo_data["probabilities"]).astype(int)
+
+
+class CreatureView(Creature):
+    """
+    A Creature that reads and writes its attributes in a row of a Population.
+    """
+
+    def __init__(self, population, index):
+        """
+        Initialize a CreatureView object.
+
+        Parameters:
+        population (Population): The population the creature belongs to.
+        index (int): The row of the creature in the population.
+        """
+        self.population = population
+        self.index = index
+
+    def column(name):
+        """Helper function to create a property for a column of the population."""
+        def get(self):
+            return getattr(self.population, name)[self.index]
+
+        def set(self, value):
+            getattr(self.population, name)[self.index] = value
+
+        return property(get, set)
+
+    position = column('position')
+    destination = column('destination')
+    orientation = column('orientation')
+    energy = column('energy')
+    power = column('power')
+    speed = column('speed')
+    radius = column('radius')
+    sense = column('sense')
+    food = column('food')
+    targeting = column('targeting')
+
+    del column
+
+    @property
+    def status(self):
+        return statuses[self.population.status[self.index]]
+
+    @status.setter
+    def status(self, status):
+        self.population.status[self.index] = status_codes[status]
+
+    @property
+    def step(self):
+        return self.population.speed[self.index]
+
+    @property
+    def stamina(self):
+        return self.population.stamina
+
+    @property
+    def rng(self):
+        return self.population.rng
+
+    @property
+    def color(self):
+        return (0, 255, 0) if self.is_home() else self.population.color
+
+    @color.setter
+    def color(self, color):
+        pass  # The color follows from the status
+
+    @property
+    def size_evo_data(self):
+        return dict(self.population.size_evo_data, init=int(self.population.size_init[self.index]))
+
+    @property
+    def speed_evo_data(self):
+        return dict(self.population.speed_evo_data, init=int(self.population.speed_init[self.index]))
+
+    @property
+    def sense_evo_data(self):
+        return dict(self.population.sense_evo_data, init=int(self.population.sense_init[self.index]))
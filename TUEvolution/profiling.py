@@ -0,0 +1,102 @@
+import json
+import time
+
+
+class PhaseTimer:
+    """
+    A class to accumulate the wall time and calls of the phases of a simulation.
+
+    The phases are timed as laps: every lap is credited with the time since the previous lap (or the
+    start of the tick), so a tick only costs one clock reading per phase. A disabled timer returns
+    immediately, so the instrumentation can stay in place at next to no cost.
+    """
+
+    def __init__(self, enabled=False):
+        """
+        Initialize a PhaseTimer object.
+
+        Parameters:
+        enabled (bool, optional): Whether to time the phases. Defaults to False.
+        """
+        self.enabled = enabled
+        self.generations = {}
+        self.generation = 0
+        self.last = 0.0
+
+    def start(self, generation):
+        """
+        Start timing a tick.
+
+        Parameters:
+        generation (int): The generation the laps of the tick are credited to.
+        """
+        if not self.enabled:
+            return
+        self.generation = generation
+        self.last = time.perf_counter()
+
+    def lap(self, phase):
+        """
+        Credit the time since the previous lap to a phase.
+
+        Parameters:
+        phase (str): The name of the phase.
+        """
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        phases = self.generations.setdefault(self.generation, {})
+        seconds, calls = phases.get(phase, (0.0, 0))
+        phases[phase] = (seconds + now - self.last, calls + 1)
+        self.last = now
+
+    def totals(self):
+        """
+        Get the time and calls of every phase over all generations.
+
+        Returns:
+        dict: The seconds and calls of every phase.
+        """
+        totals = {}
+        for phases in self.generations.values():
+            for phase, (seconds, calls) in phases.items():
+                total = totals.setdefault(phase, {'seconds': 0.0, 'calls': 0})
+                total['seconds'] += seconds
+                total['calls'] += calls
+        return totals
+
+    def as_dict(self):
+        """
+        Get the timings as a structure of plain types.
+
+        Returns:
+        dict: The totals of every phase, and the seconds and calls of every phase per generation.
+        """
+        return {'totals': self.totals(),
+                'generations': [{'generation': generation,
+                                 'phases': {phase: {'seconds': seconds, 'calls': calls} for phase, (seconds, calls) in phases.items()}}
+                                for generation, phases in sorted(self.generations.items())]}
+
+    def dump(self, path):
+        """
+        Write the timings to a JSON file.
+
+        Parameters:
+        path (str or pathlib.Path): The file to write to.
+        """
+        with open(path, 'w') as output:
+            json.dump(self.as_dict(), output, indent=2)
+
+    def report(self):
+        """
+        Format the totals as a table, from the slowest phase to the fastest.
+
+        Returns:
+        str: The table.
+        """
+        totals = self.totals()
+        elapsed = sum(total['seconds'] for total in totals.values()) or 1.0
+        lines = [f'{"phase":12s} {"seconds":>10s} {"share":>7s} {"calls":>8s}']
+        for phase, total in sorted(totals.items(), key=lambda item: -item[1]['seconds']):
+            lines.append(f'{phase:12s} {total["seconds"]:10.3f} {total["seconds"] / elapsed:7.1%} {total["calls"]:8d}')
+        return '\n'.join(lines)
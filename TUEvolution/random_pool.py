@@ -0,0 +1,85 @@
+import numpy
+import numpy.random
+
+
+class RandomPool:
+    """
+    A class to draw random numbers from pre-drawn blocks.
+
+    Drawing a single sample from numpy costs about as much as drawing thousands, so the pool draws
+    a block per distribution (and parameters) at once and hands out samples from it, drawing a new
+    block when it runs out. It offers the methods of numpy.random.Generator the model uses, with the
+    same distributions, so it can be passed wherever a random number generator is expected.
+    """
+
+    def __init__(self, rng=numpy.random, block_size=4096):
+        """
+        Initialize a RandomPool object.
+
+        Parameters:
+        rng (numpy.random.Generator, optional): The random number generator to draw the blocks from. Defaults to the global numpy.random state.
+        block_size (int, optional): The number of samples drawn at once. Defaults to 4096.
+        """
+        self.rng = rng
+        self.block_size = block_size
+        self.blocks = {}
+
+    def draw(self, key, sample, size):
+        """
+        Take samples from the block of a distribution, drawing a new block if needed.
+
+        Parameters:
+        key (tuple): The distribution and its parameters.
+        sample (callable): Function drawing a given number of samples of the distribution.
+        size (int or None): The number of samples, or None for a single sample.
+
+        Returns:
+        numpy.ndarray or scalar: The samples.
+        """
+        number = 1 if size is None else size
+        block, position = self.blocks.get(key, (None, 0))
+
+        if block is None or position + number > len(block):
+            remainder = block[position:] if block is not None else block
+            block = sample(max(self.block_size, number))
+            if remainder is not None and len(remainder) > 0:
+                block = numpy.concatenate((remainder, block))
+            position = 0
+
+        self.blocks[key] = (block, position + number)
+        return block[position] if size is None else block[position:position + number]
+
+    def random(self, size=None):
+        """
+        Draw uniform samples from [0, 1).
+        """
+        return self.draw(('random',), self.rng.random, size)
+
+    def vonmises(self, mu, kappa, size=None):
+        """
+        Draw samples from a von Mises distribution.
+        """
+        return self.draw(('vonmises', mu, kappa), lambda n: self.rng.vonmises(mu, kappa, size=n), size)
+
+    def poisson(self, lam, size=None):
+        """
+        Draw samples from a Poisson distribution.
+        """
+        return self.draw(('poisson', lam), lambda n: self.rng.poisson(lam, size=n), size)
+
+    def choice(self, a, size=None, p=None):
+        """
+        Draw samples from a list of values with the given probabilities.
+
+        The probabilities are only validated when a block is drawn, not for every sample.
+        """
+        a = tuple(a)
+        p = tuple(numpy.full(len(a), 1 / len(a)) if p is None else p)
+
+        def sample(n):
+            if any(v < 0 for v in p) or not numpy.isclose(sum(p), 1):
+                raise ValueError('probabilities must be non-negative and sum to 1')
+            cdf = numpy.cumsum(p)
+            return numpy.array(a)[numpy.searchsorted(cdf / cdf[-1], self.rng.random(n), side='right')]
+
+        return self.draw(('choice', a, p), sample, size)
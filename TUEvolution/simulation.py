@@ -0,0 +1,358 @@
+import argparse
+import numpy
+import toml
+import pathlib
+import sys
+import os
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import TUEvolution.utils as utils
+from TUEvolution.map import World, FoodStore
+from TUEvolution.population import Population, EXPLORING, HOME
+from TUEvolution.profiling import PhaseTimer
+from TUEvolution.random_pool import RandomPool
+from TUEvolution.telemetry import TelemetryWriter
+
+# Directory containing the scenario files
+scenarios_dir = pathlib.Path(__file__).resolve().parent.parent / 'scenarios'
+
+
+def load_scenario(scenario):
+    """
+    Load a scenario file.
+
+    Parameters:
+    scenario (str or pathlib.Path): The name of a scenario in the scenarios directory, or a path to a TOML file.
+
+    Returns:
+    dict: The scenario.
+    """
+    scenario_file = pathlib.Path(scenario)
+    if scenario_file.suffix != '.toml':
+        scenario_file = scenarios_dir / f'{scenario}.toml'
+    scenario = toml.load(scenario_file)
+
+    if 'sense' not in scenario['creature']:
+        scenario['creature']['sense'] = 0
+
+    return scenario
+
+
+def scenario_parameters(scenario):
+    """
+    Convert a scenario to the keyword arguments of App and Simulation.
+
+    Parameters:
+    scenario (dict): The scenario.
+
+    Returns:
+    dict: The keyword arguments.
+    """
+    return dict(population=scenario['world']['init']['population'],
+                generations=scenario['simulation']['generations'],
+                food_supply=scenario['world']['init']['food'],
+                world_day=scenario['world']['day'],
+                creature_size=scenario['creature']['size'],
+                creature_speed=scenario['creature']['speed'],
+                creature_stamina=scenario['creature']['stamina'],
+                creature_sense=scenario['creature']['sense'])
+
+
+def evolution_data(value):
+    """
+    Convert a creature attribute to its evolution data.
+
+    Parameters:
+    value (int or dict): A fixed value, or a dict with the initial value, variations and probabilities.
+
+    Returns:
+    dict: The evolution data of the attribute.
+    """
+    if isinstance(value, int):
+        return {"init": value, "variations": [0], "probabilities": [1]}
+    return value
+
+
+class Simulation:
+    """
+    A class to run the TU/evolution model without a display.
+    """
+
+    def __init__(self, *, population, generations, food_supply, world_day, creature_size, creature_speed, creature_stamina, creature_sense, world_center=(300, 300), world_radius=280, food_radius=4, rng=numpy.random, profile=False, telemetry=None):
+        """
+        Initialize the Simulation object.
+
+        Parameters:
+        population (int): The initial population of creatures.
+        generations (int): The number of generations to simulate.
+        food_supply (int): The amount of food added to the world every day.
+        world_day (int): The duration of a day in the world.
+        creature_size (int or dict): The size of the creatures.
+        creature_speed (int or dict): The speed of the creatures.
+        creature_stamina (int): The stamina of the creatures.
+        creature_sense (int or dict): The sense range of creatures.
+        world_center (tuple, optional): The center of the world. Defaults to (300, 300).
+        world_radius (int, optional): The radius of the world. Defaults to 280.
+        food_radius (int, optional): The radius of the food. Defaults to 4.
+        rng (numpy.random.Generator, optional): The random number generator of the run, drawn from in blocks. Defaults to the global numpy.random state.
+        profile (bool, optional): Whether to time the phases of every update. Defaults to False.
+        telemetry (str or pathlib.Path, optional): The CSV file to stream the outcome of every generation to. Defaults to None.
+        """
+        self.population = population
+        self.generations = generations
+        self.food_supply = food_supply
+
+        # World
+        self.world_day = world_day
+        self.world_center = world_center
+        self.world_radius = world_radius
+        self.food_radius = food_radius
+        self.rng = RandomPool(rng)
+        self.timer = PhaseTimer(enabled=profile)
+        self.telemetry_path = telemetry
+        self.telemetry = None
+
+        # Creature
+        self.creature_size = evolution_data(creature_size)
+        self.creature_speed = evolution_data(creature_speed)
+        self.creature_sense = evolution_data(creature_sense)
+        self.creature_stamina = creature_stamina
+
+    def initialize(self):
+        """
+        Initialize the simulation.
+        """
+        # World
+        self.world = self.create_world()
+
+        # Population
+        self.generation = 0
+        self.creatures = Population(self.creature_size, self.creature_speed, self.creature_sense, self.creature_stamina, self.population, rng=self.rng)
+        self.creatures.set_state(*self.world.get_home_locations(len(self.creatures)))
+
+        # Food
+        self.food = self.create_food_store(self.world)
+        self.add_food()
+
+        # Per-generation series, and the outcome of the current day
+        self.history = {key: [] for key in ('generation', 'population', 'food', 'size', 'speed', 'sense')}
+        self.record()
+        self.deaths = dict.fromkeys(('starvation', 'predation', 'out_of_time'), 0)
+        if self.telemetry_path is not None:
+            self.telemetry = TelemetryWriter(self.telemetry_path)
+
+        self.finished = False
+
+    def create_world(self):
+        """
+        Create the world of the simulation.
+
+        Returns:
+        World: The world.
+        """
+        return World(center=self.world_center,
+                     radius=self.world_radius,
+                     homes_width=4 * self.creature_size["init"],
+                     day=self.world_day,
+                     rng=self.rng)
+
+    def create_food_store(self, world):
+        """
+        Create an empty food store for the simulation.
+
+        Parameters:
+        world (World): The world the food lies in.
+
+        Returns:
+        FoodStore: The food store.
+        """
+        return FoodStore(world, self.food_radius, utils.color('forestgreen'))
+
+    def add_food(self):
+        """
+        Add the daily food supply to the world, and index all available food in a grid.
+        """
+        self.food.spawn(self.world.get_food_locations(self.food_supply), self.generation)
+
+        # Every food a creature can reach is in the cells around it
+        self.food.index(cell_size=numpy.max(self.creatures.radius, initial=2) + self.food.radius)
+
+    def collect_food(self, indices):
+        """
+        Let the given creatures collect the food they touch, until they have collected two food.
+
+        Creatures collect in order of their index, each starting from the most recently added food.
+
+        Parameters:
+        indices (numpy.ndarray): The indices of the creatures.
+        """
+        creatures = self.creatures
+        indices = indices[creatures.is_hungry()[indices]]
+
+        queries, ids = self.food.grid.query(creatures.position[indices], creatures.radius[indices] + self.food.radius)
+        order = numpy.lexsort((-ids, queries))
+
+        for index, f in zip(indices[queries[order]], ids[order]):
+            if creatures.food[index] < 2 and self.food.available[f]:
+                creatures.food[index] += 1
+                self.food.consume(f)
+
+    def record(self):
+        """
+        Record the population, food and traits of the current generation.
+        """
+        self.history['generation'].append(self.generation)
+        self.history['population'].append(len(self.creatures))
+        self.history['food'].append(len(self.food))
+        self.history['size'].append(self.creatures.size_init.tolist())
+        self.history['speed'].append(self.creatures.speed_init.tolist())
+        self.history['sense'].append(self.creatures.sense_init.tolist())
+
+    def update(self):
+        """
+        Advance the simulation by one time unit.
+
+        Returns:
+        bool: True if a new generation started, False otherwise.
+        """
+        creatures = self.creatures
+        timer = self.timer
+        timer.start(self.generation)
+
+        # Move the creatures
+        self.world.increment_time()
+        creatures.move()
+        timer.lap('move')
+
+        # Perish when out of energy
+        active = creatures.is_active()
+        starving = active & (creatures.energy < 0)
+        creatures.perish(starving)
+        self.deaths['starvation'] += int(numpy.count_nonzero(starving))
+        timer.lap('perish')
+
+        # Sense the surroundings
+        sensing = (creatures.status == EXPLORING) & (creatures.sense > 0)
+        creatures.sense_surroundings(numpy.flatnonzero(sensing), self.world, self.food)
+        timer.lap('sense')
+
+        # Collect food until two food has been collected
+        self.collect_food(numpy.flatnonzero(creatures.is_active()))
+        timer.lap('food')
+
+        # Eat other creature
+        self.deaths['predation'] += creatures.eat_prey(self.world)
+        timer.lap('predation')
+
+        active = creatures.is_active()
+
+        # Check whether to go home
+        exploring = creatures.status == EXPLORING
+        going_home = exploring & ((creatures.food == 2) | ((creatures.food == 1) & creatures.home_out_of_reach(self.world)))
+        creatures.call_home(self.world, numpy.flatnonzero(going_home))
+        timer.lap('go_home')
+
+        # Move away from the edge of the world
+        creatures.turn_to_center(self.world, numpy.flatnonzero(active & creatures.touches_edge(self.world)))
+        timer.lap('edge')
+
+        # End of day/generation check
+        if self.world.end_of_day() or not active.any():
+            new_generation = self.next_day()
+            timer.lap('turnover')
+            return new_generation
+
+        return False
+
+    def next_day(self):
+        """
+        Start the next day, and the next generation if there are generations left.
+
+        Returns:
+        bool: True if a new generation started, False otherwise.
+        """
+        self.world.next_day()
+
+        # Creatures still out at the end of the day do not make it
+        self.deaths['out_of_time'] += int(numpy.count_nonzero(self.creatures.is_active()))
+        if self.telemetry is not None:
+            self.telemetry.write(self.summarize(), {'size': self.creatures.size_init, 'speed': self.creatures.speed_init, 'sense': self.creatures.sense_init})
+        self.deaths = dict.fromkeys(self.deaths, 0)
+
+        self.creatures.keep(self.creatures.status == HOME)
+
+        if self.generation >= self.generations:
+            self.finished = True
+            self.close()
+            return False
+
+        # Next generation
+        self.generation += 1
+        self.creatures = self.creatures.next_generation()
+        self.creatures.set_state(*self.world.get_home_locations(len(self.creatures)))
+
+        # Add food
+        self.add_food()
+
+        self.record()
+        return True
+
+    def summarize(self):
+        """
+        Summarize the outcome of the day of the current generation, at the end of the day.
+
+        Returns:
+        dict: The generation, its population and food at the start of the day, the food left, the
+        creatures that made it home, the offspring they will have, and the deaths by cause.
+        """
+        home = self.creatures.status == HOME
+        return {'generation': self.generation,
+                'population': len(self.creatures),
+                'food': self.history['food'][-1],
+                'food_left': len(self.food),
+                'survivors': int(numpy.count_nonzero(home)),
+                'births': int(numpy.count_nonzero(home & (self.creatures.food == 2))),
+                **self.deaths}
+
+    def close(self):
+        """
+        Write and close the telemetry, if any.
+        """
+        if self.telemetry is not None:
+            self.telemetry.close()
+
+    def run(self):
+        """
+        Run the simulation until all generations have lived their day.
+
+        Returns:
+        dict: The per-generation series of the generation number, population, food and the size, speed and sense values.
+        """
+        self.initialize()
+
+        while not self.finished:
+            self.update()
+
+        return self.history
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description='Run a scenario without a display and print the population and food of every generation.')
+    parser.add_argument('scenario', nargs='?', default='question3', help='name of the scenario, or path to a TOML file (default: question3)')
+    parser.add_argument('--profile', help='JSON file to write the time spent in every phase of the update to')
+    parser.add_argument('--telemetry', help='CSV file to stream the outcome of every generation to')
+    args = parser.parse_args()
+
+    # Run the simulation without a display
+    simulation = Simulation(**scenario_parameters(load_scenario(args.scenario)), profile=args.profile is not None, telemetry=args.telemetry)
+    history = simulation.run()
+
+    for generation, population, food in zip(history['generation'], history['population'], history['food']):
+        print(f'{generation:4d} {population:6d} {food:6d}')
+
+    if args.profile:
+        simulation.timer.dump(args.profile)
+        print(simulation.timer.report(), file=sys.stderr)
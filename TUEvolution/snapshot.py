@@ -0,0 +1,237 @@
+import numpy
+from multiprocessing import resource_tracker, shared_memory
+
+from TUEvolution.creatures import unit_energy
+from TUEvolution.population import EXPLORING, RETURNING, HOME, PERISHED
+
+
+class Snapshot:
+    """
+    A class to represent the state of a simulation that is drawn on the screen.
+
+    Attributes:
+    generation (int): The current generation.
+    time (int): The time of the day.
+    position (numpy.ndarray): The (n, 2) positions of the creatures.
+    radius (numpy.ndarray): The radius of the creatures.
+    speed (numpy.ndarray): The speed of the creatures.
+    sense (numpy.ndarray): The sense range of the creatures.
+    status (numpy.ndarray): The status codes of the creatures.
+    energy (numpy.ndarray): The remaining energy of the creatures.
+    full_energy (float): The energy of a fully charged creature.
+    color (tuple): The RGB color of the creatures.
+    food (numpy.ndarray): The (m, 2) positions of the available food.
+    """
+
+    def __init__(self, generation, time, position, radius, speed, sense, status, energy, full_energy, color, food):
+        """
+        Initialize a Snapshot object.
+
+        Parameters:
+        generation (int): The current generation.
+        time (int): The time of the day.
+        position (numpy.ndarray): The (n, 2) positions of the creatures.
+        radius (numpy.ndarray): The radius of the creatures.
+        speed (numpy.ndarray): The speed of the creatures.
+        sense (numpy.ndarray): The sense range of the creatures.
+        status (numpy.ndarray): The status codes of the creatures.
+        energy (numpy.ndarray): The remaining energy of the creatures.
+        full_energy (float): The energy of a fully charged creature.
+        color (tuple): The RGB color of the creatures.
+        food (numpy.ndarray): The (m, 2) positions of the available food.
+        """
+        self.generation = generation
+        self.time = time
+        self.position = position
+        self.radius = radius
+        self.speed = speed
+        self.sense = sense
+        self.status = status
+        self.energy = energy
+        self.full_energy = full_energy
+        self.color = color
+        self.food = food
+
+    @classmethod
+    def from_simulation(cls, simulation):
+        """
+        Take a snapshot of a simulation, referring to its creature columns instead of copying them.
+
+        Parameters:
+        simulation (Simulation): The simulation.
+
+        Returns:
+        Snapshot: The snapshot.
+        """
+        creatures = simulation.creatures
+        return cls(simulation.generation, simulation.world.time, creatures.position, creatures.radius, creatures.speed, creatures.sense, creatures.status,
+                   creatures.energy, creatures.stamina * unit_energy, creatures.color, simulation.food.positions[simulation.food.available])
+
+    def active(self):
+        """
+        Count the creatures that are exploring or returning home.
+
+        Returns:
+        int: The number of active creatures.
+        """
+        return int(numpy.count_nonzero((self.status == EXPLORING) | (self.status == RETURNING)))
+
+    def alive(self):
+        """
+        Count the creatures that have not perished.
+
+        Returns:
+        int: The number of living creatures.
+        """
+        return int(numpy.count_nonzero(self.status != PERISHED))
+
+    def draw_creatures(self, screen):
+        """
+        Draw the living creatures on the screen, in green once they are home.
+
+        Parameters:
+        screen (pygame.Surface): The screen to draw on.
+        """
+        from TUEvolution.creatures import draw_creatures
+
+        alive = numpy.flatnonzero(self.status != PERISHED)
+        colors = [(0, 255, 0) if status == HOME else self.color for status in self.status[alive].tolist()]
+        draw_creatures(screen, self.position[alive], self.radius[alive], self.sense[alive], self.energy[alive] / self.full_energy, colors)
+
+
+class SnapshotBuffer:
+    """
+    A class to pass snapshots between processes through two slots in a block of shared memory.
+
+    The writer writes a snapshot into the slot that is not the latest and then marks it as the latest,
+    so a completed snapshot is always available. The reader claims the latest slot and draws from it
+    without copying; the writer skips a snapshot rather than overwrite the slot the reader claimed.
+
+    The header holds the latest slot and the claimed slot (-1 for none). Every slot holds the counts,
+    generation, time, full energy and color, followed by the creature and food arrays, which have
+    room for a fixed number of creatures and food.
+    """
+
+    # Layout of a slot: name, dtype and shape per creature or food
+    scalars = ('creatures', 'food', 'generation', 'time', 'full_energy', 'red', 'green', 'blue')
+    creature_arrays = (('position', numpy.float64, (2,)), ('radius', numpy.int64, ()), ('speed', numpy.int64, ()),
+                       ('sense', numpy.int64, ()),
+                       ('status', numpy.int8, ()), ('energy', numpy.float64, ()))
+    food_arrays = (('food_position', numpy.int64, (2,)),)
+
+    def __init__(self, creatures, food, name=None):
+        """
+        Create a new SnapshotBuffer, or attach to an existing one.
+
+        Parameters:
+        creatures (int): The maximum number of creatures in a snapshot.
+        food (int): The maximum amount of food in a snapshot.
+        name (str, optional): The name of an existing buffer to attach to. Defaults to None, which creates a new buffer.
+        """
+        self.capacity = (creatures, food)
+
+        # Offsets of the header, the scalars and the arrays of both slots, 8-byte aligned
+        fields = [('header', numpy.int64, (2,))]
+        for slot in range(2):
+            fields.append((f'scalars{slot}', numpy.float64, (len(self.scalars),)))
+            fields += [(f'{name}{slot}', dtype, (creatures,) + shape) for name, dtype, shape in self.creature_arrays]
+            fields += [(f'{name}{slot}', dtype, (food,) + shape) for name, dtype, shape in self.food_arrays]
+
+        offsets = []
+        size = 0
+        for field, dtype, shape in fields:
+            offsets.append(size)
+            size += -(-int(numpy.prod(shape)) * numpy.dtype(dtype).itemsize // 8) * 8
+
+        self.memory = shared_memory.SharedMemory(name=name, create=name is None, size=max(size, 1))
+        self.name = self.memory.name
+        if name is not None:
+            # Only the creating process removes the buffer; an attached one must not when it exits
+            resource_tracker.unregister(self.memory._name, 'shared_memory')
+        self.arrays = {field: numpy.ndarray(shape, dtype=dtype, buffer=self.memory.buf, offset=offset)
+                       for (field, dtype, shape), offset in zip(fields, offsets)}
+
+        self.header = self.arrays['header']
+        if name is None:
+            self.header[:] = -1
+
+    def fits(self, creatures, food):
+        """
+        Check whether a snapshot fits in the buffer.
+
+        Parameters:
+        creatures (int): The number of creatures.
+        food (int): The amount of food.
+
+        Returns:
+        bool: True if both fit, False otherwise.
+        """
+        return creatures <= self.capacity[0] and food <= self.capacity[1]
+
+    def write(self, snapshot):
+        """
+        Write a snapshot into the free slot and mark it as the latest.
+
+        Parameters:
+        snapshot (Snapshot): The snapshot, which must fit in the buffer.
+
+        Returns:
+        bool: True if the snapshot was written, False if the reader claimed the free slot.
+        """
+        latest, claimed = self.header
+        slot = 0 if latest < 0 else 1 - latest
+        if claimed == slot:
+            return False
+
+        creatures = len(snapshot.status)
+        food = len(snapshot.food)
+        self.arrays[f'scalars{slot}'][:] = (creatures, food, snapshot.generation, snapshot.time, snapshot.full_energy) + tuple(snapshot.color)
+        for name, _, _ in self.creature_arrays:
+            self.arrays[f'{name}{slot}'][:creatures] = getattr(snapshot, name)
+        self.arrays[f'food_position{slot}'][:food] = snapshot.food
+
+        self.header[0] = slot
+        return True
+
+    def read(self):
+        """
+        Claim the latest slot, and get its snapshot as views of the shared memory.
+
+        The snapshot stays valid until release is called.
+
+        Returns:
+        Snapshot: The latest snapshot, or None if no snapshot was written yet.
+        """
+        while True:
+            latest = int(self.header[0])
+            if latest < 0:
+                return None
+            self.header[1] = latest
+            if self.header[0] == latest:
+                break
+
+        scalars = self.arrays[f'scalars{latest}']
+        creatures, food = int(scalars[0]), int(scalars[1])
+        views = {name: self.arrays[f'{name}{latest}'][:creatures] for name, _, _ in self.creature_arrays}
+        return Snapshot(int(scalars[2]), int(scalars[3]), full_energy=scalars[4], color=tuple(int(c) for c in scalars[5:8]),
+                        food=self.arrays[f'food_position{latest}'][:food], **views)
+
+    def release(self):
+        """
+        Release the claimed slot, so the writer can write into it again.
+        """
+        self.header[1] = -1
+
+    def close(self):
+        """
+        Close the access of this process to the buffer.
+        """
+        self.arrays = {}
+        self.header = None
+        self.memory.close()
+
+    def unlink(self):
+        """
+        Remove the buffer, once all processes closed it.
+        """
+        self.memory.unlink()
@@ -0,0 +1,159 @@
+import numpy
+
+
+class Grid:
+    """
+    A class to represent a uniform grid of points over a circular world.
+
+    The points are sorted by cell, so that all points near a position can be found by looking at
+    the cells around it. Removing a point only marks it as removed.
+    """
+
+    # Cell offsets within reach of a query, by span and cell size
+    stencils = {}
+
+    def __init__(self, center, radius, cell_size):
+        """
+        Initialize a Grid object.
+
+        Parameters:
+        center (tuple): The center of the world.
+        radius (int): The radius of the world.
+        cell_size (float): The width of the grid cells.
+        """
+        self.cell_size = max(float(cell_size), 1.0)
+        self.origin = numpy.asarray(center, dtype=float) - radius
+        self.shape = int(numpy.ceil(2 * radius / self.cell_size)) + 1
+
+        self.positions = numpy.zeros((0, 2))
+        self.alive = numpy.zeros(0, dtype=bool)
+        self.sort()
+
+    def __len__(self):
+        return int(numpy.count_nonzero(self.alive))
+
+    def cells(self, positions):
+        """
+        Get the cells containing the given positions.
+
+        Parameters:
+        positions (numpy.ndarray): The (n, 2) positions.
+
+        Returns:
+        numpy.ndarray: The (n, 2) cell coordinates, clipped to the grid.
+        """
+        return numpy.clip(((positions - self.origin) // self.cell_size).astype(int), 0, self.shape - 1)
+
+    def sort(self):
+        """
+        Sort the points by cell.
+        """
+        cells = self.cells(self.positions)
+        cells = cells[:, 0] * self.shape + cells[:, 1]
+        self.order = numpy.argsort(cells, kind='stable')
+        self.starts = numpy.concatenate(([0], numpy.cumsum(numpy.bincount(cells, minlength=self.shape**2))))
+
+    def insert(self, positions):
+        """
+        Insert points into the grid.
+
+        Parameters:
+        positions (numpy.ndarray): The (n, 2) positions of the points.
+
+        Returns:
+        numpy.ndarray: The ids of the inserted points.
+        """
+        positions = numpy.asarray(positions, dtype=float).reshape(-1, 2)
+        ids = numpy.arange(len(self.positions), len(self.positions) + len(positions))
+
+        self.positions = numpy.concatenate((self.positions, positions))
+        self.alive = numpy.concatenate((self.alive, numpy.ones(len(positions), dtype=bool)))
+        self.sort()
+        return ids
+
+    def remove(self, ids):
+        """
+        Remove points from the grid.
+
+        Parameters:
+        ids (int or numpy.ndarray): The ids of the points.
+        """
+        self.alive[ids] = False
+
+    def stencil(self, span):
+        """
+        Get the offsets of the cells that can hold points within span cells of a query cell.
+
+        Parameters:
+        span (int): The reach of the query in cells.
+
+        Returns:
+        tuple: The x and y offsets of the cells.
+        """
+        key = (span, self.cell_size)
+        if key not in Grid.stencils:
+            dx, dy = numpy.meshgrid(numpy.arange(-span, span + 1), numpy.arange(-span, span + 1))
+            gap = numpy.maximum(numpy.abs(dx) - 1, 0)**2 + numpy.maximum(numpy.abs(dy) - 1, 0)**2
+            reachable = gap <= span**2
+            Grid.stencils[key] = (dx[reachable], dy[reachable])
+        return Grid.stencils[key]
+
+    def query(self, positions, radii):
+        """
+        Find all points within a radius of the given positions.
+
+        Parameters:
+        positions (numpy.ndarray): The (n, 2) query positions.
+        radii (numpy.ndarray): The query radius for every position.
+
+        Returns:
+        tuple: The indices of the query positions and the ids of the points within their radius, sorted by query.
+        """
+        positions = numpy.asarray(positions, dtype=float).reshape(-1, 2)
+        radii = numpy.broadcast_to(radii, len(positions))
+        if len(positions) == 0 or len(self.positions) == 0:
+            return numpy.zeros(0, dtype=int), numpy.zeros(0, dtype=int)
+
+        cells = self.cells(positions)
+
+        # Cells around the query cells that can hold points within the largest radius
+        dx, dy = self.stencil(int(numpy.ceil(numpy.max(radii) / self.cell_size)))
+
+        x = (cells[:, 0, numpy.newaxis] + dx).ravel()
+        y = (cells[:, 1, numpy.newaxis] + dy).ravel()
+        inside = numpy.flatnonzero((x >= 0) & (x < self.shape) & (y >= 0) & (y < self.shape))
+        cell = x[inside] * self.shape + y[inside]
+
+        # Expand the ranges of points in the cells
+        start = self.starts[cell]
+        count = self.starts[cell + 1] - start
+        total = count.sum()
+        if total == 0:
+            return numpy.zeros(0, dtype=int), numpy.zeros(0, dtype=int)
+        offset = numpy.repeat(start - numpy.cumsum(count) + count, count)
+        queries = numpy.repeat(inside // len(dx), count)
+        ids = self.order[offset + numpy.arange(total)]
+
+        # Keep the points within the radius
+        keep = self.alive[ids] & (numpy.sum((self.positions[ids] - positions[queries])**2, axis=1) <= radii[queries]**2)
+        queries = queries[keep]
+        ids = ids[keep]
+
+        order = numpy.lexsort((ids, queries))
+        return queries[order], ids[order]
+
+
+def nearest(queries, distances):
+    """
+    Select the nearest pair of every query.
+
+    Parameters:
+    queries (numpy.ndarray): The query index of every pair.
+    distances (numpy.ndarray): The distance of every pair.
+
+    Returns:
+    numpy.ndarray: The indices of the nearest pair of every query that has a pair.
+    """
+    order = numpy.lexsort((distances, queries))
+    first = numpy.unique(queries[order], return_index=True)[1]
+    return order[first]
@@ -0,0 +1,188 @@
+import argparse
+import concurrent.futures
+import copy
+import csv
+import itertools
+import numpy
+import numpy.random
+import toml
+import sys
+import os
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from TUEvolution.simulation import Simulation, evolution_data, load_scenario, scenario_parameters
+
+
+def set_parameter(scenario, path, value):
+    """
+    Set a parameter of a scenario.
+
+    Parameters:
+    scenario (dict): The scenario.
+    path (str): The dotted path of the parameter, e.g. 'world.init.food' or 'creature.size.probabilities'.
+    value: The new value of the parameter.
+    """
+    *keys, last = path.split('.')
+    table = scenario
+    for key in keys:
+        # A fixed creature attribute becomes evolution data when one of its fields is set
+        if isinstance(table.get(key), int):
+            table[key] = evolution_data(table[key])
+        table = table.setdefault(key, {})
+    table[last] = value
+
+
+def grid(axes):
+    """
+    Create the Cartesian product of the values of the axes.
+
+    Parameters:
+    axes (dict): The values of every parameter path.
+
+    Returns:
+    list: The configurations, as dicts of parameter path and value.
+    """
+    return [dict(zip(axes, values)) for values in itertools.product(*axes.values())]
+
+
+def latin_hypercube(axes, samples, seed=None):
+    """
+    Sample the axes with a Latin hypercube.
+
+    Every axis is divided into as many strata as there are samples, and every stratum is sampled
+    once. An axis is either a list of values, of which the strata pick one, or a (low, high) tuple
+    of a range, which is sampled uniformly. Ranges with integer bounds give integer values.
+
+    Parameters:
+    axes (dict): The values or range of every parameter path.
+    samples (int): The number of configurations.
+    seed (int, optional): The seed of the sampling. Defaults to None.
+
+    Returns:
+    list: The configurations, as dicts of parameter path and value.
+    """
+    rng = numpy.random.default_rng(seed)
+    configurations = [{} for _ in range(samples)]
+
+    for path, values in axes.items():
+        u = (rng.permutation(samples) + rng.random(samples)) / samples
+
+        if isinstance(values, tuple):
+            low, high = values
+            if isinstance(low, int) and isinstance(high, int):
+                samples_of_axis = [int(v) for v in numpy.floor(low + u * (high - low + 1))]
+            else:
+                samples_of_axis = [float(v) for v in low + u * (high - low)]
+        else:
+            samples_of_axis = [values[i] for i in (u * len(values)).astype(int)]
+
+        for configuration, value in zip(configurations, samples_of_axis):
+            configuration[path] = value
+
+    return configurations
+
+
+def run_configuration(scenario, configuration, seed):
+    """
+    Run one configuration of a sweep without a display.
+
+    Parameters:
+    scenario (dict): The base scenario.
+    configuration (dict): The parameter values to set in the scenario.
+    seed (numpy.random.SeedSequence): The seed of the random numbers of the run.
+
+    Returns:
+    list: The rows of the run, one per generation.
+    """
+    scenario = copy.deepcopy(scenario)
+    for path, value in configuration.items():
+        set_parameter(scenario, path, value)
+
+    history = Simulation(**scenario_parameters(scenario), rng=numpy.random.default_rng(seed)).run()
+
+    rows = []
+    for g, generation in enumerate(history['generation']):
+        row = dict(configuration)
+        row['generation'] = generation
+        row['population'] = history['population'][g]
+        row['food'] = history['food'][g]
+        for trait in ('size', 'speed', 'sense'):
+            row[f'mean_{trait}'] = float(numpy.mean(history[trait][g])) if history[trait][g] else float('nan')
+        rows.append(row)
+    return rows
+
+
+def sweep(scenario, configurations, workers=None, seed=None):
+    """
+    Run the configurations of a sweep in parallel processes.
+
+    Parameters:
+    scenario (dict): The base scenario.
+    configurations (list): The parameter values of every run.
+    workers (int, optional): The number of processes. Defaults to the number of processors.
+    seed (int, optional): The root seed of the runs. Defaults to None.
+
+    Yields:
+    dict: The rows of the runs, one per generation, in order of completion. The row holds the
+    index of the configuration as 'run', the parameter values and the outcome of the generation.
+    """
+    seeds = numpy.random.SeedSequence(seed).spawn(len(configurations))
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run_configuration, scenario, configuration, s): run for run, (configuration, s) in enumerate(zip(configurations, seeds))}
+        for future in concurrent.futures.as_completed(futures):
+            for row in future.result():
+                yield {'run': futures[future], **row}
+
+
+def parse_axis(axis):
+    """
+    Parse an axis given on the command line.
+
+    Parameters:
+    axis (str): The axis, as 'path=value,value,...' with TOML values, or 'path=low:high' for a range.
+
+    Returns:
+    tuple: The parameter path and its values or range.
+    """
+    path, values = axis.split('=', 1)
+    if ':' in values and not values.startswith('['):
+        low, high = (toml.loads(f'v = {v}')['v'] for v in values.split(':'))
+        return path, (low, high)
+    return path, toml.loads(f'v = [{values}]')['v']
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description='Run a parameter sweep over a scenario without a display.')
+    parser.add_argument('scenario', help='name of the base scenario, or path to a TOML file')
+    parser.add_argument('--axis', action='append', default=[], help="parameter values, e.g. 'world.init.food=10,20,40' or 'creature.stamina=1000:4000'")
+    parser.add_argument('--samples', type=int, help='number of Latin hypercube samples (default: all combinations)')
+    parser.add_argument('--workers', type=int, help='number of processes (default: number of processors)')
+    parser.add_argument('--seed', type=int, help='root seed of the runs')
+    parser.add_argument('--output', help='CSV file to write the table to (default: standard output)')
+    args = parser.parse_args()
+
+    scenario = load_scenario(args.scenario)
+    axes = dict(parse_axis(axis) for axis in args.axis)
+
+    if args.samples is None:
+        if any(isinstance(values, tuple) for values in axes.values()):
+            parser.error('ranges require --samples')
+        configurations = grid(axes)
+    else:
+        configurations = latin_hypercube(axes, args.samples, args.seed)
+
+    output = open(args.output, 'w', newline='') if args.output else sys.stdout
+    fields = ['run', *axes, 'generation', 'population', 'food', 'mean_size', 'mean_speed', 'mean_sense']
+    writer = csv.DictWriter(output, fieldnames=fields)
+    writer.writeheader()
+
+    for row in sweep(scenario, configurations, args.workers, args.seed):
+        writer.writerow(row)
+        output.flush()
+
+    if output is not sys.stdout:
+        output.close()
@@ -0,0 +1,90 @@
+import csv
+import pathlib
+import time
+import numpy
+
+
+class TelemetryWriter:
+    """
+    A class to stream the outcome of every generation of a simulation to CSV files while it runs.
+
+    Every generation adds a row to the main file, and a row per distinct trait value to a second file
+    next to it (named like the main file, with '_traits' appended), in long format: generation, trait,
+    value and count. Both files are only appended to, with a header when they are new, so a run can
+    be followed or resumed while it is still going. Rows are buffered and written every buffer_size
+    generations or interval seconds, whichever comes first, so the memory use is bounded.
+
+    Attributes:
+    fields (tuple): The columns of the main file.
+    trait_fields (tuple): The columns of the traits file.
+    """
+
+    fields = ('generation', 'population', 'food', 'food_left', 'survivors', 'births', 'starvation', 'predation', 'out_of_time')
+    trait_fields = ('generation', 'trait', 'value', 'count')
+
+    def __init__(self, path, buffer_size=64, interval=10.0):
+        """
+        Initialize a TelemetryWriter object, opening or creating its files.
+
+        Parameters:
+        path (str or pathlib.Path): The main file to append to.
+        buffer_size (int, optional): The number of generations kept in memory before they are written. Defaults to 64.
+        interval (float, optional): The maximum time in seconds before buffered generations are written. Defaults to 10.
+        """
+        self.path = pathlib.Path(path)
+        self.traits_path = self.path.with_name(f'{self.path.stem}_traits{self.path.suffix}')
+        self.buffer_size = buffer_size
+        self.interval = interval
+
+        self.rows = []
+        self.trait_rows = []
+        self.files = []
+        self.writers = []
+        for file_path, fields in ((self.path, self.fields), (self.traits_path, self.trait_fields)):
+            output = open(file_path, 'a', newline='')
+            writer = csv.writer(output)
+            if output.tell() == 0:
+                writer.writerow(fields)
+            self.files.append(output)
+            self.writers.append(writer)
+
+        self.flushed = time.monotonic()
+
+    def write(self, row, traits):
+        """
+        Add the outcome of a generation.
+
+        Parameters:
+        row (dict): The value of every field of the main file.
+        traits (dict): The trait values of the creatures of the generation, per trait name.
+        """
+        self.rows.append([row[field] for field in self.fields])
+        for name, values in traits.items():
+            values, counts = numpy.unique(values, return_counts=True)
+            self.trait_rows += [(row['generation'], name, value, count) for value, count in zip(values.tolist(), counts.tolist())]
+
+        if len(self.rows) >= self.buffer_size or time.monotonic() - self.flushed >= self.interval:
+            self.flush()
+
+    def flush(self):
+        """
+        Write the buffered generations to the files.
+        """
+        for output, writer, rows in zip(self.files, self.writers, (self.rows, self.trait_rows)):
+            writer.writerows(rows)
+            output.flush()
+        self.rows = []
+        self.trait_rows = []
+        self.flushed = time.monotonic()
+
+    def close(self):
+        """
+        Write the buffered generations and close the files.
+        """
+        if not self.files:
+            return
+        self.flush()
+        for output in self.files:
+            output.close()
+        self.files = []
+        self.writers = []
@@ -1,18 +1,65 @@
+import functools
 import numpy
-import matplotlib.colors
+
+# RGB values of the colors used in the project, so matplotlib is only needed for other colors
+colors = {'black': (0, 0, 0),
+          'darkgray': (169, 169, 169),
+          'dimgray': (105, 105, 105),
+          'forestgreen': (34, 139, 34),
+          'gray': (128, 128, 128),
+          'green': (0, 128, 0),
+          'lightgray': (211, 211, 211),
+          'orange': (255, 165, 0),
+          'purple': (128, 0, 128),
+          'red': (255, 0, 0),
+          'royalblue': (65, 105, 225),
+          'white': (255, 255, 255)}
 
 
 def color(color_name):
     """
     Convert a color name to an RGB tuple.
 
+    Names that are not in the table are resolved by matplotlib, imported on first use, and added to the table.
+
     Parameters:
     color_name (str): The name of the color.
 
     Returns:
     tuple: A tuple representing the RGB values of the color.
     """
-    return tuple(int(255 * v) for v in matplotlib.colors.to_rgb(color_name))
+    try:
+        return colors[color_name]
+    except KeyError:
+        import matplotlib.colors
+
+        colors[color_name] = tuple(int(255 * v) for v in matplotlib.colors.to_rgb(color_name))
+        return colors[color_name]
+
+
+@functools.lru_cache(maxsize=1024)
+def disc(radius, color, fill=None):
+    """
+    Get a circle drawn once on a sprite, so many circles can be drawn with a single Surface.blits call.
+
+    Parameters:
+    radius (int): The radius of the circle.
+    color (tuple): The RGB color of the circle.
+    fill (tuple, optional): The RGB color inside a border of one pixel. Defaults to None, which fills the circle with its color.
+
+    Returns:
+    pygame.Surface: The circle, centered at (radius, radius) on a square surface with transparent corners.
+    """
+    import pygame
+
+    key = (255, 0, 255) if (255, 0, 255) not in (color, fill) else (0, 255, 255)
+    surface = pygame.Surface((2 * radius + 1, 2 * radius + 1))
+    surface.fill(key)
+    surface.set_colorkey(key, pygame.RLEACCEL)
+    pygame.draw.circle(surface, color, (radius, radius), radius)
+    if fill is not None:
+        pygame.draw.circle(surface, fill, (radius, radius), radius - 1)
+    return surface
 
 
 def orientation_vector(θ):
@@ -0,0 +1,193 @@
+import multiprocessing
+import queue
+import time
+import numpy
+import numpy.random
+
+from TUEvolution.simulation import Simulation
+from TUEvolution.snapshot import Snapshot, SnapshotBuffer
+
+
+def latest_record(history):
+    """
+    Get the values of the most recent generation from the history of a simulation.
+
+    Parameters:
+    history (dict): The per-generation series of the simulation.
+
+    Returns:
+    dict: The most recent value of every series.
+    """
+    return {key: values[-1] for key, values in history.items()}
+
+
+def run(parameters, seed, commands, messages, interval):
+    """
+    Run a simulation, publishing snapshots in shared memory and the generations in a queue.
+
+    The simulation ticks as fast as possible, or at the rate set by a 'speed' command, until it is
+    finished; it then waits for the 'stop' command, after which the telemetry is closed and the snapshot
+    buffers are removed. A buffer that was outgrown is removed once the reader has switched to a newer one.
+
+    Parameters:
+    parameters (dict): The keyword arguments of the Simulation.
+    seed (int or None): The seed of the random number generator.
+    commands (multiprocessing.Queue): The queue of commands: ('speed', ticks per second or None), ('switched', name) and ('stop',).
+    messages (multiprocessing.Queue): The queue of messages: ('buffer', name, creatures, food), ('generation', record) and ('finished',).
+    interval (float): The minimum time between snapshots, in seconds.
+    """
+    simulation = Simulation(**parameters, rng=numpy.random.default_rng(seed))
+    simulation.initialize()
+    messages.put(('generation', latest_record(simulation.history)))
+
+    buffers = []
+    rate = None
+    ticks = 0
+    start = time.perf_counter()
+    published = -numpy.inf
+    finished = False
+
+    while True:
+        # Handle the commands, waiting for them once the simulation is finished
+        try:
+            while True:
+                command = commands.get(block=finished, timeout=0.1 if finished else None)
+                if command[0] == 'stop':
+                    simulation.close()
+                    for buffer in buffers:
+                        buffer.close()
+                        buffer.unlink()
+                    return
+                if command[0] == 'switched':
+                    # The reader attached to the named buffer, so the buffers before it are no longer read
+                    names = [buffer.name for buffer in buffers]
+                    for buffer in buffers[:names.index(command[1])]:
+                        buffer.close()
+                        buffer.unlink()
+                    del buffers[:names.index(command[1])]
+                    continue
+                rate = command[1]
+                ticks = 0
+                start = time.perf_counter()
+        except queue.Empty:
+            pass
+
+        if finished:
+            continue
+
+        # Wait until the next tick is due
+        if rate is not None and ticks >= (time.perf_counter() - start) * rate:
+            time.sleep(min(1 / rate, interval))
+            continue
+
+        new_generation = simulation.update()
+        ticks += 1
+        if new_generation:
+            messages.put(('generation', latest_record(simulation.history)))
+        finished = simulation.finished
+
+        # Publish a snapshot, in a larger buffer if it does not fit
+        now = time.perf_counter()
+        if new_generation or finished or now - published >= interval:
+            snapshot = Snapshot.from_simulation(simulation)
+            if not buffers or not buffers[-1].fits(len(snapshot.status), len(snapshot.food)):
+                buffers.append(SnapshotBuffer(max(2 * len(snapshot.status), 1024), max(2 * len(snapshot.food), 1024)))
+                messages.put(('buffer', buffers[-1].name) + buffers[-1].capacity)
+            if buffers[-1].write(snapshot):
+                published = now
+
+        if finished:
+            messages.put(('finished',))
+
+
+class SimulationWorker:
+    """
+    A class to run a simulation in a separate process and read its latest state.
+
+    The worker process ticks the simulation and publishes snapshots in shared memory, so the
+    simulation and the drawing run on separate cores without waiting for each other.
+    """
+
+    def __init__(self, parameters, seed=None, interval=1 / 240):
+        """
+        Initialize a SimulationWorker object.
+
+        Parameters:
+        parameters (dict): The keyword arguments of the Simulation.
+        seed (int, optional): The seed of the random number generator. Defaults to None.
+        interval (float, optional): The minimum time between snapshots, in seconds. Defaults to 1/240.
+        """
+        self.parameters = parameters
+        self.seed = seed
+        self.interval = interval
+
+        self.buffer = None
+        self.finished = False
+
+    def start(self):
+        """
+        Start the worker process.
+        """
+        self.commands = multiprocessing.Queue()
+        self.messages = multiprocessing.Queue()
+        self.process = multiprocessing.Process(target=run, args=(self.parameters, self.seed, self.commands, self.messages, self.interval), daemon=True)
+        self.process.start()
+
+    def set_speed(self, ticks_per_second):
+        """
+        Set the rate at which the simulation ticks.
+
+        Parameters:
+        ticks_per_second (float or None): The number of ticks per second, or None to tick as fast as possible.
+        """
+        self.commands.put(('speed', ticks_per_second))
+
+    def poll(self):
+        """
+        Handle the messages of the worker process.
+
+        Returns:
+        list: The records of the generations that started since the previous poll.
+        """
+        records = []
+        while True:
+            try:
+                message = self.messages.get_nowait()
+            except queue.Empty:
+                return records
+
+            if message[0] == 'generation':
+                records.append(message[1])
+            elif message[0] == 'buffer':
+                if self.buffer is not None:
+                    self.buffer.close()
+                self.buffer = SnapshotBuffer(*message[2:], name=message[1])
+                self.commands.put(('switched', message[1]))
+            elif message[0] == 'finished':
+                self.finished = True
+
+    def read(self):
+        """
+        Claim the latest snapshot. It must be released before the next read.
+
+        Returns:
+        Snapshot: The latest snapshot, or None if there is none yet.
+        """
+        return None if self.buffer is None else self.buffer.read()
+
+    def release(self):
+        """
+        Release the claimed snapshot.
+        """
+        if self.buffer is not None:
+            self.buffer.release()
+
+    def stop(self):
+        """
+        Stop the worker process and close the snapshot buffer.
+        """
+        self.commands.put(('stop',))
+        self.process.join(timeout=5)
+        if self.buffer is not None:
+            self.buffer.close()
+            self.buffer = None
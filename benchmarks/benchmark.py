@@ -0,0 +1,347 @@
+import argparse
+import copy
+import datetime
+import json
+import platform
+import time
+import numpy
+import numpy.random
+import sys
+import os
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Render without opening a window
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import TUEvolution.utils as utils
+from TUEvolution.creatures import Creature
+from TUEvolution.map import World, Food
+from TUEvolution.population import HOME
+from TUEvolution.simulation import Simulation
+
+# Fixed attributes of the benchmark creatures
+size = {"init": 12, "variations": [-1, 0, 1], "probabilities": [0.25, 0.5, 0.25]}
+speed = {"init": 3, "variations": [-1, 0, 1], "probabilities": [0.25, 0.5, 0.25]}
+sense = {"init": 100, "variations": [-10, 0, 10], "probabilities": [0.25, 0.5, 0.25]}
+
+# World radius of 100 creatures; larger populations get a larger world of the same density
+density_radius = 280
+density_population = 100
+
+# Ticks before a tick benchmark starts timing, in which the initial crowding is resolved, and the
+# ticks of every call, which all start from the state after the warm-up
+warmup_ticks = 20
+ticks_per_call = 10
+
+
+def measure(function, min_time, setup=None):
+    """
+    Call a function repeatedly for at least a minimum time.
+
+    Parameters:
+    function (callable): The function to call. It may return a number of work items, e.g. creature-ticks.
+    min_time (float): The minimum time to call the function for, in seconds.
+    setup (callable, optional): A function to call before every call, outside the measured time. Defaults to None.
+
+    Returns:
+    dict: The number of calls, the seconds per call and the calls (and items) per second.
+    """
+    calls = 0
+    items = 0
+    elapsed = 0
+    start = time.perf_counter()
+    while True:
+        if setup is not None:
+            setup()
+            start = time.perf_counter()
+        items += function() or 0
+        calls += 1
+        now = time.perf_counter()
+        elapsed += now - start
+        start = now
+        if elapsed >= min_time:
+            break
+
+    result = {'calls': calls, 'seconds_per_call': elapsed / calls, 'calls_per_second': calls / elapsed}
+    if items:
+        result['items_per_second'] = items / elapsed
+    return result
+
+
+def make_simulation(population, food, seed=0):
+    """
+    Create an initialized simulation with a day that does not end during the benchmark.
+
+    The world grows with the population, so every population is as crowded as 100 creatures in the
+    default world, and the cost per creature-tick can be compared between populations.
+
+    Parameters:
+    population (int): The number of creatures.
+    food (int): The food supply.
+    seed (int, optional): The seed of the run. Defaults to 0.
+
+    Returns:
+    Simulation: The simulation.
+    """
+    radius = round(density_radius * max(population / density_population, 1) ** 0.5)
+    simulation = Simulation(population=population,
+                            generations=1,
+                            food_supply=food,
+                            world_day=10**9,
+                            creature_size=size,
+                            creature_speed=speed,
+                            creature_stamina=10**6,
+                            creature_sense=sense,
+                            world_center=(radius + 20, radius + 20),
+                            world_radius=radius,
+                            rng=numpy.random.default_rng(seed))
+    simulation.initialize()
+
+    # Spread the creatures over the world, with varied sizes for predation
+    rng = numpy.random.default_rng(seed)
+    creatures = simulation.creatures
+    creatures.set_traits(rng.choice([8, 12, 16], size=population), creatures.speed_init, creatures.sense_init)
+    creatures.set_state(simulation.world.get_food_locations(population), rng.uniform(0, 2 * numpy.pi, population))
+    return simulation
+
+
+def bench_tick(population, food):
+    """Ten ticks of the simulation per call, all from the same state after a warm-up, counting creature-ticks."""
+    simulation = make_simulation(population, food)
+    for _ in range(warmup_ticks):
+        simulation.update()
+    state = (simulation.creatures, simulation.food, simulation.rng, simulation.world.time)
+
+    def restore():
+        simulation.creatures, simulation.food, simulation.rng, simulation.world.time = copy.deepcopy(state)
+
+    def tick():
+        active = 0
+        for _ in range(ticks_per_call):
+            active += numpy.count_nonzero(simulation.creatures.is_active())
+            simulation.update()
+        return active
+
+    return tick, restore
+
+
+def bench_creature_move():
+    """Creature.move of a single creature."""
+    creature = Creature(size, speed, sense, 2000, utils.color('red'))
+    creature.set_state(numpy.array([300.0, 300.0]), 0)
+
+    def move():
+        creature.move()
+        creature.set_state(numpy.array([300.0, 300.0]), creature.orientation)
+
+    return move
+
+
+def bench_creature_sense(number):
+    """Creature.sense_surroundings of one creature among as many creatures as food."""
+    world = World(center=(300, 300), radius=280, homes_width=48, day=1000)
+    creatures = [Creature(size, speed, sense, 2000, utils.color('red')) for _ in range(number)]
+    for creature, position in zip(creatures, world.get_food_locations(number)):
+        creature.set_state(position.astype(float), 0)
+    food = [Food(position, 4, utils.color('forestgreen')) for position in world.get_food_locations(number)]
+
+    def sense_surroundings():
+        creatures[0].targeting = False
+        creatures[0].sense_surroundings(creatures, food)
+
+    return sense_surroundings
+
+
+def bench_population_move(population):
+    """Population.move of all creatures."""
+    simulation = make_simulation(population, 0)
+    return simulation.creatures.move
+
+
+def bench_population_sense(population, food):
+    """Population.sense_surroundings of all creatures."""
+    simulation = make_simulation(population, food)
+    creatures = simulation.creatures
+    indices = numpy.arange(population)
+
+    def sense_surroundings():
+        creatures.targeting[:] = False
+        creatures.sense_surroundings(indices, simulation.world, simulation.food)
+
+    return sense_surroundings
+
+
+def bench_predation(population):
+    """Population.eat_prey, restoring the eaten creatures before every call."""
+    simulation = make_simulation(population, 0)
+    creatures = simulation.creatures
+    status = creatures.status.copy()
+
+    def restore():
+        creatures.status[:] = status
+        creatures.food[:] = 0
+
+    return lambda: creatures.eat_prey(simulation.world), restore
+
+
+def bench_turnover(population, food):
+    """End of day: reincarnation, reproduction, homes and food of the next generation, from the same day every call."""
+    simulation = make_simulation(population, food)
+    creatures = simulation.creatures
+    store = simulation.food
+    positions, available, spawned = store.positions.copy(), store.available.copy(), store.spawned.copy()
+    history = {key: values[:] for key, values in simulation.history.items()}
+
+    def restore():
+        creatures.status[:] = HOME
+        creatures.food[:] = numpy.arange(population) % 3
+        store.positions, store.available, store.spawned = positions.copy(), available.copy(), spawned.copy()
+        simulation.history = {key: values[:] for key, values in history.items()}
+        simulation.creatures = creatures
+        simulation.generation = 0
+        simulation.finished = False
+
+    return simulation.next_day, restore
+
+
+def make_app():
+    """Create an initialized App that renders to an offscreen surface."""
+    import pygame
+    from TUEvolution.main import App
+
+    app = App(population=1000,
+              generations=50,
+              food_supply=1000,
+              world_day=10**9,
+              creature_size=size,
+              creature_speed=speed,
+              creature_stamina=10**6,
+              creature_sense=sense)
+    app.initialize()
+    app.screen = pygame.Surface(app.size)
+    return app
+
+
+def bench_histogram_draw(app):
+    """Histogram.draw of the sense histogram."""
+    histogram = app.sense_hist
+    histogram.clear()
+    for value in numpy.random.default_rng(0).normal(100, 30, size=1000).astype(int):
+        histogram.add(int(value))
+    return lambda: histogram.draw(app.screen)
+
+
+def bench_xy_add(app):
+    """XY.add of a point to a series of 10000 points."""
+    from TUEvolution.graphs import XY
+
+    graph = XY(xlabel='x', ylabel='y', xticks=10, yticks=10, linecolor=utils.color('red'), fontsize=16)
+    for x in range(10000):
+        graph.add((x, x))
+    return lambda: graph.add((0, 0))
+
+
+def bench_render(app):
+    """App.render of 1000 creatures and food."""
+    return app.render
+
+
+def run(min_time, quick=False, filter=None):
+    """
+    Run the benchmarks.
+
+    Parameters:
+    min_time (float): The minimum time per benchmark, in seconds.
+    quick (bool, optional): Whether to skip the largest populations. Defaults to False.
+    filter (str, optional): Only run benchmarks whose name contains this text. Defaults to None.
+
+    Returns:
+    dict: The results of every benchmark.
+    """
+    populations = (10, 100, 1000) if quick else (10, 100, 1000, 10000)
+
+    benchmarks = {}
+    # The default scenario, question3, once its population has grown
+    benchmarks['tick/population=20/food=20'] = lambda: bench_tick(20, 20)
+    for population in populations:
+        benchmarks[f'tick/population={population}/food={population}'] = lambda population=population: bench_tick(population, population)
+        benchmarks[f'tick/population={population}/food={4 * population}'] = lambda population=population: bench_tick(population, 4 * population)
+    benchmarks['creature.move'] = bench_creature_move
+    benchmarks['creature.sense_surroundings/creatures=100/food=100'] = lambda: bench_creature_sense(100)
+    benchmarks['population.move/population=1000'] = lambda: bench_population_move(1000)
+    benchmarks['population.sense_surroundings/population=20/food=20'] = lambda: bench_population_sense(20, 20)
+    benchmarks['population.sense_surroundings/population=1000/food=1000'] = lambda: bench_population_sense(1000, 1000)
+    benchmarks['predation/population=1000'] = lambda: bench_predation(1000)
+    benchmarks['turnover/population=1000/food=1000'] = lambda: bench_turnover(1000, 1000)
+    benchmarks['histogram.draw'] = lambda: bench_histogram_draw(make_app())
+    benchmarks['xy.add/points=10000'] = lambda: bench_xy_add(make_app())
+    benchmarks['app.render/population=1000/food=1000'] = lambda: bench_render(make_app())
+
+    results = {}
+    for name, setup in benchmarks.items():
+        if filter is not None and filter not in name:
+            continue
+        # A benchmark is a function, or a function and the setup that restores its state before every call
+        benchmark = setup()
+        function, restore = benchmark if isinstance(benchmark, tuple) else (benchmark, None)
+        results[name] = measure(function, min_time, restore)
+        print(f'{name:60s} {1e3 * results[name]["seconds_per_call"]:10.3f} ms', file=sys.stderr)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compare results against a baseline.
+
+    Parameters:
+    results (dict): The results of the benchmarks.
+    baseline (dict): The results of a previous run.
+    tolerance (float): The allowed relative slowdown.
+
+    Returns:
+    list: The names of the benchmarks that slowed down more than the tolerance.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result['seconds_per_call'] / baseline[name]['seconds_per_call']
+        print(f'{name:60s} {ratio:6.2f}x baseline', file=sys.stderr)
+        if ratio > 1 + tolerance:
+            regressions.append(name)
+    return regressions
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description='Benchmark the simulation and rendering.')
+    parser.add_argument('--min-time', type=float, default=1.0, help='minimum time per benchmark in seconds (default: 1)')
+    parser.add_argument('--quick', action='store_true', help='skip the largest populations')
+    parser.add_argument('--filter', help='only run benchmarks whose name contains this text')
+    parser.add_argument('--output', help='JSON file to write the results to (default: standard output)')
+    parser.add_argument('--baseline', help='JSON file of a previous run to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed relative slowdown against the baseline (default: 0.2)')
+    args = parser.parse_args()
+
+    report = {'meta': {'timestamp': datetime.datetime.now().isoformat(),
+                       'python': platform.python_version(),
+                       'numpy': numpy.__version__,
+                       'platform': platform.platform(),
+                       'min_time': args.min_time},
+              'results': run(args.min_time, args.quick, args.filter)}
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            regressions = compare(report['results'], json.load(baseline)['results'], args.tolerance)
+        if regressions:
+            print(f'Slower than baseline: {", ".join(regressions)}', file=sys.stderr)
+            sys.exit(1)
@@ -0,0 +1,64 @@
+import unittest
+import numpy
+from TUEvolution import camera, snapshot
+from TUEvolution.population import EXPLORING
+
+
+class TestCamera(unittest.TestCase):
+
+    def setUp(self):
+        self.camera = camera.Camera(0, 0, 600, 400)
+        self.camera.fit((1000, 1000), 1000)
+
+    def test_fit(self):
+        self.assertEqual(self.camera.scale, 0.2, 'World not fitted in the smallest side')
+        numpy.testing.assert_allclose(self.camera.to_screen(numpy.array([[1000, 1000], [0, 1000]])), [[300, 200], [100, 200]],
+                                      err_msg='World not centered')
+
+    def test_roundtrip(self):
+        positions = numpy.array([[0.0, 0.0], [1234.5, 678.9]])
+        self.camera.pan(30, -20)
+        self.camera.zoom(3)
+        numpy.testing.assert_allclose(self.camera.to_world(self.camera.to_screen(positions)), positions, err_msg='Coordinates not converted back')
+
+    def test_zoom(self):
+        anchor = (450, 100)
+        before = self.camera.to_world(numpy.array(anchor, dtype=float))
+        self.camera.zoom(4, anchor)
+        self.assertEqual(self.camera.scale, 0.8, 'Scale not zoomed')
+        numpy.testing.assert_allclose(self.camera.to_world(numpy.array(anchor, dtype=float)), before, err_msg='Point under the anchor moved')
+
+        self.camera.zoom(1e6)
+        self.assertEqual(self.camera.scale, self.camera.max_scale, 'Zoom not limited')
+
+    def test_view(self):
+        self.camera.zoom(5)  # One pixel per unit, showing x from 700 to 1300 and y from 800 to 1200
+        position = numpy.array([[1000.0, 1000.0], [690.0, 1000.0], [2000.0, 1000.0]])
+        status = numpy.full(3, EXPLORING, dtype=numpy.int8)
+        world = snapshot.Snapshot(0, 0, position, numpy.array([4, 4, 4]), numpy.array([3, 3, 3]), numpy.array([20, 20, 20]), status,
+                                  numpy.ones(3), 1.0, (255, 0, 0), numpy.array([[800, 900], [100, 100]]))
+
+        view = self.camera.view(world, food_radius=4)
+        self.assertEqual(view.alive(), 2, 'Creatures outside the view not culled, or a sense range reaching into it culled')
+        numpy.testing.assert_allclose(view.position, [[300, 200], [-10, 200]], err_msg='Creatures not in screen coordinates')
+        numpy.testing.assert_allclose(view.food, [[100, 100]], err_msg='Food outside the view not culled')
+
+    def test_view_sense(self):
+        self.camera.zoom(5)
+        position = numpy.array([[1000.0, 1000.0], [1000.0, 1000.0], [1000.0, 1000.0]])
+        status = numpy.full(3, EXPLORING, dtype=numpy.int8)
+        world = snapshot.Snapshot(0, 0, position, numpy.array([4, 4, 4]), numpy.array([3, 3, 3]), numpy.array([12, 97, 5000]), status,
+                                  numpy.ones(3), 1.0, (255, 0, 0), numpy.zeros((0, 2)))
+
+        view = self.camera.view(world)
+        self.assertEqual(view.sense.tolist(), [12, 96, 361], 'Sense ranges not quantized, or not limited to the farthest corner')
+
+    def test_quantize(self):
+        values = camera.quantize(numpy.arange(1, 4096))
+        self.assertEqual(camera.quantize([7, 15, 17, 100]).tolist(), [7, 15, 16, 96], 'Sizes not quantized')
+        self.assertTrue(numpy.all(numpy.abs(values - numpy.arange(1, 4096)) <= numpy.arange(1, 4096) / 16), 'Quantized sizes too far off')
+        self.assertLessEqual(len(numpy.unique(values)), 15 + 9 * 8, 'Too many quantized sizes')
+
+
+if __name__ == '__main__':
+    unittest.main()
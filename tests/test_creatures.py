@@ -1,11 +1,17 @@
+import os
 import unittest
+import numpy
 from TUEvolution import creatures, utils
 
+# Render without opening a window
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
 class TestCreature(unittest.TestCase):
 
     def setUp(self):
-        self.creature = creatures.Creature(radius=10,
-                                           speed=5,
+        self.creature = creatures.Creature(size_evo_data={"init": 20, "variations": [0], "probabilities": [1]},
+                                           speed_evo_data={"init": 5, "variations": [0], "probabilities": [1]},
+                                           sense_evo_data={"init": 0, "variations": [0], "probabilities": [1]},
                                            stamina=100,
                                            color=utils.color('red'))
         
@@ -20,5 +26,47 @@ class TestCreature(unittest.TestCase):
         self.assertEqual(self.creature.food, 0, 'Food not initialized correctly') 
         self.assertEqual(self.creature.status, creatures.Status.EXPLORING, 'Status not initialized correctly')
 
+    def test_draw(self):
+        import pygame
+
+        screen = pygame.Surface((200, 200))
+        self.creature.set_state(numpy.array([100.0, 100.0]), 0)
+        self.creature.draw(screen)
+        hits = creatures.sense_halo.cache_info().hits
+        self.creature.draw(screen)
+        self.assertEqual(creatures.sense_halo.cache_info().hits, hits + 1, 'Sense halo not reused')
+
+        self.assertEqual(creatures.fill_color(utils.color('red'), creatures.charge_levels), utils.color('red'), 'Full charge not drawn in the creature color')
+        self.assertEqual(creatures.fill_color(utils.color('red'), 0), utils.color('white'), 'Empty charge not drawn in white')
+        self.assertEqual(tuple(screen.get_at((100, 100)))[:3], utils.color('red'), 'Fully charged creature not drawn')
+
+    def test_draw_creatures(self):
+        import pygame
+
+        self.creature.set_state(numpy.array([100.6, 99.3]), 0)
+        self.creature.energy /= 2
+        expected = pygame.Surface((200, 200))
+        expected.fill(utils.color('white'))
+        self.creature.draw(expected)
+
+        screen = pygame.Surface((200, 200))
+        screen.fill(utils.color('white'))
+        creatures.draw_creatures(screen, numpy.array([self.creature.position]), numpy.array([self.creature.radius]), numpy.array([self.creature.sense]),
+                                 numpy.array([0.5]), [self.creature.color])
+        self.assertTrue(numpy.array_equal(pygame.surfarray.array3d(screen), pygame.surfarray.array3d(expected)), 'Batched creature not drawn as a single one')
+
+    def test_draw_large_halo(self):
+        import pygame
+
+        screen = pygame.Surface((200, 200))
+        screen.fill(utils.color('white'))
+        screen.set_clip(pygame.Rect(50, 50, 100, 100))
+        misses = creatures.sense_halo.cache_info().misses
+        creatures.draw_creatures(screen, numpy.array([[100, 100]]), numpy.array([4]), numpy.array([10 * creatures.halo_limit]),
+                                 numpy.array([1.0]), [utils.color('red')])
+        self.assertEqual(creatures.sense_halo.cache_info().misses, misses, 'Large sense halo cached')
+        self.assertNotEqual(tuple(screen.get_at((55, 55)))[:3], utils.color('white'), 'Large sense halo not drawn')
+        self.assertEqual(tuple(screen.get_at((20, 20)))[:3], utils.color('white'), 'Large sense halo drawn outside the clip')
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,39 @@
+import unittest
+import numpy
+from TUEvolution import ensemble, simulation
+
+
+class TestEnsemble(unittest.TestCase):
+
+    def setUp(self):
+        self.scenario = simulation.load_scenario('question1')
+        self.scenario['simulation']['generations'] = 2
+        self.scenario['world']['day'] = 200
+
+    def test_reproducible(self):
+        first = ensemble.Ensemble(self.scenario, 4, seed=0).run(workers=1)
+        second = ensemble.Ensemble(self.scenario, 4, seed=0).run(workers=2)
+        for name in ensemble.series_names:
+            numpy.testing.assert_array_equal(first.series[name], second.series[name], err_msg=f'{name} depends on the number of workers')
+
+    def test_independent_streams(self):
+        result = ensemble.Ensemble(self.scenario, 4, seed=0).run(workers=2)
+        food = result.series['food'][:, 1]
+        self.assertGreater(len(set(food)), 1, 'Replicates draw the same random numbers')
+
+    def test_statistics(self):
+        result = ensemble.Ensemble(self.scenario, 4, seed=1).run(workers=2)
+        self.assertEqual(result.series['population'].shape, (4, 3), 'Series not collected per replicate and generation')
+        numpy.testing.assert_allclose(result.mean('population'), result.series['population'].mean(axis=0))
+        bands = result.quantiles('population', [0.05, 0.5, 0.95])
+        self.assertEqual(bands.shape, (3, 3), 'Quantiles not computed per generation')
+        self.assertTrue(numpy.all(bands[0] <= bands[2]), 'Quantile bands not ordered')
+
+        rows = result.summary(q=(0.5,))
+        self.assertEqual([row['generation'] for row in rows], [0, 1, 2], 'Summary not one row per generation')
+        self.assertEqual(rows[0]['population_mean'], 5, 'Initial population not summarized correctly')
+        self.assertIn('mean_size_q50', rows[0], 'Trait quantiles missing from summary')
+
+
+if __name__ == '__main__':
+    unittest.main()
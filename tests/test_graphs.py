@@ -0,0 +1,185 @@
+import os
+import unittest
+import numpy
+
+# Render without opening a window
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from TUEvolution import graphs
+
+
+class TestCycler(unittest.TestCase):
+
+    def setUp(self):
+        pygame.init()
+        self.screen = pygame.Surface((1170, 600))
+        self.xy = graphs.XY(xlabel='Generations', ylabel='Population', xticks=10, yticks=10, linecolor=(255, 0, 0), fontsize=16)
+        self.performance = graphs.Performance(fps=100, fontsize=16)
+        self.cycler = graphs.Cycler(left=600, top=0, width=570, height=570, border=20, font_size=16, graphs=[self.xy, self.performance])
+
+    def test_needs_redraw(self):
+        self.assertTrue(self.cycler.needs_redraw(), 'Cycler not drawn initially')
+        self.cycler.draw(self.screen)
+        self.assertFalse(self.cycler.needs_redraw(), 'Cycler redrawn without a change')
+
+        self.cycler.needs_update = True
+        self.assertTrue(self.cycler.needs_redraw(), 'Cycler not redrawn after a change of the data')
+        self.cycler.draw(self.screen)
+
+        self.cycler.next()
+        self.assertTrue(self.cycler.needs_redraw(), 'Cycler not redrawn after a change of the active graph')
+        self.cycler.draw(self.screen)
+        self.assertTrue(self.cycler.needs_redraw(), 'Live graph not redrawn every frame')
+
+
+class TestPerformance(unittest.TestCase):
+
+    def setUp(self):
+        pygame.init()
+        self.screen = pygame.Surface((1170, 600))
+        self.graph = graphs.Performance(fps=100, frames=10, fontsize=16)
+        graphs.Cycler(left=600, top=0, width=570, height=570, border=20, font_size=16, graphs=[self.graph])
+
+    def test_ring_buffer(self):
+        for frame in range(15):
+            self.graph.add((0.001, 0.002 * frame, 0.003), 60, frame, 2 * frame)
+
+        frames = self.graph.get_frames()
+        self.assertEqual(len(frames), 10, 'Ring buffer does not keep the most recent frames')
+        numpy.testing.assert_allclose(frames[:, 1], 2 * numpy.arange(5, 15), err_msg='Frames not ordered from oldest to most recent')
+        numpy.testing.assert_allclose(frames[-1], [1, 28, 3], err_msg='Phase times not converted to milliseconds')
+
+    def test_series(self):
+        for frame in range(15):
+            self.graph.add((0.001, 0.001, 0.001), 10 * frame, frame, 30 - frame)
+
+        fps, creatures, food = self.graph.get_series()
+        numpy.testing.assert_allclose(fps, numpy.arange(5, 15) / 14, err_msg='Frame rate not relative to the fastest frame')
+        numpy.testing.assert_allclose(creatures, numpy.arange(5, 15) / 14, err_msg='Creatures not relative to the largest count')
+        numpy.testing.assert_allclose(food, numpy.arange(25, 15, -1) / 25, err_msg='Food not relative to the largest count')
+
+        self.graph.fps = 1000
+        self.assertAlmostEqual(self.graph.get_series()[0][-1], 0.14, msg='Frame rate not relative to the target')
+        self.graph.draw(self.screen)
+
+    def test_cached_grid(self):
+        self.graph.add((0.001, 0.001, 0.001), 60, 10, 10)
+        self.graph.draw(self.screen)
+        grid = self.graph.cached_grid
+        self.assertEqual(self.graph.ymax, 10, 'Scale not at least the target frame time')
+
+        self.graph.add((0.001, 0.002, 0.001), 60, 10, 10)
+        self.graph.draw(self.screen)
+        self.assertIs(self.graph.cached_grid, grid, 'Grid redrawn without a change of scale')
+
+        self.graph.add((0.001, 0.050, 0.001), 20, 10, 10)
+        self.graph.draw(self.screen)
+        self.assertEqual(self.graph.ymax, 55, 'Scale not extended to the slowest frame')
+        self.assertEqual(self.graph.get_ymax(numpy.array([5.7])), 10, 'Scale not rounded up')
+        self.assertIsNot(self.graph.cached_grid, grid, 'Grid not redrawn after a change of scale')
+
+
+class TestHistogram(unittest.TestCase):
+
+    def setUp(self):
+        pygame.init()
+        self.screen = pygame.Surface((1170, 600))
+        self.histogram = graphs.Histogram(xlabel='Sense', ylabel='Number of creatures', barcolor=(65, 105, 225), fontsize=16)
+        graphs.Cycler(left=600, top=0, width=570, height=570, border=20, font_size=16, graphs=[self.histogram])
+
+    def test_counts(self):
+        self.histogram.add(12)
+        self.histogram.add_many(numpy.array([10, 14, 14]))
+        self.histogram.add(8)
+        self.histogram.add(9.5)
+        self.assertEqual(self.histogram.offset, 8, 'Counts not extended to smaller values')
+        self.assertEqual(self.histogram.counts.tolist(), [1, 0, 1, 0, 1, 0, 2], 'Values not counted correctly')
+
+        self.histogram.set_from_array([3, 3])
+        self.assertEqual((self.histogram.offset, self.histogram.counts.tolist()), (3, [2]), 'Data not replaced')
+
+    def test_bins(self):
+        self.histogram.set_from_array([20, 40, 40, 80])
+        edges, values = self.histogram.get_bins()
+        self.assertEqual((edges.tolist(), values.tolist()), ([20, 40, 80], [1, 2, 1]), 'Empty bins not left out on a regular spacing')
+
+        self.histogram.set_from_array([20, 30, 37])
+        edges, values = self.histogram.get_bins()
+        self.assertEqual(len(edges), 18, 'Empty bins left out on an irregular spacing')
+
+    def test_cached_surface(self):
+        self.histogram.set_from_array([1, 2, 2, 3])
+        self.histogram.draw(self.screen)
+        surface = self.histogram.cached_surface
+        self.histogram.draw(self.screen)
+        self.assertIs(self.histogram.cached_surface, surface, 'Bars redrawn without a change of the data')
+        self.histogram.add(4)
+        self.histogram.draw(self.screen)
+        self.assertIsNot(self.histogram.cached_surface, surface, 'Bars not redrawn after a change of the data')
+
+
+class TestXY(unittest.TestCase):
+
+    def setUp(self):
+        pygame.init()
+        self.screen = pygame.Surface((1170, 600))
+        self.graph = graphs.XY(xlabel='Generations', ylabel='Population', xticks=10, yticks=10, linecolor=(255, 0, 0), fontsize=16)
+        graphs.Cycler(left=600, top=0, width=570, height=570, border=20, font_size=16, graphs=[self.graph])
+
+    def test_buffer(self):
+        for x in range(100):
+            self.graph.add((x, 2 * x))
+        self.assertEqual(self.graph.data.shape, (100, 2), 'Points not stored')
+        self.assertEqual(len(self.graph.buffer), 128, 'Capacity not doubled when full')
+        numpy.testing.assert_array_equal(self.graph.data[-1], [99, 198], err_msg='Last point not stored')
+        self.assertEqual(self.graph.get_lim_and_ticks(1)[0], [0, 220], 'Limits not following the maximum')
+
+    def test_cached_coordinates(self):
+        self.graph.add((0, 5))
+        self.graph.add((1, 8))
+        self.graph.draw(self.screen)
+        grid = self.graph.cached_grid
+        self.graph.add((2, 1))
+        self.graph.draw(self.screen)
+        self.assertIs(self.graph.cached_grid, grid, 'Grid redrawn without a change of the limits')
+
+        coordinates = self.graph.get_screen_coordinates()
+        numpy.testing.assert_allclose(coordinates, self.graph.to_screen_coordinates(self.graph.data), err_msg='Added point not converted')
+
+        self.graph.add((50, 80))
+        self.graph.draw(self.screen)
+        self.assertIsNot(self.graph.cached_grid, grid, 'Grid not redrawn after a change of the limits')
+        numpy.testing.assert_allclose(self.graph.get_screen_coordinates(), self.graph.to_screen_coordinates(self.graph.data), err_msg='Points not converted again after a change of the limits')
+
+    def test_decimation(self):
+        values = numpy.random.default_rng(0).integers(0, 100, 5000)
+        graph = graphs.XY(xlabel='Generations', ylabel='Population', xticks=numpy.arange(5001), yticks=10, linecolor=(255, 0, 0), fontsize=16)
+        graphs.Cycler(left=600, top=0, width=570, height=570, border=20, font_size=16, graphs=[graph])
+        for x, y in enumerate(values):
+            graph.add((x, y))
+            if x % 1000 == 0:
+                graph.get_decimated_coordinates()
+
+        coordinates = graph.get_decimated_coordinates()
+        all_coordinates = graph.get_screen_coordinates()
+        self.assertLessEqual(len(coordinates), 4 * 530, 'More than four points drawn per pixel column')
+        for column in numpy.unique(numpy.floor(all_coordinates[:, 0]))[::50]:
+            in_column = numpy.floor(all_coordinates[:, 0]) == column
+            drawn = numpy.floor(coordinates[:, 0]) == column
+            self.assertEqual((coordinates[drawn, 1].min(), coordinates[drawn, 1].max()), (all_coordinates[in_column, 1].min(), all_coordinates[in_column, 1].max()), 'Range of a pixel column not drawn')
+        numpy.testing.assert_array_equal(coordinates[[0, -1]], all_coordinates[[0, -1]], err_msg='First or last point not drawn')
+
+    def test_ticks(self):
+        graph = graphs.XY(xlabel='Generations', ylabel='Population', xticks=numpy.arange(10001), yticks=5000, linecolor=(255, 0, 0), fontsize=16)
+        graph.add((0, 10))
+        xlim, xticks = graph.get_lim_and_ticks(0)
+        ylim, yticks = graph.get_lim_and_ticks(1)
+        self.assertEqual(xlim, [0, 10000], 'Limits changed by thinning the ticks')
+        self.assertLessEqual(len(xticks), graph.max_ticks + 1, 'Given ticks not thinned')
+        self.assertLessEqual(len(yticks), graph.max_ticks + 1, 'Computed ticks not thinned')
+        self.assertEqual(xticks[1], 200, 'Ticks not thinned to a round stride')
+
+
+if __name__ == '__main__':
+    unittest.main()
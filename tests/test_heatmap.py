@@ -0,0 +1,51 @@
+import os
+import unittest
+import numpy
+from TUEvolution import heatmap, snapshot
+from TUEvolution.population import EXPLORING, PERISHED
+
+# Render without opening a window
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+
+class TestHeatmap(unittest.TestCase):
+
+    def setUp(self):
+        self.heatmap = heatmap.Heatmap(0, 0, 60, 30, cell=10)
+        position = numpy.array([[5.0, 5.0], [6.0, 7.0], [25.0, 5.0], [55.0, 25.0], [-5.0, 5.0]])
+        status = numpy.array([EXPLORING, EXPLORING, EXPLORING, PERISHED, EXPLORING], dtype=numpy.int8)
+        radius = numpy.array([2, 4, 8, 8, 8])
+        self.snapshot = snapshot.Snapshot(0, 0, position, radius, radius, radius, status, numpy.ones(5), 1.0, (255, 0, 0),
+                                          numpy.array([[45, 15], [46, 16], [25, 5]]))
+
+    def test_bin(self):
+        cells = self.heatmap.bin(self.snapshot.position)
+        self.assertEqual(self.heatmap.shape, (6, 3), 'Cells not fitted to the area')
+        self.assertEqual(cells.tolist(), [0, 0, 6, 17, -1], 'Positions not binned by cell')
+
+    def test_image(self):
+        image = self.heatmap.image(self.snapshot).astype(int)
+        self.assertEqual(image.shape, (6, 3, 3), 'Image not a pixel per cell')
+        self.assertEqual(tuple(image[5, 2]), self.heatmap.key, 'Perished creature drawn')
+        self.assertEqual(tuple(image[1, 0]), self.heatmap.key, 'Empty cell drawn')
+        self.assertEqual(tuple(image[4, 1]), tuple(self.heatmap.food_color.astype(int)), 'Food cell not drawn')
+        self.assertGreater(image[2, 0, 0], image[0, 0, 0], 'Larger creatures not drawn redder')
+
+    def test_draw(self):
+        import pygame
+
+        screen = pygame.Surface((60, 30))
+        screen.fill((0, 0, 0))
+        self.heatmap.draw(screen, self.snapshot)
+        self.assertEqual(tuple(screen.get_at((15, 5)))[:3], (0, 0, 0), 'Empty cell not transparent')
+        self.assertEqual(tuple(screen.get_at((49, 19)))[:3], tuple(self.heatmap.food_color.astype(int)), 'Cell not scaled to its width')
+
+    def test_trait(self):
+        with self.assertRaises(ValueError):
+            heatmap.Heatmap(0, 0, 60, 30, trait='stamina')
+        self.heatmap.next_trait()
+        self.assertEqual(self.heatmap.trait, 'speed', 'Next trait not shown')
+
+
+if __name__ == '__main__':
+    unittest.main()
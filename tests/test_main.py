@@ -0,0 +1,62 @@
+import os
+import unittest
+
+# Render without opening a window
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from TUEvolution.main import App
+
+
+class TestApp(unittest.TestCase):
+
+    def setUp(self):
+        self.app = App(population=5,
+                       generations=2,
+                       food_supply=20,
+                       world_day=200,
+                       creature_size=12,
+                       creature_speed=3,
+                       creature_stamina=2000,
+                       creature_sense=0)
+        self.app.initialize()
+
+    def tearDown(self):
+        self.app.cleanup()
+
+    def test_ticks_per_frame(self):
+        self.app.ticks_per_frame = 4
+        self.app.update()
+        self.assertEqual(self.app.simulation.world.time, 4, 'Not all ticks of the frame simulated')
+
+        self.app.ticks_per_frame = 0.5
+        self.app.update()
+        self.assertEqual(self.app.simulation.world.time, 4, 'Fraction of a tick simulated')
+        self.app.update()
+        self.assertEqual(self.app.simulation.world.time, 5, 'Fractions of ticks not carried over')
+
+    def test_fps(self):
+        app = App(population=5, generations=2, food_supply=20, world_day=200, creature_size=12, creature_speed=3,
+                  creature_stamina=2000, creature_sense=0, fps=30)
+        app.initialize()
+        try:
+            self.assertEqual(app.fps, 30, 'Frame rate not set')
+            self.assertEqual(app.performance_graph.fps, 30, 'Performance graph not given the frame rate')
+        finally:
+            app.cleanup()
+
+    def test_generations(self):
+        self.app.ticks_per_frame = 1000
+        self.app.update()
+        self.assertTrue(self.app.simulation.finished, 'Simulation not finished')
+        self.assertEqual(self.app.population_graph.count, 3, 'Graphs not updated for every generation of a frame')
+        self.app.render()
+
+    def test_level_of_detail(self):
+        self.app.lod_threshold = 2
+        self.app.render()
+        self.assertIsNotNone(self.app.heatmap.cells, 'Density not drawn for a large population')
+        self.assertEqual(self.app.active, 5, 'Creatures not counted')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import unittest
+import numpy
+import numpy.random
+from TUEvolution import utils
+from TUEvolution.map import World, FoodStore
+
+# Render without opening a window
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+
+class TestWorld(unittest.TestCase):
+
+    def setUp(self):
+        self.world = World(center=(300, 300), radius=280, homes_width=48, day=1000)
+
+    def test_draw(self):
+        import pygame
+
+        screen = pygame.Surface((600, 600))
+        self.world.draw(screen)
+        background = self.world.background
+        self.assertEqual(self.world.dial_ticks, 1, 'Dial not started at the start of the day')
+        self.assertEqual(tuple(screen.get_at((300, 300)))[:3], utils.color('lightgray'), 'Inner disk not drawn')
+        self.assertEqual(tuple(screen.get_at((300, 25)))[:3], utils.color('dimgray'), 'Homes area not drawn')
+        self.assertEqual(tuple(screen.get_at((5, 5)))[:3], (0, 0, 0), 'Corners of the background not transparent')
+
+        self.world.time = 500
+        self.world.draw(screen)
+        self.assertIs(self.world.background, background, 'Background redrawn without a change of the world')
+        self.assertEqual(self.world.dial_ticks, 31, 'Dial not advanced with the time of day')
+
+        self.world.next_day()
+        self.world.draw(screen)
+        self.assertEqual(self.world.dial_ticks, 1, 'Dial not reset on the next day')
+
+        self.world.homes_width = 60
+        self.world.draw(screen)
+        self.assertIsNot(self.world.background, background, 'Background not redrawn after a change of the world')
+
+    def test_draw_camera(self):
+        import pygame
+        from TUEvolution.camera import Camera
+
+        screen = pygame.Surface((600, 600))
+        camera = Camera(0, 0, 600, 600)
+        camera.fit(self.world.center, 600)
+        self.world.draw(screen, camera)
+        self.assertEqual(self.world.background.get_width(), 281, 'Background not drawn at the scale of the camera')
+        self.assertEqual(tuple(screen.get_at((300, 165)))[:3], utils.color('dimgray'), 'Homes area not drawn at the scale of the camera')
+
+        camera.zoom(16)
+        self.world.draw(screen, camera)
+        self.assertEqual(self.world.background.get_width(), 281, 'Background drawn far larger than the screen')
+        self.assertEqual(tuple(screen.get_at((300, 300)))[:3], utils.color('lightgray'), 'World not drawn when zoomed in')
+
+
+class TestFoodStore(unittest.TestCase):
+
+    def setUp(self):
+        numpy.random.seed(0)
+        self.world = World(center=(300, 300), radius=280, homes_width=48, day=1000)
+        self.food = FoodStore(self.world, 4, utils.color('forestgreen'))
+        self.food.spawn(self.world.get_food_locations(100), generation=0)
+        self.food.index(cell_size=10)
+
+    def test_spawn(self):
+        self.assertEqual(len(self.food), 100, 'Food not spawned correctly')
+        self.assertEqual(self.food.positions.shape, (100, 2), 'Positions not stored as an array')
+        distance = numpy.linalg.norm(self.food.positions - self.world.center, axis=1)
+        self.assertTrue(all(distance <= self.world.radius - self.world.homes_width + 1), 'Food spawned outside of the world')
+
+    def test_consume(self):
+        self.food.consume(numpy.arange(10))
+        self.assertEqual(len(self.food), 90, 'Food not consumed correctly')
+        queries, ids = self.food.grid.query(self.food.positions, 0)
+        self.assertNotIn(0, ids, 'Consumed food still in the grid')
+
+    def test_compact(self):
+        self.food.consume(numpy.arange(70))
+        self.food.spawn(self.world.get_food_locations(20), generation=1)
+        self.food.index(cell_size=10)
+        self.assertEqual(len(self.food.available), 50, 'Store not compacted')
+        self.assertEqual(len(self.food), 50, 'Available food lost in compaction')
+        self.assertEqual(numpy.bincount(self.food.spawned).tolist(), [30, 20], 'Spawn generation lost in compaction')
+        self.assertEqual(len(self.food.grid), 50, 'Grid not rebuilt after compaction')
+
+    def test_draw(self):
+        import pygame
+
+        self.food.consume(numpy.arange(10))
+        expected = pygame.Surface((600, 600))
+        for position in self.food.positions[self.food.available].tolist():
+            pygame.draw.circle(expected, self.food.color, position, self.food.radius)
+
+        screen = pygame.Surface((600, 600))
+        self.food.draw(screen)
+        self.assertTrue(numpy.array_equal(pygame.surfarray.array3d(screen), pygame.surfarray.array3d(expected)), 'Food not drawn as circles')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+import unittest
+import unittest.mock
+import numpy
+import numpy.random
+from TUEvolution import creatures, population, utils
+from TUEvolution.map import World, Food, FoodStore
+
+size = {"init": 12, "variations": [-1, 0, 1], "probabilities": [0.25, 0.5, 0.25]}
+speed = {"init": 3, "variations": [0], "probabilities": [1]}
+sense = {"init": 0, "variations": [0], "probabilities": [1]}
+
+
+class TestPopulation(unittest.TestCase):
+
+    def setUp(self):
+        self.population = population.Population(size, speed, sense, 2000, 4)
+        self.creatures = [creatures.Creature(size, speed, sense, 2000, utils.color('red')) for _ in range(4)]
+
+        positions = numpy.array([[100, 100], [200, 100], [100, 200], [200, 200]])
+        orientations = numpy.zeros(4)
+        numpy.random.seed(0)
+        self.population.set_state(positions, orientations)
+        for creature, position, orientation in zip(self.creatures, positions, orientations):
+            creature.set_state(position.copy(), orientation)
+
+    def test_initialization(self):
+        self.assertEqual(len(self.population), 4, 'Population size not initialized correctly')
+        for creature, view in zip(self.creatures, self.population):
+            self.assertEqual(view.radius, creature.radius, 'Radius not initialized correctly')
+            self.assertEqual(view.speed, creature.speed, 'Speed not initialized correctly')
+            self.assertEqual(view.sense, creature.sense, 'Sense not initialized correctly')
+            self.assertEqual(view.power, creature.power, 'Power not initialized correctly')
+            self.assertEqual(view.energy, creature.energy, 'Energy not initialized correctly')
+            self.assertEqual(view.status, creature.status, 'Status not initialized correctly')
+
+    def test_step(self):
+        view = self.population[0]
+        self.assertEqual(view.step, view.speed, 'Step does not follow speed')
+        with self.assertRaises(AttributeError):
+            view.step = 1
+        self.assertEqual(self.population.speed[0], 3, 'Speed overwritten through step')
+
+    def test_move(self):
+        destinations = numpy.array([[110.0, 100.0], [201.0, 101.0], [100.0, 185.0], [200.0, 202.0]])
+        self.population.destination[:] = destinations
+        self.population.status[3] = population.RETURNING
+        for creature, destination in zip(self.creatures, destinations):
+            creature.destination = destination.copy()
+        self.creatures[3].status = creatures.Status.RETURNING
+
+        # At most one creature explores to its destination per step, so both draw the same random numbers
+        for step in range(5):
+            numpy.random.seed(step)
+            self.population.move()
+            numpy.random.seed(step)
+            for creature in self.creatures:
+                if not creature.is_home():
+                    creature.move()
+
+        for creature, view in zip(self.creatures, self.population):
+            numpy.testing.assert_allclose(view.position, creature.position, err_msg='Position not moved correctly')
+            self.assertAlmostEqual(view.energy, creature.energy, msg='Energy not consumed correctly')
+            self.assertEqual(view.status, creature.status, 'Status not updated correctly')
+
+    def test_sense_surroundings(self):
+        self.check_sense_surroundings()
+
+    def test_sense_surroundings_grid(self):
+        with unittest.mock.patch.object(population, 'dense_predators', 0):
+            self.check_sense_surroundings()
+
+    def check_sense_surroundings(self):
+        numpy.random.seed(2)
+        world = World(center=(300, 300), radius=280, homes_width=48, day=1000)
+        sense = {"init": 100, "variations": [0], "probabilities": [1]}
+        sizes = numpy.random.choice([8, 12, 16], size=40)
+
+        pop = population.Population(size, speed, sense, 2000, 40)
+        pop.set_traits(sizes, numpy.full(40, 3), numpy.full(40, 100))
+        pop.set_state(300 + 150 * (2 * numpy.random.rand(40, 2) - 1), numpy.zeros(40))
+        pop.targeting[::7] = True
+
+        food_store = FoodStore(world, 4, utils.color('forestgreen'))
+        food_store.spawn(world.get_food_locations(30), generation=0)
+        food_store.index(cell_size=10)
+        food = [Food(position, 4, utils.color('forestgreen')) for position in food_store.positions]
+
+        reference = []
+        for view in pop:
+            creature = creatures.Creature(dict(size, init=int(view.size_evo_data['init'])), speed, sense, 2000, utils.color('red'))
+            creature.set_state(view.position.copy(), view.orientation)
+            creature.destination = view.destination.copy()
+            creature.targeting = bool(view.targeting)
+            reference.append(creature)
+
+        pop.sense_surroundings(numpy.arange(40), world, food_store)
+        for creature in reference:
+            creature.sense_surroundings(reference, food)
+
+        for creature, view in zip(reference, pop):
+            self.assertEqual(view.targeting, creature.targeting, 'Targeting not sensed correctly')
+            numpy.testing.assert_allclose(view.destination, creature.destination, err_msg='Destination not sensed correctly')
+            self.assertAlmostEqual(view.energy, creature.energy, msg='Sense energy not consumed correctly')
+
+    def test_eat_prey(self):
+        numpy.random.seed(3)
+        world = World(center=(300, 300), radius=280, homes_width=48, day=1000)
+        pop = population.Population(size, speed, sense, 2000, 200)
+        pop.set_traits(numpy.random.choice([6, 8, 12, 16, 20], size=200), numpy.full(200, 3), numpy.zeros(200))
+        pop.set_state(300 + 100 * (2 * numpy.random.rand(200, 2) - 1), numpy.zeros(200))
+        pop.food[:] = numpy.random.choice([0, 1], size=200)
+
+        # Sequential reference with the squared distance
+        status = pop.status.copy()
+        food = pop.food.copy()
+        for hunter in range(200):
+            if status[hunter] == population.PERISHED:
+                continue
+            for target in range(200):
+                if food[hunter] == 2:
+                    break
+                larger = pop.radius[hunter] >= 1.2 * pop.radius[target]
+                touching = sum((pop.position[target] - pop.position[hunter])**2) <= (pop.radius[hunter] + pop.radius[target])**2
+                if larger and touching and status[target] != population.PERISHED:
+                    food[hunter] += 1
+                    status[target] = population.PERISHED
+
+        pop.eat_prey(world)
+        self.assertGreater(sum(status == population.PERISHED), 0, 'No creature was eaten')
+        self.assertEqual(pop.status.tolist(), status.tolist(), 'Prey not eaten correctly')
+        self.assertEqual(pop.food.tolist(), food.tolist(), 'Food not counted correctly')
+
+    def test_next_generation(self):
+        self.population.status[:] = [population.HOME, population.HOME, population.PERISHED, population.HOME]
+        self.population.food[:] = [2, 1, 2, 0]
+
+        next_generation = self.population.next_generation()
+        self.assertEqual(len(next_generation), 4, 'Offspring not created correctly')
+        self.assertEqual(next_generation.speed_init.tolist(), [3, 3, 3, 3], 'Fixed attribute mutated')
+        self.assertTrue(all(next_generation.status == population.EXPLORING), 'Status not reset')
+        self.assertTrue(all(next_generation.food == 0), 'Food not reset')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import json
+import os
+import tempfile
+import unittest
+from TUEvolution import profiling, simulation
+
+
+class TestPhaseTimer(unittest.TestCase):
+
+    def test_disabled(self):
+        timer = profiling.PhaseTimer()
+        timer.start(0)
+        timer.lap('move')
+        self.assertEqual(timer.as_dict(), {'totals': {}, 'generations': []}, 'Disabled timer recorded laps')
+
+    def test_laps(self):
+        timer = profiling.PhaseTimer(enabled=True)
+        for generation in (0, 0, 1):
+            timer.start(generation)
+            timer.lap('move')
+            timer.lap('sense')
+
+        timings = timer.as_dict()
+        self.assertEqual(timings['totals']['move']['calls'], 3, 'Laps not counted over generations')
+        self.assertEqual([entry['generation'] for entry in timings['generations']], [0, 1], 'Laps not split per generation')
+        self.assertEqual(timings['generations'][0]['phases']['sense']['calls'], 2, 'Laps not counted per generation')
+
+    def test_simulation(self):
+        run = simulation.Simulation(population=5, generations=2, food_supply=20, world_day=200,
+                                    creature_size=12, creature_speed=3, creature_stamina=2000, creature_sense=0, profile=True)
+        run.run()
+
+        totals = run.timer.totals()
+        for phase in ('move', 'perish', 'sense', 'food', 'predation', 'go_home', 'edge', 'turnover'):
+            self.assertIn(phase, totals, f'Phase {phase} not timed')
+        self.assertEqual(totals['turnover']['calls'], 3, 'End of day not timed once per generation')
+        self.assertEqual(len(run.timer.generations), 3, 'Timings not recorded per generation')
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'profile.json')
+            run.timer.dump(path)
+            with open(path) as file:
+                self.assertEqual(json.load(file)['totals']['move']['calls'], totals['move']['calls'], 'Timings not dumped to JSON')
+
+
+if __name__ == '__main__':
+    unittest.main()
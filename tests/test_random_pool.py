@@ -0,0 +1,44 @@
+import unittest
+import numpy
+import numpy.random
+from TUEvolution import creatures, random_pool, utils
+
+
+class TestRandomPool(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = random_pool.RandomPool(numpy.random.default_rng(0), block_size=100)
+
+    def test_blocks(self):
+        samples = numpy.concatenate([self.pool.poisson(40, size=7) for _ in range(50)])
+        self.assertEqual(len(samples), 350, 'Samples not handed out correctly')
+        self.assertIsInstance(self.pool.poisson(40), numpy.integer, 'Single sample not a scalar')
+        self.assertEqual(len(self.pool.vonmises(0, 4, size=1000)), 1000, 'Block smaller than request')
+
+    def test_distributions(self):
+        rng = numpy.random.default_rng(1)
+        n = 20000
+        for pooled, direct in ((self.pool.vonmises(0, creatures.walk_turn, size=n), rng.vonmises(0, creatures.walk_turn, size=n)),
+                               (self.pool.poisson(creatures.walk_distance, size=n), rng.poisson(creatures.walk_distance, size=n))):
+            self.assertAlmostEqual(pooled.mean(), direct.mean(), delta=0.1, msg='Mean differs from numpy')
+            self.assertAlmostEqual(pooled.std(), direct.std(), delta=0.1, msg='Spread differs from numpy')
+
+    def test_choice(self):
+        samples = self.pool.choice([-1, 0, 1], size=20000, p=[0.25, 0.5, 0.25])
+        frequencies = numpy.bincount(samples + 1) / len(samples)
+        numpy.testing.assert_allclose(frequencies, [0.25, 0.5, 0.25], atol=0.02)
+        with self.assertRaises(ValueError):
+            self.pool.choice([0, 1], p=[0.5, 0.6])
+
+    def test_creature(self):
+        evo_data = {"init": 12, "variations": [-1, 0, 1], "probabilities": [0.25, 0.5, 0.25]}
+        creature = creatures.Creature(evo_data, evo_data, evo_data, 2000, utils.color('red'), rng=self.pool)
+        creature.set_state(numpy.array([300.0, 300.0]), 0)
+        creature.update_destination()
+        child = creature.reproduce()
+        self.assertIs(child.rng, self.pool, 'Random number generator not inherited')
+        self.assertIn(child.size_evo_data['init'], [11, 12, 13], 'Mutation not drawn from the table')
+
+
+if __name__ == '__main__':
+    unittest.main()
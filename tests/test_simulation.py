@@ -0,0 +1,41 @@
+import sys
+import subprocess
+import unittest
+from TUEvolution import simulation
+
+
+class TestSimulation(unittest.TestCase):
+
+    def setUp(self):
+        self.simulation = simulation.Simulation(population=5,
+                                                generations=3,
+                                                food_supply=20,
+                                                world_day=200,
+                                                creature_size=12,
+                                                creature_speed=3,
+                                                creature_stamina=2000,
+                                                creature_sense=0)
+
+    def test_headless(self):
+        code = 'import sys, TUEvolution.simulation; print("pygame" in sys.modules)'
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip(), 'False', 'Headless simulation imported pygame')
+
+    def test_history(self):
+        history = self.simulation.run()
+        self.assertEqual(history['generation'], [0, 1, 2, 3], 'Generations not recorded correctly')
+        self.assertEqual(history['population'][0], 5, 'Initial population not recorded correctly')
+        self.assertEqual(history['food'][0], 20, 'Initial food not recorded correctly')
+        self.assertEqual(history['size'][0], [12] * 5, 'Initial sizes not recorded correctly')
+        for key in ('size', 'speed', 'sense'):
+            self.assertEqual([len(values) for values in history[key]], history['population'], f'{key} values do not match the population')
+
+    def test_load_scenario(self):
+        scenario = simulation.load_scenario('question1')
+        self.assertEqual(scenario['creature']['sense'], 0, 'Missing sense not defaulted to 0')
+        parameters = simulation.scenario_parameters(scenario)
+        self.assertEqual(parameters['creature_size']['init'], 12, 'Scenario size not converted correctly')
+
+
+if __name__ == '__main__':
+    unittest.main()
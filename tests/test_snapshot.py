@@ -0,0 +1,129 @@
+import queue
+import threading
+import time
+import unittest
+import unittest.mock
+import numpy
+from TUEvolution import snapshot, worker
+from TUEvolution.population import HOME, EXPLORING
+
+
+def make_snapshot(creatures, food, generation=0):
+    status = numpy.full(creatures, EXPLORING, dtype=numpy.int8)
+    status[:creatures // 2] = HOME
+    return snapshot.Snapshot(generation, 10, numpy.arange(2 * creatures, dtype=float).reshape(-1, 2), numpy.full(creatures, 6), numpy.full(creatures, 4),
+                             numpy.full(creatures, 3), status, numpy.linspace(0, 100, creatures), 100.0, (255, 0, 0),
+                             numpy.arange(2 * food).reshape(-1, 2))
+
+
+class TestSnapshotBuffer(unittest.TestCase):
+
+    def setUp(self):
+        self.buffer = snapshot.SnapshotBuffer(8, 4)
+
+    def tearDown(self):
+        self.buffer.close()
+        self.buffer.unlink()
+
+    def test_empty(self):
+        self.assertIsNone(self.buffer.read(), 'Snapshot read before one was written')
+
+    def test_roundtrip(self):
+        written = make_snapshot(5, 3, generation=2)
+        self.assertTrue(self.buffer.write(written), 'Snapshot not written into a free slot')
+
+        read = self.buffer.read()
+        self.assertEqual((read.generation, read.time, read.color), (2, 10, (255, 0, 0)), 'Scalars not read back')
+        numpy.testing.assert_array_equal(read.position, written.position, 'Positions not read back')
+        numpy.testing.assert_array_equal(read.status, written.status, 'Status not read back')
+        numpy.testing.assert_array_equal(read.food, written.food, 'Food not read back')
+        self.assertEqual(read.active(), 3, 'Active creatures not counted')
+        self.buffer.release()
+
+    def test_claimed_slot(self):
+        self.buffer.write(make_snapshot(5, 3, generation=0))
+        self.buffer.write(make_snapshot(5, 3, generation=1))
+        self.assertEqual(self.buffer.read().generation, 1, 'Latest snapshot not read')
+
+        # The slot of generation 0 is free, but the next write goes back into the claimed one
+        self.assertTrue(self.buffer.write(make_snapshot(5, 3, generation=2)), 'Snapshot not written into the free slot')
+        self.assertFalse(self.buffer.write(make_snapshot(5, 3, generation=3)), 'Snapshot written into the claimed slot')
+        self.buffer.release()
+
+        self.assertEqual(self.buffer.read().generation, 2, 'Latest completed snapshot not read')
+        self.buffer.release()
+
+    def test_attach(self):
+        self.buffer.write(make_snapshot(8, 4))
+        attached = snapshot.SnapshotBuffer(*self.buffer.capacity, name=self.buffer.name)
+        numpy.testing.assert_array_equal(attached.read().energy, numpy.linspace(0, 100, 8), 'Snapshot not shared between buffers')
+        attached.release()
+        attached.close()
+
+    def test_fits(self):
+        self.assertTrue(self.buffer.fits(8, 4), 'Full snapshot does not fit')
+        self.assertFalse(self.buffer.fits(9, 4), 'Too many creatures fit')
+
+
+class TestSimulationWorker(unittest.TestCase):
+
+    def test_run(self):
+        parameters = dict(population=5, generations=2, food_supply=20, world_day=200,
+                          creature_size=12, creature_speed=3, creature_stamina=2000, creature_sense=0)
+        simulation = worker.SimulationWorker(parameters, seed=1)
+        simulation.start()
+
+        records = []
+        deadline = time.perf_counter() + 30
+        while not simulation.finished and time.perf_counter() < deadline:
+            records += simulation.poll()
+            time.sleep(0.01)
+
+        try:
+            self.assertTrue(simulation.finished, 'Worker did not finish')
+            self.assertEqual([record['generation'] for record in records], [0, 1, 2], 'Generations not sent')
+
+            latest = simulation.read()
+            self.assertIsNotNone(latest, 'No snapshot published')
+            self.assertEqual(latest.generation, records[-1]['generation'], 'Final snapshot not published')
+            simulation.release()
+        finally:
+            simulation.stop()
+
+    def test_switched(self):
+        parameters = dict(population=5, generations=2, food_supply=20, world_day=200,
+                          creature_size=12, creature_speed=3, creature_stamina=2000, creature_sense=0)
+        commands = queue.Queue()
+        messages = queue.Queue()
+
+        # Every snapshot outgrows its buffer, so the worker creates a new buffer for each of them
+        with unittest.mock.patch.object(snapshot.SnapshotBuffer, 'fits', return_value=False):
+            thread = threading.Thread(target=worker.run, args=(parameters, 1, commands, messages, 0.01))
+            thread.start()
+            try:
+                buffers = []
+                while len(buffers) < 2:
+                    message = messages.get(timeout=30)
+                    if message[0] == 'buffer':
+                        buffers.append(message[1:])
+
+                # The first buffer stays until the reader switched away from it
+                snapshot.SnapshotBuffer(*buffers[0][1:], name=buffers[0][0]).close()
+                commands.put(('switched', buffers[1][0]))
+
+                deadline = time.perf_counter() + 30
+                removed = False
+                while not removed and time.perf_counter() < deadline:
+                    try:
+                        snapshot.SnapshotBuffer(*buffers[0][1:], name=buffers[0][0]).close()
+                        time.sleep(0.01)
+                    except FileNotFoundError:
+                        removed = True
+                self.assertTrue(removed, 'Superseded buffer not removed')
+            finally:
+                commands.put(('stop',))
+                thread.join(timeout=30)
+
+
+if __name__ == '__main__':
+    unittest.main()
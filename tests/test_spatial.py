@@ -0,0 +1,48 @@
+import unittest
+import numpy
+import numpy.random
+from TUEvolution import spatial
+
+
+class TestGrid(unittest.TestCase):
+
+    def setUp(self):
+        numpy.random.seed(0)
+        self.points = 300 + 250 * (2 * numpy.random.rand(500, 2) - 1)
+        self.grid = spatial.Grid(center=(300, 300), radius=280, cell_size=10)
+        self.ids = self.grid.insert(self.points)
+
+    def brute_force(self, positions, radii):
+        pairs = set()
+        for q, position in enumerate(positions):
+            for i, point in enumerate(self.points):
+                if self.grid.alive[i] and sum((point - position)**2) <= radii[q]**2:
+                    pairs.add((q, i))
+        return pairs
+
+    def test_insert(self):
+        self.assertEqual(len(self.grid), 500, 'Points not inserted correctly')
+        self.assertEqual(self.ids.tolist(), list(range(500)), 'Ids not assigned correctly')
+
+    def test_query(self):
+        positions = 300 + 300 * (2 * numpy.random.rand(50, 2) - 1)
+        radii = numpy.random.randint(1, 30, size=50)
+        queries, ids = self.grid.query(positions, radii)
+        self.assertEqual(set(zip(queries.tolist(), ids.tolist())), self.brute_force(positions, radii), 'Query does not match brute force')
+
+    def test_stencil(self):
+        self.assertIs(self.grid.stencil(3), spatial.Grid(center=(0, 0), radius=100, cell_size=10).stencil(3), 'Stencil not cached')
+        positions = 300 + 300 * (2 * numpy.random.rand(50, 2) - 1)
+        for radius in (5, 21, 30):
+            queries, ids = self.grid.query(positions, numpy.full(50, radius))
+            self.assertEqual(set(zip(queries.tolist(), ids.tolist())), self.brute_force(positions, numpy.full(50, radius)), 'Query with cached stencil does not match brute force')
+
+    def test_remove(self):
+        self.grid.remove(self.ids[:250])
+        self.assertEqual(len(self.grid), 250, 'Points not removed correctly')
+        queries, ids = self.grid.query(self.points, 1)
+        self.assertEqual(numpy.unique(ids).tolist(), list(range(250, 500)), 'Removed points found by query')
+
+
+if __name__ == '__main__':
+    unittest.main()
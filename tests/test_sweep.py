@@ -0,0 +1,45 @@
+import unittest
+import numpy
+from TUEvolution import simulation, sweep
+
+
+class TestSweep(unittest.TestCase):
+
+    def setUp(self):
+        self.scenario = simulation.load_scenario('default')
+        self.scenario['simulation']['generations'] = 2
+        self.scenario['world']['day'] = 200
+
+    def test_set_parameter(self):
+        sweep.set_parameter(self.scenario, 'world.init.food', 40)
+        sweep.set_parameter(self.scenario, 'creature.size.variations', [-2, 0, 2])
+        self.assertEqual(self.scenario['world']['init']['food'], 40, 'Parameter not set correctly')
+        self.assertEqual(self.scenario['creature']['size'], {'init': 12, 'variations': [-2, 0, 2], 'probabilities': [1]}, 'Fixed attribute not converted to evolution data')
+
+    def test_grid(self):
+        configurations = sweep.grid({'world.init.food': [10, 20], 'creature.stamina': [1000, 2000, 3000]})
+        self.assertEqual(len(configurations), 6, 'Cartesian product not complete')
+        self.assertIn({'world.init.food': 20, 'creature.stamina': 3000}, configurations, 'Configuration missing')
+
+    def test_latin_hypercube(self):
+        configurations = sweep.latin_hypercube({'world.init.food': (0, 99), 'creature.speed.init': [1, 2, 3, 4]}, samples=20, seed=0)
+        food = sorted(configuration['world.init.food'] for configuration in configurations)
+        speed = [configuration['creature.speed.init'] for configuration in configurations]
+        self.assertEqual([f // 5 for f in food], list(range(20)), 'Range not stratified')
+        self.assertEqual(numpy.bincount(speed).tolist(), [0, 5, 5, 5, 5], 'Values not stratified')
+
+    def test_sweep(self):
+        configurations = sweep.grid({'world.init.food': [10, 20]})
+        rows = list(sweep.sweep(self.scenario, configurations, workers=2, seed=0))
+        self.assertEqual(len(rows), 2 * 3, 'Not one row per generation and run')
+        self.assertEqual(sorted((row['run'], row['generation']) for row in rows), [(0, 0), (0, 1), (0, 2), (1, 0), (1, 1), (1, 2)], 'Runs missing from table')
+        for row in rows:
+            if row['generation'] == 0:
+                self.assertEqual(row['food'], row['world.init.food'], 'Configuration not applied')
+
+        again = list(sweep.sweep(self.scenario, configurations, workers=2, seed=0))
+        self.assertEqual(sorted(map(str, rows)), sorted(map(str, again)), 'Sweep not reproducible')
+
+
+if __name__ == '__main__':
+    unittest.main()
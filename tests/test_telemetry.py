@@ -0,0 +1,60 @@
+import csv
+import os
+import tempfile
+import unittest
+import numpy
+from TUEvolution import simulation, telemetry
+
+
+def read(path):
+    with open(path, newline='') as file:
+        return list(csv.DictReader(file))
+
+
+class TestTelemetryWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'run.csv')
+        self.row = {field: 0 for field in telemetry.TelemetryWriter.fields}
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_buffer(self):
+        writer = telemetry.TelemetryWriter(self.path, buffer_size=2, interval=1e9)
+        writer.write(self.row, {'size': numpy.array([10, 12, 10])})
+        self.assertEqual(read(self.path), [], 'Generation written before the buffer was full')
+
+        writer.write(dict(self.row, generation=1), {'size': numpy.array([12])})
+        self.assertEqual([row['generation'] for row in read(self.path)], ['0', '1'], 'Full buffer not written')
+        traits = read(os.path.join(self.directory.name, 'run_traits.csv'))
+        self.assertEqual([(row['value'], row['count']) for row in traits], [('10', '2'), ('12', '1'), ('12', '1')], 'Trait values not counted')
+        writer.close()
+
+    def test_append(self):
+        for generation in range(2):
+            writer = telemetry.TelemetryWriter(self.path)
+            writer.write(dict(self.row, generation=generation), {})
+            writer.close()
+        self.assertEqual([row['generation'] for row in read(self.path)], ['0', '1'], 'Header repeated or rows lost when appending')
+
+    def test_simulation(self):
+        run = simulation.Simulation(population=20, generations=3, food_supply=15, world_day=300, creature_size={'init': 12, 'variations': [-2, 0, 4], 'probabilities': [0.3, 0.4, 0.3]},
+                                    creature_speed=3, creature_stamina=1000, creature_sense=10, rng=numpy.random.default_rng(2), telemetry=self.path)
+        history = run.run()
+
+        rows = [{key: int(value) for key, value in row.items()} for row in read(self.path)]
+        self.assertEqual([row['generation'] for row in rows], history['generation'], 'Not every generation written')
+        self.assertEqual([row['population'] for row in rows], history['population'], 'Population not written')
+        for row, next_population in zip(rows, history['population'][1:]):
+            self.assertEqual(row['survivors'] + row['starvation'] + row['predation'] + row['out_of_time'], row['population'], 'Deaths and survivors do not add up')
+            self.assertEqual(row['survivors'] + row['births'], next_population, 'Births do not match the next generation')
+
+        traits = read(os.path.join(self.directory.name, 'run_traits.csv'))
+        sizes = [int(row['count']) for row in traits if row['trait'] == 'size' and row['generation'] == '3']
+        self.assertEqual(sum(sizes), history['population'][3], 'Trait counts do not cover the population')
+
+
+if __name__ == '__main__':
+    unittest.main()
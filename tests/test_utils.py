@@ -0,0 +1,26 @@
+import sys
+import subprocess
+import unittest
+import matplotlib.colors
+from TUEvolution import utils
+
+
+class TestColor(unittest.TestCase):
+
+    def test_table(self):
+        for name, rgb in utils.colors.items():
+            self.assertEqual(rgb, tuple(int(255 * v) for v in matplotlib.colors.to_rgb(name)), f'{name} differs from matplotlib')
+
+    def test_other_colors(self):
+        self.assertEqual(utils.color('lightblue'), (173, 216, 230), 'Color outside the table not resolved')
+        self.assertEqual(utils.color('#ff8000'), (255, 128, 0), 'Hex color not resolved')
+        self.assertIn('lightblue', utils.colors, 'Resolved color not remembered')
+
+    def test_lazy_import(self):
+        code = 'import sys, TUEvolution.simulation, TUEvolution.utils; TUEvolution.utils.color("red"); print("matplotlib" in sys.modules)'
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip(), 'False', 'matplotlib imported for a color in the table')
+
+
+if __name__ == '__main__':
+    unittest.main()